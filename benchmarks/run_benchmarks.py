@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# benchmarks/run_benchmarks.py
+"""
+합성 ELF 코퍼스로 ELFAnalyzer 의 단계별 처리량을 측정합니다.
+
+사용 예제:
+  python -m benchmarks.run_benchmarks --sizes 64K,512K,2M --count 4 --save-baseline bench.json
+  python -m benchmarks.run_benchmarks --sizes 64K,512K,2M --count 4 --baseline bench.json --threshold 0.1
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from dataclasses import asdict
+from typing import Dict, List, Sequence
+
+from benchmarks.synthetic_elf import SyntheticELFSpec, generate_corpus
+from elf_analyzer.analyzer import DEFAULT_STAGES, ELFAnalyzer
+from elf_analyzer.printer import print_analysis_result
+
+# print_analysis_result 경로와 전체 합계를 나타내는 단계 이름
+PRINT_STAGE = "print"
+TOTAL_STAGE = "total"
+DEFAULT_THRESHOLD = 0.10
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+def _size(value: str) -> int:
+    """
+    "64K", "2M", "4096" 형식의 크기를 바이트로 변환합니다.
+    """
+    value = value.strip().upper()
+    units = {"K": 1024, "M": 1024 * 1024}
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def build_specs(sizes: Sequence[int], count: int, sections: int, symbols: int, imports: int,
+                string_density: float, include_32bit: bool) -> List[SyntheticELFSpec]:
+    """
+    크기마다 시드가 다른 count 개의 명세를 만듭니다. (.rodata 는 .text 의 1/4 크기)
+    include_32bit 이면 홀수 번째 바이너리를 i386 / 비 PIE 로 만듭니다.
+    """
+    specs = []
+    for text_size in sizes:
+        for seed in range(count):
+            is_64 = not (include_32bit and seed % 2)
+            specs.append(SyntheticELFSpec(
+                text_size=text_size, rodata_size=max(text_size // 4, 4096), string_density=string_density,
+                sections=sections, symbols=symbols, imports=imports, is_64=is_64, pie=is_64, seed=seed,
+            ))
+    return specs
+
+
+def run_once(paths: Sequence[str], gadget_jobs: int) -> Dict[str, float]:
+    """
+    코퍼스 전체를 한 번 분석하고 {단계 이름: 코퍼스 전체 소요 시간(초)} 을 반환합니다.
+    단계 시간은 ELFAnalysisResult.metrics 의 wall_time 이며, 캐시는 사용하지 않습니다.
+    """
+    seconds = {stage: 0.0 for stage in DEFAULT_STAGES + (PRINT_STAGE,)}
+    for path in paths:
+        analyzer = ELFAnalyzer(path, gadget_jobs=gadget_jobs)
+        result = analyzer.analyze(concurrent=False, stages=DEFAULT_STAGES)
+        for metrics in result.metrics:
+            seconds[metrics.stage] += metrics.wall_time
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            print_analysis_result(result, DEFAULT_STAGES)
+        seconds[PRINT_STAGE] += time.perf_counter() - start
+    seconds[TOTAL_STAGE] = sum(seconds.values())
+    return seconds
+
+
+def measure_startup(path: str, runs: int) -> Dict[str, float]:
+    """
+    새 인터프리터로 main.py --only checksec --no-cache 를 runs 번 실행하여
+    다른 도구에서 반복 호출할 때의 시작 시간(import 포함)을 측정합니다.
+
+    return:
+      Dict[str, float]: {"min_seconds": 최솟값, "median_seconds": 중앙값}
+    """
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, MAIN_SCRIPT, path, "--only", "checksec", "--no-cache"],
+                       stdout=subprocess.DEVNULL, check=True)
+        samples.append(time.perf_counter() - start)
+    return {"min_seconds": min(samples), "median_seconds": statistics.median(samples)}
+
+
+def summarize(seconds: Dict[str, float], binaries: int, total_bytes: int) -> Dict[str, Dict[str, float]]:
+    """
+    단계별 소요 시간을 처리량(binaries/s, MB/s)으로 변환합니다.
+    """
+    summary = {}
+    for stage, value in seconds.items():
+        value = max(value, 1e-9)
+        summary[stage] = {
+            "seconds": value,
+            "binaries_per_second": binaries / value,
+            "mb_per_second": total_bytes / value / 1e6,
+        }
+    return summary
+
+
+def compare(summary: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float) -> List[str]:
+    """
+    baseline 보다 MB/s 가 threshold 비율 이상 낮아진 단계 목록을 반환합니다.
+    """
+    regressions = []
+    for stage, current in summary.items():
+        previous = baseline.get(stage)
+        if previous and current["mb_per_second"] < previous["mb_per_second"] * (1 - threshold):
+            regressions.append(stage)
+    return regressions
+
+
+def print_report(summary: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                 regressions: Sequence[str]) -> None:
+    print(f"{'stage':<12}{'seconds':>10}{'binaries/s':>14}{'MB/s':>12}{'baseline MB/s':>16}{'change':>10}")
+    for stage, current in summary.items():
+        line = (f"{stage:<12}{current['seconds']:>10.3f}{current['binaries_per_second']:>14.2f}"
+                f"{current['mb_per_second']:>12.2f}")
+        previous = baseline.get(stage)
+        if previous:
+            change = current["mb_per_second"] / previous["mb_per_second"] - 1
+            line += f"{previous['mb_per_second']:>16.2f}{change:>+10.1%}"
+            if stage in regressions:
+                line += "  REGRESSION"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ELFAnalyzer stages on a synthetic ELF corpus.")
+    parser.add_argument("--sizes", default="64K,512K,2M", help="Comma-separated .text sizes of the generated binaries")
+    parser.add_argument("--count", type=int, default=2, help="Number of binaries per size (different seeds)")
+    parser.add_argument("--sections", type=int, default=8, help="Extra non-allocated sections per binary")
+    parser.add_argument("--symbols", type=int, default=256, help="Function symbols in .symtab per binary")
+    parser.add_argument("--imports", type=int, default=16, help="Imported functions (PLT/GOT entries) per binary")
+    parser.add_argument("--string-density", type=float, default=0.5, help="Fraction of .rodata made of printable strings")
+    parser.add_argument("--x86", action="store_true", help="Make every other binary a 32-bit non-PIE executable")
+    parser.add_argument("--repeat", type=int, default=3, help="Run the corpus this many times and keep the fastest run")
+    parser.add_argument("--startup-runs", type=int, default=5,
+                        help="Cold starts of 'main.py --only checksec' to time (0 to skip)")
+    parser.add_argument("--gadget-jobs", type=int, default=1, help="Gadget finder worker processes (default: 1 for stable numbers)")
+    parser.add_argument("--corpus-dir", default=None, help="Directory to keep the generated corpus in (default: temporary)")
+    parser.add_argument("--json", dest="json_path", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against results previously written with --json / --save-baseline")
+    parser.add_argument("--save-baseline", help="Write the results as a new baseline file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed MB/s drop against the baseline before failing (fraction, default 0.10)")
+    args = parser.parse_args()
+
+    specs = build_specs([_size(size) for size in args.sizes.split(",") if size.strip()], args.count,
+                        args.sections, args.symbols, args.imports, args.string_density, args.x86)
+    baseline_data = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline_data = json.load(f)
+        if baseline_data.get("corpus") != [asdict(spec) for spec in specs]:
+            print("[!] Baseline was measured on a different corpus; comparison may be meaningless", file=sys.stderr)
+    baseline = baseline_data.get("stages", {})
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        corpus_dir = os.path.abspath(args.corpus_dir or os.path.join(work_dir, "corpus"))
+        paths = generate_corpus(corpus_dir, specs)
+        total_bytes = sum(os.path.getsize(path) for path in paths)
+        print(f"[*] Corpus: {len(paths)} binaries, {total_bytes / 1e6:.1f} MB in {corpus_dir}", file=sys.stderr)
+
+        # 단계 산출물(logs/...)이 작업 디렉토리를 어지럽히지 않도록 임시 디렉토리에서 실행합니다.
+        cwd = os.getcwd()
+        os.chdir(work_dir)
+        try:
+            best = None
+            for run in range(args.repeat):
+                seconds = run_once(paths, args.gadget_jobs)
+                print(f"[*] Run {run + 1}/{args.repeat}: {seconds[TOTAL_STAGE]:.3f}s", file=sys.stderr)
+                best = seconds if best is None else {stage: min(best[stage], seconds[stage]) for stage in best}
+            startup = measure_startup(paths[0], args.startup_runs) if args.startup_runs > 0 else None
+        finally:
+            os.chdir(cwd)
+
+    summary = summarize(best, len(paths), total_bytes)
+    regressions = compare(summary, baseline, args.threshold)
+    print_report(summary, baseline, regressions)
+    if startup is not None:
+        line = (f"[*] Cold start (main.py --only checksec): min {startup['min_seconds'] * 1000:.1f} ms, "
+                f"median {startup['median_seconds'] * 1000:.1f} ms")
+        previous = baseline_data.get("startup")
+        if previous:
+            line += f" (baseline min {previous['min_seconds'] * 1000:.1f} ms)"
+            if startup["min_seconds"] > previous["min_seconds"] * (1 + args.threshold):
+                regressions.append("startup")
+        print(line)
+
+    data = {
+        "corpus": [asdict(spec) for spec in specs],
+        "binaries": len(paths),
+        "bytes": total_bytes,
+        "repeat": args.repeat,
+        "stages": summary,
+        "startup": startup,
+    }
+    for path in (args.json_path, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(data, f, indent=2)
+
+    if regressions:
+        print(f"[!] Throughput regression over {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
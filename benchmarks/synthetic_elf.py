@@ -0,0 +1,358 @@
+# benchmarks/synthetic_elf.py
+import hashlib
+import os
+import random
+import struct
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence
+
+from elf_analyzer.elf_parser import (
+    DF_1_PIE, DT_FLAGS_1, DT_NULL, DT_PLTGOT, DT_STRSZ, DT_STRTAB, EM_386, EM_X86_64,
+    ET_DYN, ET_EXEC, NT_GNU_BUILD_ID, PF_R, PF_W, PF_X, PT_DYNAMIC, PT_GNU_RELRO,
+    PT_GNU_STACK, PT_INTERP, PT_LOAD, PT_NOTE, SHT_DYNSYM, SHT_NOTE, SHT_REL, SHT_RELA,
+    SHT_STRTAB, SHT_SYMTAB,
+)
+
+# 파서에서 사용하지 않아 elf_parser.py 에 정의되지 않은 상수
+SHT_PROGBITS = 1
+SHT_DYNAMIC = 6
+SHF_WRITE = 0x1
+SHF_ALLOC = 0x2
+SHF_EXECINSTR = 0x4
+SHF_INFO_LINK = 0x40
+DT_NEEDED = 1
+DT_PLTRELSZ = 2
+DT_SYMTAB = 6
+DT_SYMENT = 11
+DT_PLTREL = 20
+DT_JMPREL = 23
+DT_RELA = 7
+DT_REL = 17
+R_JUMP_SLOT = 7
+STB_GLOBAL_FUNC = 0x12
+PAGE_SIZE = 0x1000
+
+# import 심볼 이름 (앞쪽은 위험 함수 검사에 걸리는 이름)
+IMPORT_NAMES = (
+    "gets", "system", "printf", "strcpy", "read", "puts", "malloc", "free",
+    "memcpy", "sprintf", "setvbuf", "exit", "open", "write", "close", "__stack_chk_fail",
+)
+
+_PRINTABLE = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 _-%:/."
+# 문자열로 인식되지 않는 바이트 (제어 문자와 0x80 이상)
+_BINARY = bytes(range(1, 9)) + bytes(range(0x0E, 0x20)) + bytes(range(0x80, 0x100))
+
+# (ELF 헤더, 프로그램 헤더, 섹션 헤더, 심볼, 재배치, dynamic 엔트리) 구조체 형식
+_FORMATS = {
+    True: ("<16sHHIQQQIHHHHHH", "<IIQQQQQQ", "<IIQQQQIIQQ", "<IBBHQQ", "<QQq", "<qQ"),
+    False: ("<16sHHIIIIIHHHHHH", "<IIIIIIII", "<IIIIIIIIII", "<IIIBBH", "<II", "<iI"),
+}
+
+
+@dataclass
+class SyntheticELFSpec:
+    """
+    합성 ELF 바이너리의 모양을 지정하는 데이터 클래스입니다.
+
+    속성:
+      text_size (int): .text 크기 (바이트, 임의의 바이트로 채워져 가젯 탐색 부하가 됨)
+      rodata_size (int): .rodata 크기 (바이트)
+      string_density (float): .rodata 중 출력 가능한 문자열이 차지하는 비율 (0.0 ~ 1.0)
+      sections (int): 추가할 비할당 섹션(.bench.N) 수
+      symbols (int): .symtab 에 넣을 함수 심볼 수
+      imports (int): .dynsym / .plt / .got.plt 에 넣을 import 함수 수 (0이면 정적 링크)
+      is_64 (bool): x86-64 이면 True, i386 이면 False
+      pie (bool): PIE(ET_DYN + DF_1_PIE) 로 만들지 여부
+      seed (int): 내용을 만드는 난수 시드 (같은 명세와 시드는 같은 파일을 만듦)
+    """
+    text_size: int = 256 * 1024
+    rodata_size: int = 64 * 1024
+    string_density: float = 0.5
+    sections: int = 8
+    symbols: int = 256
+    imports: int = 16
+    is_64: bool = True
+    pie: bool = True
+    seed: int = 0
+
+    @property
+    def digest(self) -> bytes:
+        """
+        명세 전체의 SHA-1 (BuildID 로도 사용)
+        """
+        return hashlib.sha1(repr(sorted(asdict(self).items())).encode()).digest()
+
+    @property
+    def name(self) -> str:
+        """
+        명세를 나타내는 파일 이름을 반환합니다. (예: synthetic-x64-pie-256k-1a2b3c4d)
+        """
+        arch = "x64" if self.is_64 else "x86"
+        kind = "pie" if self.pie else "exec"
+        return f"synthetic-{arch}-{kind}-{self.text_size // 1024}k-{self.digest.hex()[:8]}"
+
+
+@dataclass
+class _Section:
+    name: str
+    sh_type: int
+    sh_flags: int
+    size: int
+    segment: Optional[str]
+    addralign: int = 1
+    entsize: int = 0
+    data: bytes = b""
+    offset: int = 0
+    addr: int = 0
+    link: str = ""
+    info: int = 0
+
+
+class _StringTable:
+    def __init__(self):
+        self.data = bytearray(b"\0")
+        self.offsets: Dict[str, int] = {"": 0}
+
+    def add(self, name: str) -> int:
+        if name not in self.offsets:
+            self.offsets[name] = len(self.data)
+            self.data += name.encode() + b"\0"
+        return self.offsets[name]
+
+
+def _import_names(count: int) -> List[str]:
+    names = list(IMPORT_NAMES[:count])
+    names += [f"import_{index}" for index in range(len(names), count)]
+    return names
+
+
+def _mixed_bytes(rng: random.Random, size: int, density: float) -> bytes:
+    """
+    출력 가능한 문자열과 이진 바이트가 density 비율로 섞인 size 바이트를 만듭니다.
+    """
+    out = bytearray()
+    while len(out) < size:
+        length = rng.randint(4, 40)
+        if rng.random() < density:
+            out += bytes(rng.choices(_PRINTABLE, k=length)) + b"\0"
+        else:
+            out += bytes(rng.choices(_BINARY, k=length))
+    return bytes(out[:size])
+
+
+def build_elf(spec: SyntheticELFSpec) -> bytes:
+    """
+    컴파일러 없이 명세대로 ELF 바이너리를 만듭니다.
+    ELFParser / checksec / SymbolIndex / StringsExtractor / GadgetFinder 가 실제 바이너리처럼 처리할 수 있도록
+    R / RX / R / RW 세그먼트, BuildID note, PLT / GOT 와 JUMP_SLOT 재배치, .symtab 을 갖춥니다.
+    (실행할 수 있는 파일은 아니며 분석기 벤치마크 전용입니다.)
+
+    arguments:
+      spec (SyntheticELFSpec): 바이너리 명세
+
+    return:
+      bytes: ELF 파일 내용
+    """
+    rng = random.Random(spec.seed)
+    is_64 = spec.is_64
+    word = 8 if is_64 else 4
+    ehdr_fmt, phdr_fmt, shdr_fmt, sym_fmt, rel_fmt, dyn_fmt = _FORMATS[is_64]
+    sym_size, rel_size, dyn_size = (struct.calcsize(fmt) for fmt in (sym_fmt, rel_fmt, dyn_fmt))
+    base = 0 if spec.pie else (0x400000 if is_64 else 0x8048000)
+
+    imports = _import_names(spec.imports)
+    has_dynamic = bool(imports) or spec.pie
+    dynstr = _StringTable()
+    needed = dynstr.add("libc.so.6") if imports else 0
+    import_offsets = [dynstr.add(name) for name in imports]
+    strtab = _StringTable()
+    symbol_offsets = [strtab.add(f"func_{index}") for index in range(spec.symbols)]
+    interp = b"/lib64/ld-linux-x86-64.so.2\0" if is_64 else b"/lib/ld-linux.so.2\0"
+    dyn_count = (9 if imports else 2) + (1 if spec.pie else 0) + 1
+
+    sections: List[_Section] = []
+    if imports:
+        sections.append(_Section(".interp", SHT_PROGBITS, SHF_ALLOC, len(interp), "R", data=interp))
+    sections.append(_Section(".note.gnu.build-id", SHT_NOTE, SHF_ALLOC, 36, "R", addralign=4))
+    if has_dynamic:
+        sections.append(_Section(".dynstr", SHT_STRTAB, SHF_ALLOC, len(dynstr.data), "R", data=bytes(dynstr.data)))
+    if imports:
+        sections += [
+            _Section(".dynsym", SHT_DYNSYM, SHF_ALLOC, (len(imports) + 1) * sym_size, "R",
+                     addralign=word, entsize=sym_size, link=".dynstr", info=1),
+            _Section(".rela.plt" if is_64 else ".rel.plt", SHT_RELA if is_64 else SHT_REL,
+                     SHF_ALLOC | SHF_INFO_LINK, len(imports) * rel_size, "R",
+                     addralign=word, entsize=rel_size, link=".dynsym"),
+            _Section(".plt", SHT_PROGBITS, SHF_ALLOC | SHF_EXECINSTR, (len(imports) + 1) * 16, "RX",
+                     addralign=16, entsize=16),
+        ]
+    sections += [
+        _Section(".text", SHT_PROGBITS, SHF_ALLOC | SHF_EXECINSTR, spec.text_size, "RX", addralign=16),
+        _Section(".rodata", SHT_PROGBITS, SHF_ALLOC, spec.rodata_size, "RO", addralign=32),
+    ]
+    if has_dynamic:
+        sections.append(_Section(".dynamic", SHT_DYNAMIC, SHF_ALLOC | SHF_WRITE, dyn_count * dyn_size, "RW",
+                                 addralign=word, entsize=dyn_size, link=".dynstr"))
+    if imports:
+        sections.append(_Section(".got.plt", SHT_PROGBITS, SHF_ALLOC | SHF_WRITE, (len(imports) + 3) * word, "RW",
+                                 addralign=word, entsize=word))
+    sections.append(_Section(".data", SHT_PROGBITS, SHF_ALLOC | SHF_WRITE, PAGE_SIZE, "RW", addralign=32))
+    for index in range(spec.sections):
+        sections.append(_Section(f".bench.{index}", SHT_PROGBITS, 0, 256, None,
+                                 data=_mixed_bytes(rng, 256, spec.string_density)))
+    sections += [
+        _Section(".symtab", SHT_SYMTAB, 0, (spec.symbols + 1) * sym_size, None,
+                 addralign=word, entsize=sym_size, link=".strtab", info=1),
+        _Section(".strtab", SHT_STRTAB, 0, len(strtab.data), None, data=bytes(strtab.data)),
+    ]
+    shstrtab = _StringTable()
+    for section in sections:
+        shstrtab.add(section.name)
+    shstrtab.add(".shstrtab")
+    sections.append(_Section(".shstrtab", SHT_STRTAB, 0, len(shstrtab.data), None, data=bytes(shstrtab.data)))
+
+    # 배치: 세그먼트가 바뀔 때마다 페이지 경계로 맞추고, 할당 섹션은 vaddr = base + offset 으로 둡니다.
+    phnum = 6 + (1 if imports else 0) + (2 if has_dynamic else 0)
+    offset = struct.calcsize(ehdr_fmt) + phnum * struct.calcsize(phdr_fmt)
+    segment = "R"
+    for section in sections:
+        if section.segment is not None and section.segment != segment:
+            offset = (offset + PAGE_SIZE - 1) & ~(PAGE_SIZE - 1)
+            segment = section.segment
+        offset = (offset + section.addralign - 1) & ~(section.addralign - 1)
+        section.offset = offset
+        section.addr = base + offset if section.segment is not None else 0
+        offset += section.size
+    shoff = (offset + 7) & ~7
+    by_name = {section.name: section for section in sections}
+    index_of = {section.name: index + 1 for index, section in enumerate(sections)}
+
+    by_name[".note.gnu.build-id"].data = struct.pack("<III", 4, 20, NT_GNU_BUILD_ID) + b"GNU\0" + spec.digest
+    text = by_name[".text"]
+    text.data = rng.randbytes(spec.text_size)
+    by_name[".rodata"].data = _mixed_bytes(rng, spec.rodata_size, spec.string_density)
+    by_name[".data"].data = rng.randbytes(PAGE_SIZE)
+
+    function_size = max(spec.text_size // max(spec.symbols, 1), 1)
+    symtab = bytearray(sym_size)
+    for index, name_offset in enumerate(symbol_offsets):
+        value = text.addr + (index * function_size) % max(spec.text_size, 1)
+        if is_64:
+            symtab += struct.pack(sym_fmt, name_offset, STB_GLOBAL_FUNC, 0, index_of[".text"], value, function_size)
+        else:
+            symtab += struct.pack(sym_fmt, name_offset, value, function_size, STB_GLOBAL_FUNC, 0, index_of[".text"])
+    by_name[".symtab"].data = bytes(symtab)
+
+    dynamic_entries = []
+    if imports:
+        plt, got = by_name[".plt"], by_name[".got.plt"]
+        rel = by_name[".rela.plt" if is_64 else ".rel.plt"]
+        dynsym = bytearray(sym_size)
+        for name_offset in import_offsets:
+            if is_64:
+                dynsym += struct.pack(sym_fmt, name_offset, STB_GLOBAL_FUNC, 0, 0, 0, 0)
+            else:
+                dynsym += struct.pack(sym_fmt, name_offset, 0, 0, STB_GLOBAL_FUNC, 0, 0)
+        by_name[".dynsym"].data = bytes(dynsym)
+
+        relocations = bytearray()
+        got_data = bytearray(struct.pack("<QQQ" if is_64 else "<III", by_name[".dynamic"].addr, 0, 0))
+        # PLT0: push [GOT+word]; jmp [GOT+2*word]
+        if is_64:
+            plt_data = bytearray(b"\xff\x35" + struct.pack("<i", got.addr + 8 - (plt.addr + 6))
+                                 + b"\xff\x25" + struct.pack("<i", got.addr + 16 - (plt.addr + 12)) + b"\x0f\x1f\x40\x00")
+        elif spec.pie:
+            plt_data = bytearray(b"\xff\xb3\x04\x00\x00\x00\xff\xa3\x08\x00\x00\x00\x00\x00\x00\x00")
+        else:
+            plt_data = bytearray(b"\xff\x35" + struct.pack("<I", got.addr + 4)
+                                 + b"\xff\x25" + struct.pack("<I", got.addr + 8) + b"\x00" * 4)
+        for index in range(len(imports)):
+            slot = got.addr + (3 + index) * word
+            entry = plt.addr + (index + 1) * 16
+            if is_64:
+                jump = b"\xff\x25" + struct.pack("<i", slot - (entry + 6))
+                relocations += struct.pack(rel_fmt, slot, ((index + 1) << 32) | R_JUMP_SLOT, 0)
+            else:
+                jump = (b"\xff\xa3" + struct.pack("<i", slot - got.addr)) if spec.pie else (b"\xff\x25" + struct.pack("<I", slot))
+                relocations += struct.pack(rel_fmt, slot, ((index + 1) << 8) | R_JUMP_SLOT)
+            plt_data += jump + b"\x68" + struct.pack("<I", index * rel_size) + b"\xe9" + struct.pack("<i", plt.addr - (entry + 16))
+            got_data += struct.pack("<Q" if is_64 else "<I", entry + 6)
+        plt.data, got.data, rel.data = bytes(plt_data), bytes(got_data), bytes(relocations)
+        rel.info = index_of[".plt"]
+
+        dynamic_entries += [
+            (DT_NEEDED, needed), (DT_SYMTAB, by_name[".dynsym"].addr), (DT_SYMENT, sym_size),
+            (DT_PLTGOT, got.addr), (DT_PLTRELSZ, rel.size), (DT_PLTREL, DT_RELA if is_64 else DT_REL),
+            (DT_JMPREL, rel.addr),
+        ]
+    if has_dynamic:
+        dynamic_entries += [(DT_STRTAB, by_name[".dynstr"].addr), (DT_STRSZ, len(dynstr.data))]
+    if spec.pie:
+        dynamic_entries.append((DT_FLAGS_1, DF_1_PIE))
+    if has_dynamic:
+        dynamic_entries.append((DT_NULL, 0))
+        by_name[".dynamic"].data = b"".join(struct.pack(dyn_fmt, tag, value) for tag, value in dynamic_entries)
+
+    def segment_range(name: str) -> List[_Section]:
+        return [section for section in sections if section.segment == name]
+
+    def phdr(p_type: int, flags: int, first: _Section, last: _Section, align: int) -> bytes:
+        start = 0 if p_type == PT_LOAD and first.segment == "R" else first.offset
+        size = last.offset + last.size - start
+        vaddr = base + start
+        if is_64:
+            return struct.pack(phdr_fmt, p_type, flags, start, vaddr, vaddr, size, size, align)
+        return struct.pack(phdr_fmt, p_type, start, vaddr, vaddr, size, size, flags, align)
+
+    phdrs = []
+    if imports:
+        phdrs.append(phdr(PT_INTERP, PF_R, by_name[".interp"], by_name[".interp"], 1))
+    for name, flags in (("R", PF_R), ("RX", PF_R | PF_X), ("RO", PF_R), ("RW", PF_R | PF_W)):
+        group = segment_range(name)
+        phdrs.append(phdr(PT_LOAD, flags, group[0], group[-1], PAGE_SIZE))
+    if has_dynamic:
+        phdrs.append(phdr(PT_DYNAMIC, PF_R | PF_W, by_name[".dynamic"], by_name[".dynamic"], word))
+    note = by_name[".note.gnu.build-id"]
+    phdrs.append(phdr(PT_NOTE, PF_R, note, note, 4))
+    stack = struct.pack(phdr_fmt, PT_GNU_STACK, PF_R | PF_W, 0, 0, 0, 0, 0, 16) if is_64 else \
+        struct.pack(phdr_fmt, PT_GNU_STACK, 0, 0, 0, 0, 0, PF_R | PF_W, 16)
+    phdrs.append(stack)
+    if has_dynamic:
+        phdrs.append(phdr(PT_GNU_RELRO, PF_R, by_name[".dynamic"], by_name[".dynamic"], 1))
+
+    ident = b"\x7fELF" + bytes([2 if is_64 else 1, 1, 1, 0]) + b"\0" * 8
+    ehdr_size, phdr_size, shdr_size = (struct.calcsize(fmt) for fmt in (ehdr_fmt, phdr_fmt, shdr_fmt))
+    ehdr = struct.pack(
+        ehdr_fmt, ident, ET_DYN if spec.pie else ET_EXEC, EM_X86_64 if is_64 else EM_386, 1,
+        text.addr, ehdr_size, shoff, 0, ehdr_size, phdr_size, len(phdrs), shdr_size,
+        len(sections) + 1, index_of[".shstrtab"],
+    )
+
+    out = bytearray(shoff + shdr_size * (len(sections) + 1))
+    out[:ehdr_size] = ehdr
+    out[ehdr_size:ehdr_size + phdr_size * len(phdrs)] = b"".join(phdrs)
+    section_headers = bytearray(shdr_size)
+    for section in sections:
+        out[section.offset:section.offset + section.size] = section.data
+        section_headers += struct.pack(shdr_fmt, shstrtab.offsets[section.name], section.sh_type, section.sh_flags,
+                                       section.addr, section.offset, section.size, index_of.get(section.link, 0),
+                                       section.info, section.addralign, section.entsize)
+    out[shoff:] = section_headers
+    return bytes(out)
+
+
+def generate_corpus(directory: str, specs: Sequence[SyntheticELFSpec]) -> List[str]:
+    """
+    명세마다 합성 ELF 파일을 directory 에 만들고 경로 목록을 반환합니다. (같은 명세의 파일은 다시 만들지 않음)
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for spec in specs:
+        path = os.path.join(directory, spec.name)
+        if not os.path.exists(path):
+            data = build_elf(spec)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        paths.append(path)
+    return paths
@@ -1,6 +1,7 @@
 # config/config_manager.py
 import os
 import configparser
+import threading
 
 """
 사용 예제:
@@ -21,10 +22,22 @@ DEFAULT_CONFIG = {
         # 예: 'debug': 'True'
     },
     'decompile': {
-        'ghidra_decompile_script': 'decompile/decompile_script.py'
+        'ghidra_decompile_script': 'decompile/decompile_script.py',
+        # 디컴파일 워커 스레드 수 (0이면 CPU 코어 수)
+        'threads': '0',
+        # 함수 하나당 디컴파일 제한 시간(초, 0이면 제한 없음)
+        'timeout': '60',
+        # 자동 분석이 끝난 Ghidra 프로젝트를 ./projects/<sha256> 에 보관하여 재사용할지 여부
+        'project_cache': 'true',
+        # 보관할 프로젝트 전체의 최대 크기(MB, 0이면 제한 없음)와 마지막 사용 후 보관 기간(일, 0이면 제한 없음)
+        'project_cache_max_mb': '20480',
+        'project_cache_max_age_days': '30',
+        # 같은 로그 디렉토리의 이전 결과와 함수 해시를 비교하여 바뀐 함수만 다시 디컴파일할지 여부
+        'incremental': 'true'
     },
     'elf_analyzer': {
-        # 추가 옵션 가능
+        # import 여부를 경고할 위험 함수 목록 (쉼표로 구분)
+        'dangerous_functions': 'gets,strcpy,strcat,sprintf,vsprintf,scanf,sscanf,fscanf,system,popen,execve,execl,printf,fprintf,memcpy,read'
     },
     'ai': {
         'chatgpt_api': ''
@@ -79,17 +92,45 @@ def update_config():
     else:
         print("Config file is already up-to-date.")
 
-def load_config():
+def load_config(config_file=CONFIG_FILE):
     """
-    설정 파일을 로드하여 configparser 객체로 반환합니다.
-    설정 파일이 없으면 ensure_config()를 호출하여 기본 파일을 생성하고,
-    기본 설정값에 새 항목이 추가되었을 경우 update_config()를 호출하여 자동으로 추가합니다.
+    기본 설정값 위에 설정 파일의 값을 덮어써서 configparser 객체로 반환합니다.
+    설정 파일이 없거나 새 기본 항목이 빠져 있어도 기본값을 사용하며, 파일을 만들거나 수정하지 않습니다.
     """
-    ensure_config()
-    update_config()
     config_obj = configparser.ConfigParser()
-    config_obj.read(CONFIG_FILE)
+    config_obj.read_dict(DEFAULT_CONFIG)
+    config_obj.read(config_file)
     return config_obj
 
-# 전역에서 사용할 config 객체
-config = load_config()
\ No newline at end of file
+class LazyConfig:
+    """
+    처음 값을 읽을 때 설정 파일을 로드하고, 이후에는 파일의 mtime 이 바뀐 경우에만 다시 읽는 설정 객체입니다.
+    get / getint / getboolean 등은 configparser 객체에 그대로 위임합니다.
+    설정 파일을 만들거나 누락된 항목을 채우려면 python -m config.config_manager 를 실행합니다.
+    """
+    def __init__(self, config_file=CONFIG_FILE):
+        self.config_file = config_file
+        self._config = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _current(self):
+        try:
+            mtime = os.stat(self.config_file).st_mtime_ns
+        except OSError:
+            mtime = None
+        with self._lock:
+            if self._config is None or mtime != self._mtime:
+                self._config = load_config(self.config_file)
+                self._mtime = mtime
+            return self._config
+
+    def __getattr__(self, name):
+        return getattr(self._current(), name)
+
+# 전역에서 사용할 config 객체 (import 시점에는 파일을 읽지 않습니다.)
+config = LazyConfig()
+
+if __name__ == '__main__':
+    ensure_config()
+    update_config()
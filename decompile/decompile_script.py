@@ -1,68 +1,588 @@
+# -*- coding: utf-8 -*-
 import os
+import sys
+import json
+import hashlib
+import struct
+from collections import deque
+from java.io import File # type: ignore
+from java.lang import Runtime, Throwable # type: ignore
+from java.util.concurrent import ArrayBlockingQueue, Callable, Executors # type: ignore
 from ghidra.app.decompiler import DecompInterface # type: ignore
+from ghidra.base.project import GhidraProject # type: ignore
 from ghidra.util.task import ConsoleTaskMonitor # type: ignore
 
+# 블록 압축 writer(elf_analyzer/blockgz.py)를 불러오기 위해 저장소 루트를 경로에 추가합니다.
+try:
+    _SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+except NameError:
+    _SCRIPT_DIR = getSourceFile().getParentFile().getAbsolutePath() # type: ignore
+sys.path.insert(0, os.path.dirname(_SCRIPT_DIR))
+from elf_analyzer.blockgz import BlockGzipReader, BlockGzipWriter
+
+# worker 모드에서 한 바이너리의 처리가 끝났음을 Python 쪽에 알리는 표식
+WORKER_DONE_MARKER = '@@easy-pwntools-decompiled@@'
+WORKER_ERROR_MARKER = '@@easy-pwntools-error@@'
+# decompile/projects.py 의 PROJECT_NAME 과 동일해야 합니다.
+PROJECT_NAME = 'decompile'
+# Ghidra.functionHash 의 정규화 방식이 바뀌면 올려서 이전 해시로 결과를 재사용하지 않도록 합니다.
+HASH_VERSION = 1
+# 호출 그래프 파일 형식 (elf_analyzer/callgraph.py 의 CallGraph 와 동일해야 합니다.)
+CALLGRAPH_MAGIC = b'EPCG'
+CALLGRAPH_VERSION = 1
+CALLGRAPH_FLAG_EXTERNAL = 1
+CALLGRAPH_FLAG_THUNK = 2
+
+def defaultLogDir(binary_name, sha256=None):
+    # decompile/run.py 의 default_log_dir 와 같은 logs/<파일명>-<SHA-256 앞 12자리>/decompile 경로입니다.
+    # (ELFAnalyzer 의 다른 단계 산출물과 같은 디렉토리이며, 이름이 같은 다른 바이너리와 섞이지 않습니다.)
+    name = os.path.splitext(str(binary_name))[0]
+    if sha256:
+        name = name + '-' + str(sha256).lower()[:12]
+    return os.path.join('.', 'logs', name, 'decompile')
+
+
+def _short_hex(address):
+    # Ghidra 의 0 으로 채운 주소 문자열을 DecompileIndex.records() 와 같은 "0x..." 형식으로 바꿉니다.
+    return '0x%x' % int(address, 16)
+
+
 class Log():
-    def __init__(self, binary_name):
+    """
+    디컴파일 결과를 함수별로 색인된 형태로 저장합니다.
+      decompile.c.gz       : 모든 함수의 C 코드 (함수 사이에 주석 배너, 블록 단위 gzip)
+      decompile.index.json : 함수별 이름, 시작 주소, 크기, 정규화 해시, 압축 전 decompile.c 내 바이트 오프셋과 길이
+                             (이전 버전과 비교했으면 diff: changed / added / removed 함수 이름과 재사용한 함수 수)
+      callgraph.bin        : 전체 호출 그래프 (CSR 형식 정수 배열과 함수 이름 테이블, Ghidra.exportCallGraph)
+    keep_previous 이면 같은 디렉토리의 이전 결과를 지우지 않고 previous.* 로 옮겨 두어 비교에 사용합니다.
+    stream_path(FIFO)가 주어지면 함수 하나가 끝날 때마다 JSON 레코드 한 줄을 바로 씁니다.
+      {"event": "function", "binary", "name", "entry", "size", "code", "reused"}
+      {"event": "failed", "binary", "name", "entry", "error"}
+      {"event": "done", "binary", "index", "diff"}   (프로그램 하나가 끝났을 때, diff 는 비교했을 때만)
+    """
+    DATA_FILE = 'decompile.c.gz'
+    INDEX_FILE = 'decompile.index.json'
+    CALLGRAPH_FILE = 'callgraph.bin'
+    PREVIOUS_PREFIX = 'previous.'
+
+    def __init__(self, binary_name, log_dir=None, stream_path=None, keep_previous=False, sha256=None):
         self.binary_name = binary_name
+        # 읽는 쪽(Python)이 FIFO를 열어 둔 상태이므로 쓰기용으로 열 때 막히지 않습니다.
+        self.stream = open(stream_path, 'ab') if stream_path else None
 
-        # save path: ./log/<name>/decompile/
-        self.file_path = os.path.join('.', 'logs', str(binary_name), 'decompile')
+        # save path: ./logs/<name>-<sha256[:12]>/decompile/ (log_dir이 주어지면 해당 디렉토리)
+        if log_dir is None:
+            log_dir = defaultLogDir(binary_name, sha256)
+        self.file_path = log_dir
         if not os.path.exists(self.file_path):
             os.makedirs(self.file_path)
-        self.file_name = os.path.join(self.file_path, 'decompile.log')
+        self.data_name = os.path.join(self.file_path, self.DATA_FILE)
+        self.file_name = os.path.join(self.file_path, self.INDEX_FILE)
+        self.callgraph_name = os.path.join(self.file_path, self.CALLGRAPH_FILE)
 
-        if os.path.exists(self.file_name):
-            os.remove(self.file_name)
-        self.file = open(self.file_name, "w+")
-        self.file.write('[*] binary Name : ' + str(self.binary_name) + '\n\n')
+        # (이전 decompile.index.json, 이전 C 코드 파일) 경로
+        self.previous = self._keepPrevious() if keep_previous else None
+        for path in (self.data_name, self.file_name):
+            if os.path.exists(path):
+                os.remove(path)
+        self.file = BlockGzipWriter(self.data_name)
+        self.functions = []
+        self.failed = []
+        self.notes = []
+        self.diff = None
+        self.log('/* [*] binary Name : ' + str(self.binary_name) + ' */\n')
+
+    def _keepPrevious(self):
+        if not os.path.exists(self.file_name):
+            return None
+        with open(self.file_name) as f:
+            data_file = json.load(f).get('data_file', 'decompile.c')
+        previous_index = os.path.join(self.file_path, self.PREVIOUS_PREFIX + self.INDEX_FILE)
+        previous_data = os.path.join(self.file_path, self.PREVIOUS_PREFIX + data_file)
+        if not os.path.exists(os.path.join(self.file_path, data_file)):
+            return None
+        for path in (previous_index, previous_data):
+            if os.path.exists(path):
+                os.remove(path)
+        os.rename(os.path.join(self.file_path, data_file), previous_data)
+        os.rename(self.file_name, previous_index)
+        return previous_index, previous_data
+
+    def _write(self, text):
+        return self.file.write(text)
 
     def log(self, message):
-        self.file.write(message + '\n')
+        self._write(message + '\n')
+
+    def note(self, message):
+        self.notes.append(message)
+        self.log('/* ' + message + ' */')
+
+    def emit(self, record):
+        if self.stream is None:
+            return
+        record['binary'] = str(self.binary_name)
+        self.stream.write(json.dumps(record) + '\n')
+        self.stream.flush()
 
     def close(self):
         self.file.close()
+        index = {
+            'binary': str(self.binary_name),
+            'data_file': self.DATA_FILE,
+            'hash_version': HASH_VERSION,
+            'callgraph_file': self.CALLGRAPH_FILE,
+            'functions': self.functions,
+            'failed': self.failed,
+            'notes': self.notes,
+        }
+        if self.diff is not None:
+            index['diff'] = self.diff
+        with open(self.file_name, 'w') as f:
+            json.dump(index, f)
+        done = {'event': 'done', 'index': self.file_name}
+        if self.diff is not None:
+            done['diff'] = self.diff
+        self.emit(done)
+        if self.stream is not None:
+            self.stream.close()
+
+    def loggingFunction(self, function, decompile_info, function_hash=None, reused=False):
+        self.log("/* ---------------- [*] Function : "+str(function) + " ---------------- */")
+        offset = self.file.tell()
+        length = self._write(decompile_info)
+        entry = {
+            'name': str(function),
+            'entry': '0x' + function.getEntryPoint().toString(False),
+            'size': function.getBody().getNumAddresses(),
+            'hash': function_hash,
+            'offset': offset,
+            'length': length,
+            'reused': reused,
+        }
+        self.functions.append(entry)
+        self.log('')
+        self.emit({'event': 'function', 'name': entry['name'], 'entry': _short_hex(entry['entry']),
+                   'size': entry['size'], 'code': decompile_info, 'reused': reused})
+
+    def failedFunction(self, function, error):
+        failed = {
+            'name': str(function),
+            'entry': '0x' + function.getEntryPoint().toString(False),
+            'error': error,
+        }
+        self.failed.append(failed)
+        self.emit({'event': 'failed', 'name': failed['name'], 'entry': _short_hex(failed['entry']), 'error': error})
+        self.note('[!] Decompile failed : ' + str(function) + ' (' + error + ')')
+
 
-    def loggingFunction(self, function_name, decompile_info):
-        self.log("---------------- [*] Function : "+str(function_name) + " ----------------")
-        self.log(decompile_info)
+class DecompileError(Exception):
+    pass
+
+
+class PreviousDecompile():
+    """
+    이전 버전의 디컴파일 결과(decompile.index.json 과 C 코드 파일)에서
+    이름과 정규화 해시가 같은 함수의 C 코드를 찾아 재사용할 수 있게 합니다.
+    해시가 없거나 HASH_VERSION 이 다른 결과는 비교에만 사용하고 재사용하지 않습니다.
+    """
+    def __init__(self, index_path, data_path=None):
+        with open(index_path) as f:
+            index = json.load(f)
+        self.index_path = index_path
+        self.names = set(entry['name'] for entry in index.get('functions', []) + index.get('failed', []))
+        self.hashes = {}
+        self.entries = {}
+        if index.get('hash_version') == HASH_VERSION:
+            for entry in index.get('functions', []):
+                if entry.get('hash'):
+                    self.hashes[entry['name']] = entry['hash']
+                    self.entries[entry['name']] = entry
+        if data_path is None:
+            data_path = os.path.join(os.path.dirname(index_path), index.get('data_file', 'decompile.c'))
+        self.reader = BlockGzipReader(data_path) if data_path.endswith('.gz') else open(data_path, 'rb')
+
+    def reusable(self, name, function_hash):
+        return self.hashes.get(name) == function_hash
+
+    def code(self, name):
+        entry = self.entries[name]
+        if isinstance(self.reader, BlockGzipReader):
+            data = self.reader.read(entry['offset'], entry['length'])
+        else:
+            self.reader.seek(entry['offset'])
+            data = self.reader.read(entry['length'])
+        return data.decode('utf-8')
+
+    def close(self):
+        self.reader.close()
+
+
+class DecompileTask(Callable):
+    """
+    JVM 워커 스레드에서 함수 하나를 디컴파일하는 작업입니다.
+    실패해도 예외를 던지지 않고 (C 코드, 오류 메시지) 튜플을 반환합니다.
+    """
+    def __init__(self, ghidra, function):
+        self.ghidra = ghidra
+        self.function = function
+
+    def call(self):
+        try:
+            return (self.ghidra.decompileFunctions(self.function), None)
+        except (Exception, Throwable) as e:
+            return (None, str(e))
 
 
 class Ghidra():
-    def __init__(self):
-        self.program = currentProgram # type: ignore
-        self.decomp_interface = DecompInterface()
-        self.decomp_interface.openProgram(self.program)
+    def __init__(self, program=None, threads=1, timeout=0):
+        self.program = program if program is not None else currentProgram # type: ignore
+        self.monitor = ConsoleTaskMonitor()
+        self.threads = max(1, threads)
+        # DecompInterface는 스레드 안전하지 않으므로 스레드 수만큼 만들어 풀에서 빌려 씁니다.
+        self.decomp_interfaces = ArrayBlockingQueue(self.threads)
+        self.all_interfaces = []
+        for _ in range(self.threads):
+            decomp_interface = DecompInterface()
+            decomp_interface.openProgram(self.program)
+            self.decomp_interfaces.put(decomp_interface)
+            self.all_interfaces.append(decomp_interface)
+        self.timeout = timeout
         self.program_name = self.program.getName()
         self.functions = self.program.getFunctionManager().getFunctions(True)
 
     def getProgramName(self):
         return self.program_name
-    
+
     def getFunctions(self):
         return self.functions
-    
+
+    def findFunction(self, name):
+        """
+        이름 또는 0x로 시작하는 주소로 함수를 찾습니다. (없으면 None)
+        """
+        function_manager = self.program.getFunctionManager()
+        if name.lower().startswith('0x'):
+            address = self.program.getAddressFactory().getDefaultAddressSpace().getAddress(name)
+            return function_manager.getFunctionContaining(address)
+        for function in function_manager.getFunctions(True):
+            if function.getName() == name:
+                return function
+        return None
+
+    def selectFunctions(self, names, depth=0):
+        """
+        이름으로 지정한 함수와, depth 단계까지의 호출자(callers)/피호출자(callees)를 주소 순서로 반환합니다.
+        찾지 못한 이름 목록도 함께 반환합니다.
+        """
+        selected = {}
+        missing = []
+        frontier = []
+        for name in names:
+            function = self.findFunction(name)
+            if function is None:
+                missing.append(name)
+                continue
+            key = function.getEntryPoint().getOffset()
+            if key not in selected:
+                selected[key] = function
+                frontier.append(function)
+
+        for _ in range(depth):
+            next_frontier = []
+            for function in frontier:
+                neighbors = list(function.getCalledFunctions(self.monitor)) + list(function.getCallingFunctions(self.monitor))
+                for neighbor in neighbors:
+                    key = neighbor.getEntryPoint().getOffset()
+                    if key not in selected:
+                        selected[key] = neighbor
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+
+        return [selected[key] for key in sorted(selected)], missing
+
     def decompileFunctions(self, function):
-        tokengrp = self.decomp_interface.decompileFunction(function, 0, ConsoleTaskMonitor())
+        decomp_interface = self.decomp_interfaces.take()
+        try:
+            tokengrp = decomp_interface.decompileFunction(function, self.timeout, ConsoleTaskMonitor())
+        finally:
+            self.decomp_interfaces.put(decomp_interface)
+        if tokengrp is None or not tokengrp.decompileCompleted() or tokengrp.getDecompiledFunction() is None:
+            if tokengrp is not None and tokengrp.isTimedOut():
+                raise DecompileError('timed out after ' + str(self.timeout) + 's')
+            message = tokengrp.getErrorMessage() if tokengrp is not None else ''
+            raise DecompileError(message.strip() or 'decompile failed')
         decompile_func = tokengrp.getDecompiledFunction().getC()
         return decompile_func
 
+    def decompileAll(self, functions):
+        """
+        함수들을 스레드 풀에서 병렬로 디컴파일하되, 입력 순서대로 (function, C 코드, 오류 메시지)를 생성합니다.
+        메모리 사용을 제한하기 위해 스레드 수의 4배까지만 미리 제출합니다.
+        """
+        if self.threads == 1:
+            for function in functions:
+                code, error = DecompileTask(self, function).call()
+                yield function, code, error
+            return
+
+        executor = Executors.newFixedThreadPool(self.threads)
+        try:
+            pending = deque()
+            for function in functions:
+                pending.append((function, executor.submit(DecompileTask(self, function))))
+                if len(pending) >= self.threads * 4:
+                    done_function, future = pending.popleft()
+                    code, error = future.get()
+                    yield done_function, code, error
+            while pending:
+                done_function, future = pending.popleft()
+                code, error = future.get()
+                yield done_function, code, error
+        finally:
+            executor.shutdownNow()
+
+    def functionHash(self, function):
+        """
+        이전 버전과 비교하기 위한 함수의 정규화 해시를 반환합니다.
+        함수 이름, 프로토타입과 명령어(니모닉, 피연산자)를 해시하되, 다른 위치를 가리키는 피연산자
+        (호출 / 분기 대상, 전역 변수)는 주소 대신 대상 심볼 이름으로 바꿉니다.
+        이름이 있는 함수나 변수는 코드가 이동해도 해시가 같고, FUN_00401000 처럼 주소가 들어간 기본 이름은
+        C 코드에도 그대로 나오므로 이동하면 해시도 바뀝니다. (해시가 같으면 C 코드를 그대로 재사용합니다.)
+        """
+        symbol_table = self.program.getSymbolTable()
+        parts = [function.getName(), function.getPrototypeString(False, False)]
+        for instruction in self.program.getListing().getInstructions(function.getBody(), True):
+            operands = []
+            for i in range(instruction.getNumOperands()):
+                references = instruction.getOperandReferences(i)
+                if not references:
+                    operands.append(instruction.getDefaultOperandRepresentation(i))
+                    continue
+                names = []
+                for reference in references:
+                    symbol = symbol_table.getPrimarySymbol(reference.getToAddress())
+                    names.append(symbol.getName(True) if symbol is not None else reference.getToAddress().toString())
+                operands.append('@' + '|'.join(names))
+            parts.append(instruction.getMnemonicString() + ' ' + ','.join(operands))
+        return hashlib.sha1(u'\n'.join(parts).encode('utf-8')).hexdigest()
+
     def calledFunctions(self, function):
         callingFuncs = function.getCalledFunctions(self.monitor)
         return callingFuncs
 
-def main():
-    ghidra = Ghidra()
+    def exportCallGraph(self, path):
+        """
+        프로그램 전체(외부 함수 포함)의 호출 그래프를 한 번에 path 에 저장합니다.
+        노드 i 가 호출하는 함수 번호를 targets[offsets[i]:offsets[i+1]] 에 두는 CSR 형식 정수 배열과
+        함수 이름 테이블로 기록하며, 형식은 elf_analyzer/callgraph.py 의 CallGraph 를 참고하세요.
+        """
+        function_manager = self.program.getFunctionManager()
+        functions = list(function_manager.getFunctions(True)) + list(function_manager.getExternalFunctions())
+        ids = {}
+        for function in functions:
+            ids[function.getEntryPoint()] = len(ids)
+        offsets = [0]
+        targets = []
+        for function in functions:
+            called = set()
+            for callee in self.calledFunctions(function):
+                node = ids.get(callee.getEntryPoint())
+                if node is not None:
+                    called.add(node)
+            targets.extend(sorted(called))
+            offsets.append(len(targets))
+        entries = [function.getEntryPoint().getOffset() for function in functions]
+        flags = [(CALLGRAPH_FLAG_EXTERNAL if function.isExternal() else 0)
+                 | (CALLGRAPH_FLAG_THUNK if function.isThunk() else 0) for function in functions]
+        names = u'\n'.join(str(function) for function in functions).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(struct.pack('<4sIII', CALLGRAPH_MAGIC, CALLGRAPH_VERSION, len(functions), len(targets)))
+            f.write(struct.pack('<%dI' % len(offsets), *offsets))
+            f.write(struct.pack('<%dI' % len(targets), *targets))
+            f.write(struct.pack('<%dQ' % len(entries), *entries))
+            f.write(struct.pack('<%dB' % len(flags), *flags))
+            f.write(struct.pack('<I', len(names)))
+            f.write(names)
+
+    def dispose(self):
+        for decomp_interface in self.all_interfaces:
+            decomp_interface.dispose()
+
+
+def parseArgs(args):
+    """
+    key=value 형식의 스크립트 인자를 dict로 변환합니다.
+    (analyzeHeadless는 '-'로 시작하는 인자를 자신의 옵션으로 해석하므로 key=value 형식을 사용합니다.)
+    """
+    options = {}
+    for arg in args:
+        if '=' in arg:
+            key, value = arg.split('=', 1)
+            options[key] = value
+    return options
+
+
+def resolveLogDir(program, options):
+    """
+    outmap 인자로 전달된 {실행 파일 경로: 로그 디렉토리} JSON에서 이 프로그램의 로그 디렉토리를 찾습니다.
+    한 번의 analyzeHeadless 실행으로 여러 바이너리를 처리할 때 바이너리별 출력 디렉토리를 구분하는 데 사용합니다.
+    캐시된 프로젝트를 -process 로 여는 경우처럼 바이너리가 하나뿐이면 logdir 인자로 바로 지정합니다.
+    (프로젝트의 실행 파일 경로는 처음 import 한 경로이므로 바이너리가 옮겨졌으면 outmap 과 맞지 않습니다.)
+    """
+    if options.get('logdir'):
+        return options['logdir']
+    outmap_path = options.get('outmap')
+    if not outmap_path or not os.path.exists(outmap_path):
+        return None
+    with open(outmap_path) as f:
+        outmap = json.load(f)
+    executable_path = program.getExecutablePath()
+    for key in (executable_path, os.path.abspath(executable_path)):
+        if key in outmap:
+            return outmap[key]
+    return outmap.get(program.getName())
+
+
+def saveProject(program, project_dir):
+    """
+    자동 분석이 끝난 프로그램을 project_dir 의 Ghidra 프로젝트(decompile.gpr)로 저장합니다.
+    decompile/run.py 가 처음 보는 바이너리를 한 번의 analyzeHeadless 실행으로 import 할 때 saveto 인자로 요청하며,
+    다음 실행에서는 이 프로젝트를 -process 로 열어 import 와 자동 분석을 건너뜁니다.
+    저장에 실패해도 디컴파일은 계속합니다. (다음 실행에서 다시 import 합니다.)
+    """
+    if os.path.exists(os.path.join(project_dir, PROJECT_NAME + '.gpr')):
+        # 같은 내용의 파일이 한 번의 실행에 두 번 주어진 경우
+        return
+    try:
+        project = GhidraProject.createProject(project_dir, PROJECT_NAME, False)
+        try:
+            project.saveAs(program, '/', program.getName(), True)
+        finally:
+            project.close()
+    except (Exception, Throwable) as e:
+        print('[!] Failed to save the analyzed project for ' + str(program.getName()) + ': ' + str(e))
+
+
+def decompileProgram(program, log_dir=None, options=None):
+    options = options or {}
+    # threads=0 이면 CPU 코어 수만큼, timeout=0 이면 제한 없이 디컴파일합니다.
+    threads = int(options.get('threads', '1')) or Runtime.getRuntime().availableProcessors()
+    ghidra = Ghidra(program, threads, int(options.get('timeout', '0')))
     program_name = ghidra.getProgramName()
 
-    log = Log(program_name)
+    # incremental=0 이 아니면 같은 로그 디렉토리의 이전 결과(또는 previous 인자로 지정한 결과)와 비교하여
+    # 해시가 바뀌지 않은 함수는 디컴파일하지 않고 이전 C 코드를 재사용합니다.
+    incremental = options.get('incremental', '1') == '1'
+    log = Log(program_name, log_dir, options.get('stream'), keep_previous=incremental,
+              sha256=program.getExecutableSHA256())
+    previous = None
+    if options.get('previous'):
+        previous = PreviousDecompile(options['previous'])
+    elif incremental and log.previous is not None:
+        previous = PreviousDecompile(*log.previous)
+
+    # functions=main,vuln 인자가 있으면 해당 함수(와 depth 단계의 호출 관계 함수)만 디컴파일합니다.
+    names = [name for name in options.get('functions', '').split(',') if name]
+    if names:
+        functions, missing = ghidra.selectFunctions(names, int(options.get('depth', '0')))
+        for name in missing:
+            log.note("[!] Function not found : " + name)
+    else:
+        functions = ghidra.getFunctions()
+
+    if previous is None:
+        for function, decompile_func, error in ghidra.decompileAll(functions):
+            if error is not None:
+                log.failedFunction(function, error)
+                continue
+            log.loggingFunction(function, decompile_func, ghidra.functionHash(function))
+    else:
+        decompileChanged(ghidra, log, previous, list(functions), removed=not names)
+        previous.close()
+
+    if log.failed:
+        log.note("[!] " + str(len(log.failed)) + " function(s) failed or timed out")
+
+    ghidra.exportCallGraph(log.callgraph_name)
 
-    for function in ghidra.getFunctions():
-        decompile_func = ghidra.decompileFunctions(function)
-        log.loggingFunction(function, decompile_func)
-    
     log.close()
+    ghidra.dispose()
     return log.file_name
-        
+
+
+def decompileChanged(ghidra, log, previous, functions, removed=True):
+    """
+    해시가 바뀌었거나 새로 생긴 함수만 디컴파일하고, 나머지는 이전 버전의 C 코드를 재사용합니다.
+    결과는 함수 순서대로 기록하며, 비교 결과를 log.diff 에 남깁니다.
+    (removed 가 False 이면 일부 함수만 선택한 실행이므로 사라진 함수를 계산하지 않습니다.)
+    """
+    hashes = [ghidra.functionHash(function) for function in functions]
+    pending = [function for function, function_hash in zip(functions, hashes)
+               if not previous.reusable(str(function), function_hash)]
+    decompiled = ghidra.decompileAll(pending)
+    changed = []
+    added = []
+    reused = 0
+    for function, function_hash in zip(functions, hashes):
+        name = str(function)
+        if previous.reusable(name, function_hash):
+            log.loggingFunction(function, previous.code(name), function_hash, reused=True)
+            reused += 1
+            continue
+        (changed if name in previous.names else added).append(name)
+        done_function, decompile_func, error = next(decompiled)
+        if error is not None:
+            log.failedFunction(done_function, error)
+            continue
+        log.loggingFunction(done_function, decompile_func, function_hash)
+    current = set(str(function) for function in functions)
+    log.diff = {
+        'previous': previous.index_path,
+        'changed': changed,
+        'added': added,
+        'removed': sorted(previous.names - current) if removed else [],
+        'reused': reused,
+    }
+    log.note('[*] ' + str(len(changed)) + ' changed, ' + str(len(added)) + ' added, '
+             + str(len(log.diff['removed'])) + ' removed, ' + str(reused) + ' reused function(s)')
+
+
+def runWorker(options):
+    """
+    표준 입력에서 한 줄에 하나씩 바이너리 경로를 받아 같은 JVM에서 import, 자동 분석, 디컴파일을 반복합니다.
+    각 바이너리가 끝날 때마다 표준 출력에 WORKER_DONE_MARKER 줄을 출력합니다.
+    빈 줄이나 EOF를 받으면 종료합니다.
+    """
+    while True:
+        line = sys.stdin.readline()
+        if not line or not line.strip():
+            break
+        request = line.strip()
+        program = None
+        try:
+            program = importFile(File(request)) # type: ignore
+            analyzeAll(program) # type: ignore
+            log_file = decompileProgram(program, None, options)
+            print(WORKER_DONE_MARKER + '\t' + request + '\t' + log_file)
+        except (Exception, Throwable) as e:
+            print(WORKER_ERROR_MARKER + '\t' + request + '\t' + str(e))
+        finally:
+            if program is not None:
+                program.release(this) # type: ignore
+        sys.stdout.flush()
+
+
+def main():
+    options = parseArgs(getScriptArgs()) # type: ignore
+    if options.get('saveto'):
+        saveProject(currentProgram, os.path.join(options['saveto'], currentProgram.getExecutableSHA256().lower())) # type: ignore
+    log_file = decompileProgram(currentProgram, resolveLogDir(currentProgram, options), options) # type: ignore
+    if options.get('worker') == '1':
+        print(WORKER_DONE_MARKER + '\t' + str(currentProgram.getExecutablePath()) + '\t' + log_file) # type: ignore
+        sys.stdout.flush()
+        runWorker(options)
+    return log_file
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,184 @@
+import fcntl
+import json
+import os
+import re
+import shutil
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional
+
+DEFAULT_PROJECTS_DIR = os.path.join('.', 'projects')
+# 바이너리마다 만드는 Ghidra 프로젝트 이름 (<projects>/<sha256>/decompile.gpr)
+PROJECT_NAME = 'decompile'
+# import 와 자동 분석이 끝난 프로젝트에만 기록되는 메타데이터 파일
+META_FILE = 'meta.json'
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+_DIGEST = re.compile(r'[0-9a-f]{64}')
+
+class GhidraProjectCache:
+    """
+    자동 분석이 끝난 Ghidra 프로젝트를 바이너리의 SHA-256 별로 보관하는 캐시입니다.
+    처음 보는 바이너리는 -import 로 분석한 프로젝트를 남기고,
+    같은 바이너리를 다시 디컴파일할 때는 -process -noanalysis 로 post-script 만 실행합니다.
+    처음 보는 바이너리가 여러 개이면 한 번의 analyzeHeadless 실행으로 모두 import 하고,
+    post-script(decompile_script.py 의 saveto 인자)가 바이너리마다 <root>/<sha256> 프로젝트로 저장합니다.
+    마지막 사용 후 max_age 초가 지났거나 전체 크기가 max_bytes 를 넘으면 오래된 프로젝트부터 제거합니다.
+
+    디렉토리 구조:
+      <root>/<sha256>/decompile.gpr, decompile.rep/
+      <root>/<sha256>/meta.json   (분석 완료 표시, 마지막 사용 시각)
+      <root>/<sha256>.lock        (같은 프로젝트를 동시에 여는 것을 막는 잠금 파일)
+
+    사용 예제:
+      projects = GhidraProjectCache()
+      with projects.locked(digest):
+          args = projects.headless_args(digest, input_file)
+          ... analyzeHeadless 실행 ...
+          projects.mark_used(digest, input_file)
+      projects.evict(keep=[digest])
+    """
+    def __init__(self, root: str = DEFAULT_PROJECTS_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age: float = DEFAULT_MAX_AGE):
+        """
+        생성자
+
+        arguments:
+          root (str): 프로젝트를 보관할 디렉토리
+          max_bytes (int): 보관할 프로젝트 전체의 최대 크기 (바이트, 0이면 제한 없음)
+          max_age (float): 마지막 사용 후 보관할 시간 (초, 0이면 제한 없음)
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(self.root, exist_ok=True)
+
+    def project_dir(self, digest: str) -> str:
+        return os.path.join(self.root, digest)
+
+    def _meta_path(self, digest: str) -> str:
+        return os.path.join(self.project_dir(digest), META_FILE)
+
+    def is_analyzed(self, digest: str) -> bool:
+        """
+        import 와 자동 분석이 끝난 프로젝트가 있는지 확인합니다.
+        """
+        return os.path.isfile(self._meta_path(digest))
+
+    @contextmanager
+    def locked(self, digest: str, blocking: bool = True) -> Iterator[bool]:
+        """
+        프로젝트 잠금을 잡은 상태로 실행합니다. (Ghidra 는 같은 프로젝트를 두 프로세스에서 열 수 없습니다.)
+        blocking=False 이면 다른 프로세스가 사용 중일 때 기다리지 않고 False 를 넘깁니다.
+        """
+        with open(os.path.join(self.root, digest + '.lock'), 'w') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def is_saved(self, digest: str) -> bool:
+        """
+        프로젝트 파일(decompile.gpr)이 만들어졌는지 확인합니다. (mark_used 전의 분석 완료 여부 확인용)
+        """
+        return os.path.isfile(os.path.join(self.project_dir(digest), PROJECT_NAME + '.gpr'))
+
+    def prepare_import(self, digest: str) -> str:
+        """
+        분석이 끝나지 않은 채 남은 프로젝트(중단된 import)를 지우고 빈 프로젝트 디렉토리를 만들어 반환합니다.
+        (locked() 안에서 호출해야 합니다.)
+        """
+        project_dir = self.project_dir(digest)
+        shutil.rmtree(project_dir, ignore_errors=True)
+        os.makedirs(project_dir)
+        return project_dir
+
+    def headless_args(self, digest: str, input_file: str) -> list:
+        """
+        analyzeHeadless 에 넘길 프로젝트 위치, 프로젝트 이름과 import / process 옵션을 반환합니다.
+        분석이 끝나지 않은 채 남은 프로젝트(중단된 import)는 지우고 다시 import 합니다.
+        (locked() 안에서 호출해야 합니다.)
+        """
+        if self.is_analyzed(digest):
+            # 프로젝트에는 바이너리 하나만 있으므로 -process 에 이름을 주지 않습니다.
+            return [self.project_dir(digest), PROJECT_NAME, '-process', '-noanalysis', '-readOnly']
+        project_dir = self.prepare_import(digest)
+        return [project_dir, PROJECT_NAME, '-import', os.path.abspath(input_file), '-overwrite']
+
+    def mark_used(self, digest: str, input_file: str) -> None:
+        """
+        analyzeHeadless 가 성공한 뒤 호출하여 분석 완료와 마지막 사용 시각을 기록합니다.
+        """
+        meta_path = self._meta_path(digest)
+        meta = {'path': os.path.abspath(input_file), 'created': time.time()}
+        if os.path.isfile(meta_path):
+            with open(meta_path) as f:
+                meta.update(json.load(f))
+        meta['last_used'] = time.time()
+        with open(meta_path + '.tmp', 'w') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + '.tmp', meta_path)
+
+    def _size(self, digest: str) -> int:
+        size = 0
+        for dir_path, _, file_names in os.walk(self.project_dir(digest)):
+            for name in file_names:
+                try:
+                    size += os.path.getsize(os.path.join(dir_path, name))
+                except OSError:
+                    pass
+        return size
+
+    def _last_used(self, digest: str) -> float:
+        try:
+            with open(self._meta_path(digest)) as f:
+                return json.load(f).get('last_used', 0)
+        except (OSError, ValueError):
+            # 분석이 끝나지 않은 프로젝트는 디렉토리 수정 시각을 사용합니다.
+            return os.path.getmtime(self.project_dir(digest))
+
+    def remove(self, digest: str) -> bool:
+        """
+        프로젝트를 제거합니다. 다른 프로세스가 사용 중이면 제거하지 않고 False를 반환합니다.
+        """
+        with self.locked(digest, blocking=False) as acquired:
+            if not acquired:
+                return False
+            shutil.rmtree(self.project_dir(digest), ignore_errors=True)
+            os.remove(os.path.join(self.root, digest + '.lock'))
+        return True
+
+    def evict(self, keep: Optional[Iterable[str]] = None) -> None:
+        """
+        max_age 보다 오래 사용되지 않은 프로젝트를 제거하고,
+        전체 크기가 max_bytes 이하가 될 때까지 가장 오래 사용되지 않은 프로젝트부터 제거합니다.
+
+        arguments:
+          keep (Optional[Iterable[str]]): 크기 제한 때문에 제거하지 않을 SHA-256 목록 (방금 사용한 프로젝트)
+        """
+        keep = set(keep or ())
+        # ./projects 에는 캐시하지 않는 프로젝트(decompile_worker 등)도 있으므로 SHA-256 이름만 대상으로 합니다.
+        digests = [name for name in os.listdir(self.root)
+                   if _DIGEST.fullmatch(name) and os.path.isdir(self.project_dir(name))]
+        last_used = {digest: self._last_used(digest) for digest in digests}
+        now = time.time()
+        remaining = []
+        for digest in sorted(digests, key=last_used.get):
+            if self.max_age and now - last_used[digest] > self.max_age and digest not in keep:
+                self.remove(digest)
+            else:
+                remaining.append(digest)
+        if not self.max_bytes:
+            return
+        sizes = {digest: self._size(digest) for digest in remaining}
+        total = sum(sizes.values())
+        for digest in remaining:
+            if total <= self.max_bytes:
+                break
+            if digest not in keep and self.remove(digest):
+                total -= sizes[digest]
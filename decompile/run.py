@@ -2,51 +2,405 @@
 
 import sys
 import glob
+import json
+import select
+import shutil
 import subprocess
 import os
+import tempfile
+import time
+from contextlib import ExitStack
+from typing import Dict, Iterator, List, Optional
 from config.config_manager import config
+from decompile.projects import PROJECT_NAME, GhidraProjectCache
+from elf_analyzer.cache import file_sha256
+from elf_analyzer.profiling import run_child, wait_child
 
-def run_decompile(input_file):
+# decompile_script.py 의 worker 모드 표식과 동일해야 합니다.
+WORKER_DONE_MARKER = '@@easy-pwntools-decompiled@@'
+WORKER_ERROR_MARKER = '@@easy-pwntools-error@@'
+
+# decompile_script.Log 가 만드는 파일 이름과 동일해야 합니다.
+DECOMPILE_INDEX_FILE = 'decompile.index.json'
+DECOMPILE_DATA_FILE = 'decompile.c.gz'
+
+def _get_script_path():
     script_path = config.get('decompile', 'ghidra_decompile_script')
 
     if not os.path.exists(script_path):
         print(f"Error: {script_path} not exist")
         sys.exit(1)
-    
+    return script_path
+
+def _find_analyze_headless():
     # ghidra 디렉토리 내의 analyzeHeadless 실행 파일 찾기
     matches = glob.glob('./ghidra/*/support/analyzeHeadless')
     if not matches:
         print("Cannot find the analyzeHeadless file.")
         sys.exit(1)
-    analyze_headless = matches[0]
-    
-    # 실행할 명령어 구성
+    return matches[0]
+
+def default_log_dir(input_file, digest: Optional[str] = None):
+    """
+    decompile_script.py 가 기본으로 사용하는 logs/<파일명>-<SHA-256 앞 12자리>/decompile 경로를 반환합니다.
+    ELFAnalyzer 의 다른 단계 산출물과 같은 디렉토리이므로, 이름이 같은 다른 바이너리의 결과(와 증분 디컴파일의
+    previous.* 기준)를 덮어쓰지 않습니다.
+
+    arguments:
+      input_file (str): 바이너리 경로
+      digest (Optional[str]): 이미 계산한 SHA-256 (None이면 파일을 읽어 계산)
+    """
+    base_name = os.path.splitext(os.path.basename(input_file))[0]
+    digest = digest or file_sha256(input_file)
+    return os.path.join('.', 'logs', f"{base_name}-{digest[:12]}", 'decompile')
+
+def _assign_log_dirs(input_files) -> Dict[str, str]:
+    """
+    입력 파일마다 출력 디렉토리를 배정합니다.
+    내용이 같은 파일이 여러 번 주어지면 logs/<파일명>-<해시>_<n>/decompile 처럼 번호를 붙여 구분합니다.
+    """
+    log_dirs = {}
+    used = set()
+    for input_file in input_files:
+        log_dir = default_log_dir(input_file)
+        base_dir = os.path.dirname(log_dir)
+        index = 1
+        while log_dir in used:
+            log_dir = os.path.join(f"{base_dir}_{index}", 'decompile')
+            index += 1
+        used.add(log_dir)
+        log_dirs[os.path.abspath(input_file)] = log_dir
+    return log_dirs
+
+def _script_args(functions: Optional[List[str]], depth: int, previous: Optional[str] = None) -> List[str]:
+    """
+    decompile_script.py 에 넘길 key=value 인자를 만듭니다.
+    (스레드 수/함수별 제한 시간/증분 디컴파일은 config.ini 의 decompile 섹션, 선택적 디컴파일은 functions/depth)
+    """
+    args = [
+        f"threads={config.getint('decompile', 'threads', fallback=0)}",
+        f"timeout={config.getint('decompile', 'timeout', fallback=60)}",
+    ]
+    if not config.getboolean('decompile', 'incremental', fallback=True):
+        args.append("incremental=0")
+    if previous:
+        args.append(f"previous={os.path.abspath(previous)}")
+    if functions:
+        args += [f"functions={','.join(functions)}", f"depth={depth}"]
+    return args
+
+def run_decompile(input_file, functions: Optional[List[str]] = None, depth: int = 0,
+                  previous: Optional[str] = None):
+    """
+    단일 바이너리를 디컴파일하고 decompile.index.json 경로를 반환합니다.
+
+    arguments:
+      input_file (str): 디컴파일할 바이너리 경로
+      functions (Optional[List[str]]): 디컴파일할 함수 이름(또는 0x 주소) 목록 (None이면 전체)
+      depth (int): 지정한 함수로부터 포함할 호출자/피호출자 깊이
+      previous (Optional[str]): 비교할 이전 버전의 decompile.index.json 경로
+                                (None이면 같은 로그 디렉토리에 남아 있는 이전 결과와 비교)
+    """
+    return run_decompile_batch([input_file], functions, depth, previous)[os.path.abspath(input_file)]
+
+def _check_headless(returncode: int, command: List[str]) -> None:
+    """
+    analyzeHeadless 가 실패했으면 오류를 출력한 뒤 종료합니다.
+    """
+    if returncode != 0:
+        print("Command execution failed:", subprocess.CalledProcessError(returncode, command))
+        sys.exit(returncode)
+
+def _read_records(process: subprocess.Popen, fifo_path: str, start: float) -> Iterator[Dict]:
+    """
+    decompile_script.py 가 FIFO에 쓰는 JSON 레코드를 한 줄씩 읽어 생성하고,
+    analyzeHeadless 가 끝나면 남은 레코드를 모두 읽은 뒤 wait4 로 회수합니다.
+    """
+    # O_RDWR 로 열어 두면 스크립트가 프로그램마다 FIFO를 열고 닫아도 EOF가 되지 않고, 쓰는 쪽도 막히지 않습니다.
+    fd = os.open(fifo_path, os.O_RDWR | os.O_NONBLOCK)
+    buffer = b''
+    try:
+        exited = False
+        while True:
+            if not exited:
+                exited = wait_child(process, start, block=False) is not None
+            readable, _, _ = select.select([fd], [], [], 0 if exited else 0.2)
+            chunk = b''
+            if readable:
+                try:
+                    chunk = os.read(fd, 1 << 16)
+                except BlockingIOError:
+                    pass
+            if not chunk:
+                if exited:
+                    break
+                continue
+            buffer += chunk
+            if b'\n' in chunk:
+                *lines, buffer = buffer.split(b'\n')
+                for line in lines:
+                    if line.strip():
+                        yield json.loads(line)
+    finally:
+        os.close(fd)
+        if not exited:
+            # 소비자가 중간에 멈추면 Ghidra도 종료합니다.
+            process.kill()
+            wait_child(process, start)
+
+def _run_headless(command: List[str], stream: bool) -> Iterator[Dict]:
+    """
+    analyzeHeadless 를 실행하고, 실패하면 오류를 출력한 뒤 종료합니다.
+    wait4 로 회수하여 analyzeHeadless(JVM)의 CPU 시간과 최대 RSS를 현재 분석 단계에 기록합니다.
+    stream 이 True 이면 FIFO를 만들어 스크립트에 넘기고, 함수별 레코드를 생성합니다.
+    """
+    if not stream:
+        _check_headless(run_child(command).returncode, command)
+        return
+    fifo_dir = tempfile.mkdtemp(prefix='decompile-stream-')
+    fifo_path = os.path.join(fifo_dir, 'records')
+    os.mkfifo(fifo_path)
+    command = command + [f"stream={fifo_path}"]
+    try:
+        start = time.perf_counter()
+        process = subprocess.Popen(command)
+        yield from _read_records(process, fifo_path, start)
+    finally:
+        shutil.rmtree(fifo_dir, ignore_errors=True)
+    _check_headless(process.returncode, command)
+
+def _project_cache() -> Optional[GhidraProjectCache]:
+    """
+    config.ini 의 decompile 섹션 설정으로 Ghidra 프로젝트 캐시를 만듭니다. (project_cache=false 이면 None)
+    """
+    if not config.getboolean('decompile', 'project_cache', fallback=True):
+        return None
+    return GhidraProjectCache(
+        max_bytes=config.getint('decompile', 'project_cache_max_mb', fallback=20480) * 1024 * 1024,
+        max_age=config.getfloat('decompile', 'project_cache_max_age_days', fallback=30) * 24 * 60 * 60,
+    )
+
+def _run_import_session(analyze_headless: str, script_path: str, project: List[str], log_dirs: Dict[str, str],
+                        script_args: List[str], stream: bool) -> Iterator[Dict]:
+    """
+    log_dirs 의 바이너리를 한 번의 analyzeHeadless 실행(JVM 하나)으로 모두 import 하고,
+    스크립트가 프로그램별 출력 디렉토리를 찾을 수 있도록 매핑 파일(outmap)을 넘깁니다.
+    (project 는 [프로젝트 위치, 프로젝트 이름], 실행이 끝나면 프로젝트를 지웁니다.)
+    """
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump(log_dirs, f)
+        outmap_path = f.name
+
+    # 명령어 구성
     command = [
         analyze_headless,
-        "./projects",
-        "decompile",
-        "-import", input_file,
+        *project,
+        "-import", *log_dirs,
         "-deleteProject",
         "-overwrite",
-        "-postScript", script_path
+        "-postScript", script_path, f"outmap={outmap_path}", *script_args
     ]
-    
+
     # 명령어 실행
     try:
-        subprocess.run(command, check=True)
-    except subprocess.CalledProcessError as e:
-        print("Command execution failed:", e)
-        sys.exit(e.returncode)
+        yield from _run_headless(command, stream)
+    finally:
+        os.remove(outmap_path)
+
+def _iter_cached_projects(projects: GhidraProjectCache, analyze_headless: str, script_path: str,
+                          log_dirs: Dict[str, str], script_args: List[str], stream: bool) -> Iterator[Dict]:
+    """
+    Ghidra 프로젝트 캐시를 사용하여 log_dirs 의 바이너리를 디컴파일합니다.
+    이미 분석한 바이너리는 바이너리마다 보관된 프로젝트를 -process 로 열어 post-script 만 실행하고,
+    처음 보는 바이너리는 한 번의 analyzeHeadless 실행으로 모두 import 하여 JVM 시작 비용을 한 번만 냅니다.
+    이때 스크립트가 자동 분석이 끝난 프로그램을 <projects>/<sha256> 프로젝트로 저장(saveto)하므로
+    다음 실행부터는 캐시를 사용합니다.
+    """
+    digests = {path: file_sha256(path) for path in log_dirs}
+    cold = {}
+    for path, log_dir in log_dirs.items():
+        with projects.locked(digests[path]):
+            if not projects.is_analyzed(digests[path]):
+                cold[path] = log_dir
+                continue
+            command = [
+                analyze_headless,
+                *projects.headless_args(digests[path], path),
+                "-postScript", script_path, f"logdir={log_dir}", *script_args
+            ]
+            yield from _run_headless(command, stream)
+            projects.mark_used(digests[path], path)
+
+    if cold:
+        with ExitStack() as locks:
+            # 여러 프로세스가 같은 순서로 잠그도록 정렬하고, 내용이 같은 파일은 한 번만 잠급니다.
+            for digest in sorted({digests[path] for path in cold}):
+                locks.enter_context(projects.locked(digest))
+                projects.prepare_import(digest)
+            session_dir = tempfile.mkdtemp(prefix='import-', dir=projects.root)
+            try:
+                yield from _run_import_session(
+                    analyze_headless, script_path, [session_dir, PROJECT_NAME], cold,
+                    [f"saveto={os.path.abspath(projects.root)}", *script_args], stream)
+            finally:
+                shutil.rmtree(session_dir, ignore_errors=True)
+            for path in cold:
+                if projects.is_saved(digests[path]):
+                    projects.mark_used(digests[path], path)
+    projects.evict(keep=set(digests.values()))
+
+def _iter_decompile(log_dirs: Dict[str, str], functions: Optional[List[str]], depth: int,
+                    stream: bool, previous: Optional[str] = None) -> Iterator[Dict]:
+    """
+    log_dirs 의 바이너리를 디컴파일합니다. stream 이 True 이면 함수별 레코드를 생성합니다.
+    Ghidra 프로젝트 캐시를 사용하면(기본값) 바이너리마다 SHA-256 으로 보관된 프로젝트를 사용하여,
+    이미 분석한 바이너리는 post-script 만 실행하고 처음 보는 바이너리는 한 번의 실행으로 모두 import 합니다.
+    project_cache=false 이면 한 번의 analyzeHeadless 실행(JVM 하나)으로 모두 import 한 뒤 프로젝트를 지웁니다.
+    """
+    script_path = _get_script_path()
+    analyze_headless = _find_analyze_headless()
+    script_args = _script_args(functions, depth, previous)
+
+    projects = _project_cache()
+    if projects is not None:
+        yield from _iter_cached_projects(projects, analyze_headless, script_path, log_dirs, script_args, stream)
+        return
+    yield from _run_import_session(analyze_headless, script_path, ["./projects", "decompile"], log_dirs,
+                                   script_args, stream)
+
+def run_decompile_batch(input_files: List[str], functions: Optional[List[str]] = None,
+                        depth: int = 0, previous: Optional[str] = None) -> Dict[str, str]:
+    """
+    여러 바이너리를 디컴파일하고 프로그램마다 decompile_script.py 를 실행합니다.
+
+    arguments:
+      input_files (List[str]): 디컴파일할 바이너리 경로 목록
+      functions (Optional[List[str]]): 디컴파일할 함수 이름(또는 0x 주소) 목록 (None이면 전체)
+      depth (int): 지정한 함수로부터 포함할 호출자/피호출자 깊이
+      previous (Optional[str]): 모든 바이너리와 비교할 이전 버전의 decompile.index.json 경로
+                                (None이면 바이너리마다 같은 로그 디렉토리에 남아 있는 이전 결과와 비교)
+
+    return:
+      Dict[str, str]: {입력 파일 절대 경로: decompile.index.json 경로}
+    """
+    log_dirs = _assign_log_dirs(input_files)
+    for _ in _iter_decompile(log_dirs, functions, depth, stream=False, previous=previous):
+        pass
+    return {path: os.path.join(log_dir, DECOMPILE_INDEX_FILE) for path, log_dir in log_dirs.items()}
+
+def stream_decompile(input_files: List[str], functions: Optional[List[str]] = None,
+                     depth: int = 0, previous: Optional[str] = None) -> Iterator[Dict]:
+    """
+    run_decompile_batch 와 같이 디컴파일하되, Ghidra가 함수 하나를 끝낼 때마다 레코드를 생성합니다.
+    전체 실행이 끝나기 전에 함수별 결과를 검색하거나 점수를 매길 수 있습니다.
+    생성기를 끝까지 소비하지 않고 닫으면 analyzeHeadless 도 종료됩니다.
+
+    레코드 (dict):
+      {"event": "function", "binary": 프로그램 이름, "name", "entry": "0x...", "size", "code": C 코드,
+       "reused": 이전 버전의 C 코드를 재사용했는지 여부}
+      {"event": "failed", "binary", "name", "entry", "error"}
+      {"event": "done", "binary", "index": decompile.index.json 경로, "diff": 이전 버전과의 비교 결과}
+      (done 은 바이너리 하나가 끝났을 때, diff 는 이전 결과와 비교했을 때만 포함)
+
+    사용 예제:
+      for record in stream_decompile(["./chall"]):
+          if record["event"] == "function" and "gets(" in record["code"]:
+              print(record["name"])
+    """
+    return _iter_decompile(_assign_log_dirs(input_files), functions, depth, stream=True, previous=previous)
+
+class DecompileWorker:
+    """
+    하나의 analyzeHeadless JVM을 계속 띄워 두고, 파이프(표준 입력)로 새 바이너리를 받아 디컴파일하는 워커입니다.
+    첫 바이너리로 JVM을 시작하며, 이후 요청은 JVM/Ghidra 시작 비용 없이 처리됩니다.
+
+    사용 예제:
+      with DecompileWorker() as worker:
+          index_path = worker.submit("./chall1")
+          index_path = worker.submit("./chall2")
+    """
+    def __init__(self, functions: Optional[List[str]] = None, depth: int = 0):
+        """
+        생성자
+
+        arguments:
+          functions (Optional[List[str]]): 모든 요청에 적용할 디컴파일 대상 함수 목록 (None이면 전체)
+          depth (int): 지정한 함수로부터 포함할 호출자/피호출자 깊이
+        """
+        self.functions = functions
+        self.depth = depth
+        self.process = None
+
+    def _start(self, input_file):
+        command = [
+            _find_analyze_headless(),
+            "./projects",
+            "decompile_worker",
+            "-import", os.path.abspath(input_file),
+            "-deleteProject",
+            "-overwrite",
+            "-postScript", _get_script_path(), "worker=1", *_script_args(self.functions, self.depth)
+        ]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1)
+
+    def _wait_result(self, input_file):
+        """
+        표준 출력에서 Ghidra 로그를 건너뛰고 완료 표식 줄을 기다립니다.
+        """
+        for line in self.process.stdout:
+            # headless 모드에서는 스크립트 출력 앞에 로그 접두사가 붙을 수 있습니다.
+            for marker in (WORKER_DONE_MARKER, WORKER_ERROR_MARKER):
+                index = line.find(marker)
+                if index == -1:
+                    continue
+                fields = line[index:].rstrip('\n').split('\t')
+                if marker == WORKER_ERROR_MARKER:
+                    raise RuntimeError(f"Decompile failed for {input_file}: {fields[-1]}")
+                return fields[-1]
+        raise RuntimeError("Decompile worker exited unexpectedly")
+
+    def submit(self, input_file):
+        """
+        바이너리 하나를 디컴파일하고 decompile.index.json 경로를 반환합니다. (완료될 때까지 대기)
+        """
+        if self.process is None or self.process.poll() is not None:
+            self._start(input_file)
+        else:
+            self.process.stdin.write(os.path.abspath(input_file) + '\n')
+            self.process.stdin.flush()
+        return self._wait_result(input_file)
+
+    def close(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.stdin.write('\n')
+            self.process.stdin.close()
+            self.process.wait()
+        self.process = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 def main():
     # 명령행 인자 확인
     if len(sys.argv) < 2:
-        print("Usage: {} <input file>".format(sys.argv[0]))
+        print("Usage: {} <input file> [<input file> ...]".format(sys.argv[0]))
+        print("       {} --worker   (read input files from stdin, one per line)".format(sys.argv[0]))
         sys.exit(1)
-    input_file = sys.argv[1]
-    
+
+    if sys.argv[1] == '--worker':
+        # 표준 입력으로 들어오는 바이너리를 하나의 JVM에서 차례로 디컴파일
+        with DecompileWorker() as worker:
+            for line in sys.stdin:
+                if line.strip():
+                    print(worker.submit(line.strip()), flush=True)
+        return
+
     # 분리된 함수 호출
-    run_decompile(input_file)
+    for input_file, index_path in run_decompile_batch(sys.argv[1:]).items():
+        print(f"{input_file}: {index_path}")
 
 if __name__ == '__main__':
     main()
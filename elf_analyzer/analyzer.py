@@ -1,257 +1,430 @@
 # elf_analyzer/analyzer.py
-import subprocess
+import hashlib
 import sys
-import time
 import os
-from typing import List, Optional
-from .models import ELFAnalysisResult, ChecksecInfo, ELFFileInfo
-from decompile.run import run_decompile
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from .models import ELFAnalysisResult, ImportedFunction, StageMetrics
+from .elf_parser import ELFParser
+from .checksec import compute_checksec
+from .strings_extractor import StringsExtractor, format_string
+from .blockgz import BlockGzipWriter, SUFFIX as COMPRESSED_SUFFIX
+from .cache import AnalysisCache, file_sha256
+from .decompile_index import DecompileIndex
+from .gadgets import GadgetFinder, format_gadget, is_supported as is_gadget_search_supported
+from .gadget_store import GadgetStore
+from .symbols import DEFAULT_DANGEROUS_FUNCTIONS, SymbolIndex
+from .profiling import measure_generator, measure_stage, run_child
+from config.config_manager import config
+
+# analyze()가 기본으로 실행하는 단계 (decompile은 Ghidra가 필요하므로 명시적으로 요청하거나 결과에 접근할 때 실행합니다.)
+STAGES = tuple(ELFAnalysisResult.STAGE_FIELDS)
+DEFAULT_STAGES = ("fileinfo", "checksec", "symbols", "strings", "ropgadget")
+# 오래 걸리는 단계 (concurrent=True 이면 스레드 풀에서 동시에 실행합니다.)
+SLOW_STAGES = ("strings", "ropgadget")
+# 블록 단위 gzip(.gz)으로 압축하여 저장하는 텍스트 산출물
+COMPRESSED_STAGES = ("strings", "ropgadget")
+# ELF 헤더만 읽어 캐시에서 복원하는 것보다 빠르므로 항상 새로 계산하는 단계
+# (checksec 판정 기준이 바뀌어도 이전 버전의 캐시 결과를 쓰지 않습니다.)
+UNCACHED_STAGES = ("fileinfo", "checksec")
+
+def dangerous_function_names() -> List[str]:
+    """
+    config.ini 의 elf_analyzer.dangerous_functions 에 설정된 위험 함수 이름 목록을 반환합니다.
+    """
+    names = config.get("elf_analyzer", "dangerous_functions", fallback=",".join(DEFAULT_DANGEROUS_FUNCTIONS))
+    return [name.strip() for name in names.split(",") if name.strip()]
+
+def absolute_artifact_paths(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    직렬화된 ELFAnalysisResult 의 산출물 경로(*_file)는 분석한 작업 디렉토리 기준이므로,
+    다른 디렉토리나 다른 프로세스에서도 읽을 수 있도록 절대 경로로 바꾼 dict 를 반환합니다.
+    """
+    return {name: os.path.abspath(value) if name.endswith("_file") and isinstance(value, str) else value
+            for name, value in result.items()}
+
 
 class ELFAnalyzer:
     """
     ELF 파일을 분석하는 클래스입니다.
-    ELF 파일의 파일 정보, checksec 정보, 문자열 추출, 취약 함수 확인 기능을 제공합니다.
+    ELF 파일의 파일 정보, checksec 정보, 심볼 / PLT / GOT 색인과 위험 함수 확인, 문자열 추출 기능을 제공합니다.
+    analysis_result 는 지연 평가되므로, 필요한 필드에 접근할 때 해당 단계만 실행됩니다.
+
+    사용 예제:
+      analyzer = ELFAnalyzer("./chall")
+      print(analyzer.analysis_result.checksec_info)     # checksec 단계만 실행
+      analyzer.analyze(stages=["strings", "ropgadget"])  # 두 단계를 동시에 실행
     """
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, strings_min_length: int = 4,
+                 cache: Optional[AnalysisCache] = None, gadget_jobs: Optional[int] = None,
+                 decompile_functions: Optional[List[str]] = None, decompile_depth: int = 0,
+                 decompile_previous: Optional[str] = None):
         """
         생성자
 
         arguments:
           file_path (str): 분석할 ELF 파일의 경로
+          strings_min_length (int): 추출할 문자열의 최소 길이
+          cache (Optional[AnalysisCache]): 분석 결과 캐시 (None이면 캐시를 사용하지 않음)
+          gadget_jobs (Optional[int]): 가젯 탐색 워커 프로세스 수 (None이면 CPU 수)
+          decompile_functions (Optional[List[str]]): decompile 단계에서 디컴파일할 함수 목록 (None이면 전체)
+          decompile_depth (int): decompile 단계에서 포함할 호출자/피호출자 깊이
+          decompile_previous (Optional[str]): decompile 단계에서 비교할 이전 버전의 decompile.index.json 경로
+                                              (바뀌지 않은 함수는 이전 C 코드를 재사용)
         """
         self.file_path = file_path
-        self.analysis_result = None
+        self.strings_min_length = strings_min_length
+        self.cache = cache
+        self.gadget_jobs = gadget_jobs
+        self.decompile_functions = decompile_functions
+        self.decompile_depth = decompile_depth
+        self.decompile_previous = decompile_previous
+        self.cache_key = None
+        self._content_hash = None
+        self._cached_data = None
+        self._lock = threading.RLock()
+        self.analysis_result = ELFAnalysisResult.pending(self._run_stage)
 
-    def _run_command(self, command: str) -> str:
+    def _artifact_path(self, stage: str) -> str:
+        """
+        단계 산출물이 저장될 logs/<파일명>-<해시>/<stage>/<파일명>.<stage> 경로를 반환하고, 디렉토리를 생성합니다.
+        이름이 같은 다른 바이너리(./a/chall, ./b/chall)를 동시에 분석해도 산출물이 섞이지 않도록
+        디렉토리 이름에 SHA-256 앞 12자리를 붙입니다.
+        COMPRESSED_STAGES 의 산출물은 블록 압축 파일이므로 .gz 를 붙입니다.
         """
-        주어진 쉘 명령어를 실행하고 결과 문자열을 반환합니다.
+        base_name = os.path.splitext(os.path.basename(self.file_path))[0]
+        output_dir = os.path.join("logs", f"{base_name}-{self._get_content_hash()[:12]}", stage)
+        os.makedirs(output_dir, exist_ok=True)
+        suffix = COMPRESSED_SUFFIX if stage in COMPRESSED_STAGES else ""
+        return os.path.join(output_dir, f"{base_name}.{stage}{suffix}")
 
-        arguments:
-          command (str): 실행할 쉘 명령어
+    def _get_content_hash(self) -> str:
+        """
+        파일의 SHA-256 을 반환합니다. 캐시를 사용하면 캐시 키(같은 값)를 재사용합니다.
+        """
+        with self._lock:
+            if self._content_hash is None:
+                self._content_hash = self._get_cache_key() if self.cache else file_sha256(self.file_path)
+            return self._content_hash
 
-        return:
-          str: 명령어 실행 결과 문자열
+    def _get_cache_key(self) -> str:
         """
-        try:
-            result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
-            return result.stdout.strip() if result.stdout.strip() else result.stderr.strip()
-        except subprocess.CalledProcessError as e:
-            return f"Error executing command: {e}"
+        캐시 키를 반환합니다. BuildID로 해시 계산을 생략할 수 있도록 fileinfo 단계를 먼저 실행합니다.
+        """
+        with self._lock:
+            if self.cache_key is None:
+                self.cache_key = self.cache.key_for(self.file_path, self.analysis_result.file_info.build_id)
+            return self.cache_key
 
-    def _parse_file_info(self, file_info_str: str) -> ELFFileInfo:
+    def _cache_stages(self) -> Tuple[Tuple[str, str, str], ...]:
         """
-        file 명령어의 출력 문자열을 파싱하여 ELFFileInfo 데이터 클래스로 반환합니다.
-        
-        매개변수:
-          file_info_str (str): file 명령어의 출력 문자열
-          
-        반환값:
-          ELFFileInfo: 파싱된 파일 정보 데이터 클래스 인스턴스
+        (캐시 단계 이름, 결과 속성, 산출물 종류) 목록을 반환합니다.
+        strings 산출물은 최소 길이 설정마다 따로 캐시합니다.
+        압축 산출물은 압축하지 않던 이전 캐시와 섞이지 않도록 캐시 단계 이름에 .gz 를 붙입니다.
         """
-        try:
-            _, info = file_info_str.split(":", 1)
-        except ValueError:
-            info = file_info_str
-        info = info.strip()
-        tokens = [token.strip() for token in info.split(",")]
-        
-        # 토큰 0: "ELF 64-bit LSB pie executable" 등을 파싱
-        first_token = tokens[0]  # 예: "ELF 64-bit LSB pie executable"
-        parts = first_token.split()
-        bit_format = parts[1] if len(parts) > 1 else ""
-        endian = parts[2] if len(parts) > 2 else ""
-        is_pie = "pie" in first_token.lower()
-        
-        # 토큰 1: CPU 아키텍처
-        cpu_arch = tokens[1] if len(tokens) > 1 else ""
-        
-        # 토큰 2: 버전 정보
-        version = tokens[2] if len(tokens) > 2 else ""
-        
-        # 토큰 3: 링크 방식
-        linking = tokens[3] if len(tokens) > 3 else ""
-        
-        # 토큰 4: 인터프리터 (존재하면)
-        interpreter = None
-        if len(tokens) > 4 and tokens[4].startswith("interpreter"):
-            interpreter = tokens[4][len("interpreter"):].strip()
-        
-        # 토큰 5: BuildID (존재하면)
-        build_id = None
-        if len(tokens) > 5 and tokens[5].startswith("BuildID"):
-            parts_build = tokens[5].split("=", 1)
-            if len(parts_build) == 2:
-                build_id = parts_build[1].strip()
-        
-        # 토큰 6: 대상 운영체제 (존재하면, "for ..."로 시작)
-        target_os = None
-        if len(tokens) > 6 and tokens[6].lower().startswith("for"):
-            target_os = tokens[6][len("for"):].strip()
-        
-        # 토큰 7: 심볼 제거 여부 (존재하면)
-        is_stripped = True
-        if len(tokens) > 7:
-            token7 = tokens[7].lower()
-            if "not stripped" in token7:
-                is_stripped = False
-            elif "stripped" in token7:
-                is_stripped = True
-        
-        return ELFFileInfo(
-            bit_format=bit_format,
-            endian=endian,
-            is_pie=is_pie,
-            cpu_arch=cpu_arch,
-            version=version,
-            linking=linking,
-            interpreter=interpreter,
-            build_id=build_id,
-            target_os=target_os,
-            is_stripped=is_stripped
+        return (
+            (f"strings-{self.strings_min_length}{COMPRESSED_SUFFIX}", "strings_file", "strings"),
+            (f"ropgadget{COMPRESSED_SUFFIX}", "ropgadget_file", "ropgadget"),
+            ("gadgets", "gadget_store_file", "gadgets"),
+            ("symbols", "symbols_file", "symbols"),
         )
-    
-    def _parse_checksec_info(self, checksec_info: str) -> ChecksecInfo:
+
+    def _load_cached_stage(self, stage: str) -> bool:
         """
-        checksec 명령어 결과 문자열을 파싱하여 ChecksecInfo 데이터 클래스로 반환합니다.
-        
-        arguments:
-          checksec_info (str): checksec 명령어의 출력 문자열
-          
-        return:
-          ChecksecInfo: 각 항목(RELRO, Stack Canary, NX, PIE)의 상태를 포함하는 데이터 클래스 인스턴스
+        캐시된 결과에서 단계의 필드와 산출물을 복원합니다.
+        캐시에 없거나 산출물이 빠져 있으면 False를 반환합니다.
         """
-        # RELRO 처리
-        if "RELRO" in checksec_info:
-            if "Partial RELRO" in checksec_info:
-                relro_status = "Partial"
-            elif "Full RELRO" in checksec_info:
-                relro_status = "Full"
-            elif "No RELRO" in checksec_info:
-                relro_status = "None"
-            else:
-                relro_status = "Unknown"
-        else:
-            relro_status = "Not found"
-        
-        # Stack Canary 처리
-        if "Stack" in checksec_info:
-            if "No canary found" in checksec_info:
-                stack_status = False
-            else:
-                stack_status = True
-        else:
-            stack_status = None
-        
-        # NX 처리
-        if "NX" in checksec_info:
-            if "NX enabled" in checksec_info:
-                nx_status = True
-            else:
-                nx_status = False
-        else:
-            nx_status = None
-        
-        # PIE 처리
-        if "PIE" in checksec_info:
-            if "PIE enabled" in checksec_info:
-                pie_status = True
-            else:
-                pie_status = False
-        else:
-            pie_status = None
-        
-        return ChecksecInfo(
-            relro=relro_status,
-            stack_canary=stack_status,
-            nx=nx_status,
-            pie=pie_status
-        )
-    
-    def analyze(self) -> ELFAnalysisResult:
+        key = self._get_cache_key()
+        with self._lock:
+            if self._cached_data is None:
+                self._cached_data = self.cache.load_result(key) or {}
+            cached = ELFAnalysisResult.from_dict(self._cached_data)
+        if not cached.evaluated(stage):
+            return False
+        values = {name: getattr(cached, name) for name in ELFAnalysisResult.STAGE_FIELDS[stage]}
+        for cache_stage, attr, kind in self._cache_stages():
+            if values.get(attr):
+                dest = self._artifact_path(kind)
+                if not self.cache.restore_artifact(key, cache_stage, dest):
+                    return False
+                values[attr] = dest
+        if stage == "symbols":
+            # 위험 함수 목록은 config.ini 에서 바뀔 수 있으므로 캐시된 값 대신 복원한 색인에서 다시 찾습니다.
+            values["dangerous_functions"] = SymbolIndex.load(values["symbols_file"]).find_imports(
+                dangerous_function_names())
+        self._set_stage(values)
+        return True
+
+    def _store_cached_stage(self, stage: str) -> None:
         """
-        ELF 파일을 분석하고 결과를 ELFAnalysisResult 데이터 클래스 형태로 반환합니다.
+        단계 산출물을 캐시에 복사하고, 지금까지 평가된 필드를 캐시된 결과에 합쳐 저장합니다.
+        """
+        key = self._get_cache_key()
+        fields = ELFAnalysisResult.STAGE_FIELDS[stage]
+        for cache_stage, attr, _ in self._cache_stages():
+            if attr in fields:
+                self.cache.put_artifact(key, cache_stage, getattr(self.analysis_result, attr))
+        with self._lock:
+            merged = dict(self._cached_data or {})
+            merged.update(self.analysis_result.to_dict())
+            # 측정값은 실행할 때마다 다르므로 캐시에 저장하지 않습니다.
+            merged.pop("metrics", None)
+            self._cached_data = merged
+            self.cache.store_result(key, merged, self.file_path, self.analysis_result.file_info.build_id)
 
-        return:
-          ELFAnalysisResult: 파일 정보, checksec 정보 및 분석 메시지를 포함한 분석 결과
+    def _set_stage(self, values: Dict[str, Any]) -> None:
+        with self._lock:
+            for name, value in values.items():
+                setattr(self.analysis_result, name, value)
+
+    def _run_stage(self, stage: str) -> None:
         """
-        if self.analysis_result is None:
-            raw_file_info = self._run_command(f"file {self.file_path}")
-            file_info_data = self._parse_file_info(raw_file_info)
+        단계 하나를 실행하여 analysis_result 의 해당 필드를 채웁니다. (이미 평가된 단계는 건너뜁니다.)
+        fileinfo / checksec 단계는 ELF 헤더만 읽으므로 캐시를 거치지 않고 항상 새로 만듭니다.
+        (fileinfo 의 요약 문자열은 현재 경로를 가리킵니다.)
+        """
+        if self.analysis_result.evaluated(stage):
+            return
+        if stage == "decompile":
+            self.run_decompile(self.decompile_functions, self.decompile_depth)
+            return
+        with measure_stage(stage) as metrics:
+            self._execute_stage(stage, metrics)
+        self._record_metrics(metrics)
+
+    def _record_metrics(self, metrics: StageMetrics) -> None:
+        with self._lock:
+            self.analysis_result.metrics.append(metrics)
 
-            checksec_str = self._run_command(f"checksec {self.file_path}")
-            checksec_info = self._parse_checksec_info(checksec_str)
+    def _execute_stage(self, stage: str, metrics: StageMetrics) -> None:
+        use_cache = self.cache is not None and stage not in UNCACHED_STAGES
+        if use_cache and self._load_cached_stage(stage):
+            metrics.cached = True
+            return
 
-            checksec_analysis = [
+        if stage == "fileinfo":
+            with ELFParser(self.file_path) as elf:
+                values = {"file_info_raw": elf.describe(), "file_info": elf.file_info()}
+        elif stage == "checksec":
+            with ELFParser(self.file_path) as elf:
+                checksec_info = compute_checksec(elf)
+            values = {"checksec_info": checksec_info, "checksec_analysis": [
                 f"RELRO: {checksec_info.relro}",
                 f"Stack Canary: {checksec_info.stack_canary}",
                 f"NX: {checksec_info.nx}",
-                f"PIE: {checksec_info.pie}"
-            ]
-
-            strings_file = self._save_strings()
-            ropgadget_file = self._save_ropgadget()
-            
-            self.analysis_result = ELFAnalysisResult(
-                file_info_raw=raw_file_info,
-                file_info=file_info_data,
-                checksec_info=checksec_info,
-                checksec_analysis=checksec_analysis,
-                strings_file=strings_file,
-                ropgadget_file=ropgadget_file
-            )
+                f"PIE: {'DSO' if checksec_info.shared_object else checksec_info.pie}",
+                f"FORTIFY: {checksec_info.fortify}",
+                f"RPATH: {checksec_info.rpath}",
+                f"RUNPATH: {checksec_info.runpath}"
+            ]}
+        elif stage == "symbols":
+            values = dict(zip(ELFAnalysisResult.STAGE_FIELDS[stage], self._save_symbols()))
+        elif stage == "strings":
+            values = {"strings_file": self._save_strings()}
+        elif stage == "ropgadget":
+            values = dict(zip(ELFAnalysisResult.STAGE_FIELDS[stage], self._save_ropgadget()))
+        else:
+            raise ValueError(f"Unknown analysis stage: {stage}")
+
+        self._set_stage(values)
+        if use_cache:
+            self._store_cached_stage(stage)
+
+    def analyze(self, concurrent: bool = True, stages: Iterable[str] = DEFAULT_STAGES) -> ELFAnalysisResult:
+        """
+        요청한 분석 단계를 실행하고 결과를 ELFAnalysisResult 데이터 클래스 형태로 반환합니다.
+        요청하지 않은 단계의 필드는 처음 접근할 때 실행됩니다.
+        concurrent가 True이면 strings 추출과 가젯 탐색 단계를
+        스레드 풀에서 동시에 실행하므로, 전체 소요 시간은 가장 느린 단계에 가까워집니다.
+
+        arguments:
+          concurrent (bool): 각 단계를 동시에 실행할지 여부 (기본값 True)
+          stages (Iterable[str]): 실행할 단계 목록 (STAGES 중에서 선택, 기본값 DEFAULT_STAGES)
+
+        return:
+          ELFAnalysisResult: 파일 정보, checksec 정보 및 분석 메시지를 포함한 분석 결과
+        """
+        stages = set(stages)
+        unknown = stages - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown analysis stage(s): {', '.join(sorted(unknown))}")
+        pending = [stage for stage in STAGES if stage in stages and not self.analysis_result.evaluated(stage)]
+
+        for stage in pending:
+            if stage not in SLOW_STAGES and stage != "decompile":
+                self._run_stage(stage)
+        slow = [stage for stage in pending if stage in SLOW_STAGES]
+        if concurrent and len(slow) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=len(slow)) as executor:
+                list(executor.map(self._run_stage, slow))
+        else:
+            for stage in slow:
+                self._run_stage(stage)
+        if "decompile" in pending:
+            self._run_stage("decompile")
         return self.analysis_result
 
+    def _save_symbols(self) -> Tuple[str, List[ImportedFunction]]:
+        """
+        .dynsym / .symtab / .rel(a).plt / .got 으로 SymbolIndex를 만들어 logs/<파일명>-<해시>/symbols 디렉토리에 저장하고,
+        config.ini 의 elf_analyzer.dangerous_functions 목록 중 import 하는 함수를 찾습니다.
+
+        반환값:
+          Tuple[str, List[ImportedFunction]]: 저장된 색인 파일의 경로, import 하는 위험 함수 목록
+        """
+        output_file = self._artifact_path("symbols")
+        index = SymbolIndex.from_file(self.file_path)
+        index.save(output_file)
+        return output_file, index.find_imports(dangerous_function_names())
+
     def _save_strings(self) -> str:
         """
-        ELF 파일의 strings 결과를 logs/<파일명>/strings 디렉토리에 저장하고,
-        저장된 파일 경로를 반환합니다.
+        내장 StringsExtractor로 ELF 파일의 문자열(ASCII, UTF-16LE)을 추출하여
+        logs/<파일명>-<해시>/strings 디렉토리에 블록 압축 파일(.gz)로 저장하고, 저장된 파일 경로를 반환합니다.
+        각 줄은 오프셋, 가상 주소, 섹션, 인코딩, 문자열을 탭으로 구분하여 기록합니다.
+        (zcat / zgrep 으로 읽거나, BlockGzipReader 로 필요한 줄만 읽을 수 있습니다.)
 
         return:
           str: 저장된 strings 파일의 경로
         """
-        base_name = os.path.splitext(os.path.basename(self.file_path))[0]
-        output_dir = os.path.join("logs", base_name, "strings")
-        os.makedirs(output_dir, exist_ok=True)
-        output_file = os.path.join(output_dir, f"{base_name}.strings")
-        with open(output_file, "w") as f:
-            process = subprocess.Popen(["strings", self.file_path],
-                                       stdout=f,
-                                       stderr=subprocess.PIPE,
-                                       text=True)
-            while process.poll() is None:
-                time.sleep(0.05)
+        output_file = self._artifact_path("strings")
+        with ELFParser(self.file_path) as elf, BlockGzipWriter(output_file) as f:
+            extractor = StringsExtractor(elf, min_length=self.strings_min_length)
+            for extracted in extractor.iter_strings():
+                f.write(format_string(extracted) + "\n")
         return output_file
     
-    def _save_ropgadget(self) -> str:
+    def _save_ropgadget(self) -> Tuple[str, str]:
         """
-        ROPgadget 명령어를 사용하여 ELF 파일의 gadget 정보를 추출하고,
-        logs/<파일명>/ropgadget 디렉토리에 결과를 저장한 후, 저장된 파일 경로를 반환합니다.
+        내장 GadgetFinder로 ELF 파일의 gadget 정보를 추출하고,
+        logs/<파일명>-<해시>/ropgadget 디렉토리에 ROPgadget 과 같은 형식으로 결과를 블록 압축 파일(.gz)로 저장합니다.
+        capstone이 없거나 x86 / x86-64 가 아닌 바이너리는 ROPgadget 명령어를 사용합니다.
+        같은 가젯으로 검색용 GadgetStore를 만들어 logs/<파일명>-<해시>/gadgets 디렉토리에 함께 저장합니다.
 
         반환값:
-          str: 저장된 ROPgadget 결과 파일의 경로
+          Tuple[str, str]: 저장된 ROPgadget 결과 파일의 경로, GadgetStore 파일의 경로
         """
-        base_name = os.path.splitext(os.path.basename(self.file_path))[0]
-        output_dir = os.path.join("logs", base_name, "ropgadget")
-        os.makedirs(output_dir, exist_ok=True)
-        output_file = os.path.join(output_dir, f"{base_name}.ropgadget")
-        with open(output_file, "w") as f:
-            process = subprocess.Popen(
-                ["ROPgadget", "--binary", self.file_path],
-                stdout=f,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            while process.poll() is None:
-                time.sleep(0.05)
-        return output_file
+        output_file = self._artifact_path("ropgadget")
+        store_file = self._artifact_path("gadgets")
+        with ELFParser(self.file_path) as elf:
+            supported = is_gadget_search_supported(elf)
+        if not supported:
+            import subprocess
+            import tempfile
+            # ROPgadget 출력을 임시 파일로 받은 뒤 블록 단위로 압축합니다.
+            with tempfile.TemporaryFile("w+") as raw:
+                run_child(
+                    ["ROPgadget", "--binary", self.file_path],
+                    stdout=raw,
+                    stderr=subprocess.DEVNULL
+                )
+                raw.seek(0)
+                with BlockGzipWriter(output_file) as f:
+                    for line in raw:
+                        f.write(line)
+            GadgetStore.from_text(output_file).save(store_file)
+            return output_file, store_file
+
+        finder = GadgetFinder(self.file_path, jobs=self.gadget_jobs)
+        gadgets = finder.find()
+        with BlockGzipWriter(output_file) as f:
+            f.write("Gadgets information\n" + "=" * 60 + "\n")
+            for gadget in gadgets:
+                f.write(format_gadget(gadget, finder.is_64) + "\n")
+            f.write(f"\nUnique gadgets found: {len(gadgets)}\n")
+        GadgetStore.from_gadgets(gadgets, finder.is_64).save(store_file)
+        return output_file, store_file
 
-    def run_decompile(self) -> None:
+    def run_decompile(self, functions: Optional[List[str]] = None, depth: int = 0) -> str:
         """
         Ghidra의 decompile 명령어를 사용하여 ELF 파일의 디컴파일 정보를 추출하고,
-        logs/<파일명>/decompile 디렉토리에 결과를 저장한 후, 저장된 로그 파일의 경로를 반환합니다.
+        logs/<파일명>-<해시>/decompile 디렉토리에 함수별로 색인된 결과(decompile.c.gz, decompile.index.json)를 저장한 후,
+        색인 파일의 경로를 반환합니다. analysis_result.decompile_file 에도 기록합니다.
+        캐시에 같은 바이너리의 디컴파일 결과가 있으면 Ghidra를 실행하지 않고 복원합니다.
+
+        arguments:
+          functions (Optional[List[str]]): 디컴파일할 함수 이름(또는 0x 주소) 목록 (None이면 전체)
+          depth (int): 지정한 함수로부터 포함할 호출자/피호출자 깊이
     
         반환값:
-          str: 저장된 decompile 결과 로그 파일의 경로
+          str: 저장된 decompile.index.json 의 경로 (DecompileIndex로 읽을 수 있음)
+        """
+        for _ in self._decompile_stage(functions, depth, stream=False):
+            pass
+        return self.analysis_result.decompile_file
+
+    def stream_decompile(self, functions: Optional[List[str]] = None, depth: int = 0) -> Iterator[Dict[str, Any]]:
         """
-        log_path = run_decompile(self.file_path)
-        return log_path
+        run_decompile 과 같지만, Ghidra가 함수 하나를 디컴파일할 때마다 레코드(dict)를 생성합니다.
+        (레코드 형식은 decompile.run.stream_decompile 참고, 캐시에서 복원한 경우에도 같은 형식으로 생성합니다.)
+        끝까지 소비하면 analysis_result.decompile_file 이 기록됩니다.
+        중간에 멈추면 측정값은 기록되고, decompile_file 은 done 레코드까지 받은 경우에만 기록됩니다.
+
+        사용 예제:
+          for record in analyzer.stream_decompile():
+              if record["event"] == "function" and "system(" in record["code"]:
+                  print(record["name"], record["entry"])
+        """
+        return self._decompile_stage(functions, depth, stream=True)
+
+    def _decompile_stage(self, functions: Optional[List[str]], depth: int, stream: bool) -> Iterator[Dict[str, Any]]:
+        # 소비자가 레코드를 처리하는 동안(생성기가 멈춘 동안)은 decompile 단계로 측정하지 않습니다.
+        metrics = StageMetrics(stage="decompile")
+        records = measure_generator(metrics, self._decompile(functions, depth, stream, metrics))
+        index_path = None
+        try:
+            while True:
+                try:
+                    record = next(records)
+                except StopIteration as stop:
+                    index_path = stop.value
+                    break
+                if record.get("event") == "done":
+                    index_path = record["index"]
+                yield record
+        finally:
+            # 중간에 멈춰도 측정값은 남기고, 색인이 완성된 경우(done 레코드 이후)에만 decompile_file 을 기록합니다.
+            records.close()
+            self._record_metrics(metrics)
+            if index_path is not None:
+                self._set_stage({"decompile_file": index_path})
+
+    def _decompile(self, functions: Optional[List[str]], depth: int, stream: bool,
+                   metrics: StageMetrics) -> Iterator[Dict[str, Any]]:
+        # decompile.run 은 Ghidra 실행에만 필요하므로 이 단계가 실행될 때 불러옵니다.
+        from decompile.run import (
+            run_decompile, stream_decompile, default_log_dir, DECOMPILE_INDEX_FILE, DECOMPILE_DATA_FILE,
+        )
+        from .callgraph import CALLGRAPH_FILE
+        stage = "decompile"
+        if functions:
+            # 선택한 함수 목록마다 결과가 다르므로 캐시 단계 이름에 선택 조건을 포함합니다.
+            selection = ",".join(sorted(functions)) + f"@{depth}"
+            stage += "-" + hashlib.sha1(selection.encode()).hexdigest()[:16]
+
+        log_dir = default_log_dir(self.file_path, self._get_content_hash())
+        index_path = os.path.join(log_dir, DECOMPILE_INDEX_FILE)
+        data_path = os.path.join(log_dir, DECOMPILE_DATA_FILE)
+        callgraph_path = os.path.join(log_dir, CALLGRAPH_FILE)
+        # 이전 버전과의 비교를 요청했으면 비교 결과(diff)를 새로 만들어야 하므로 캐시를 복원하지 않습니다.
+        if (self.cache is not None and not self.decompile_previous
+                and self.cache.restore_artifact(self._get_cache_key(), stage + ".c.gz", data_path)
+                and self.cache.restore_artifact(self._get_cache_key(), stage + ".callgraph", callgraph_path)
+                and self.cache.restore_artifact(self._get_cache_key(), stage + ".index", index_path)):
+            metrics.cached = True
+            if stream:
+                yield from DecompileIndex(index_path).records()
+            return index_path
+
+        if stream:
+            yield from stream_decompile([self.file_path], functions, depth, self.decompile_previous)
+        else:
+            index_path = run_decompile(self.file_path, functions, depth, self.decompile_previous)
+        if self.cache is not None:
+            data_path = os.path.join(os.path.dirname(index_path), DECOMPILE_DATA_FILE)
+            callgraph_path = os.path.join(os.path.dirname(index_path), CALLGRAPH_FILE)
+            self.cache.put_artifact(self._get_cache_key(), stage + ".c.gz", data_path)
+            self.cache.put_artifact(self._get_cache_key(), stage + ".callgraph", callgraph_path)
+            self.cache.put_artifact(self._get_cache_key(), stage + ".index", index_path)
+        return index_path
@@ -0,0 +1,218 @@
+# elf_analyzer/batch.py
+import glob
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+from .analyzer import DEFAULT_STAGES, ELFAnalyzer, absolute_artifact_paths
+from .cache import AnalysisCache, file_sha256
+from .elf_parser import is_elf
+from .models import ELFAnalysisResult, StageMetrics
+from .store import ResultStore
+
+# print_batch 가 결과 저장소에 한 트랜잭션으로 저장하는 레코드 수
+STORE_CHUNK = 500
+
+
+@dataclass
+class BatchSummary:
+    """
+    배치 분석의 진행 결과를 요약하는 데이터 클래스입니다.
+
+    속성:
+      total (int): 분석 대상 ELF 파일 수 (중복 제거 후)
+      succeeded (int): 분석에 성공한 파일 수
+      failed (int): 분석에 실패한 파일 수
+      skipped (int): ELF가 아니어서 건너뛴 파일 수
+      duplicates (int): 해시가 같아 건너뛴 파일 수
+      elapsed (float): 전체 소요 시간 (초)
+      errors (List[Tuple[str, str]]): (파일 경로, 오류 메시지) 목록
+      analyzed (List[str]): 분석에 성공한 파일 경로 목록
+      metrics (List[Tuple[str, List[StageMetrics]]]): 분석에 성공한 파일별 (경로, 단계별 측정값) 목록
+    """
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    duplicates: int = 0
+    elapsed: float = 0.0
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+    analyzed: List[str] = field(default_factory=list)
+    metrics: List[Tuple[str, List[StageMetrics]]] = field(default_factory=list)
+
+
+def collect_targets(patterns: List[str], file_list: Optional[str] = None) -> List[str]:
+    """
+    파일 경로, 디렉토리(하위 디렉토리 포함), glob 패턴, 파일 목록에서 분석 대상 파일을 모읍니다.
+
+    arguments:
+      patterns (List[str]): 파일 경로 / 디렉토리 / glob 패턴 목록
+      file_list (Optional[str]): 한 줄에 하나씩 경로가 적힌 파일 ("-"이면 표준 입력)
+
+    return:
+      List[str]: 중복 경로를 제거한 일반 파일 목록 (입력 순서 유지)
+    """
+    candidates = list(patterns)
+    if file_list:
+        handle = sys.stdin if file_list == "-" else open(file_list)
+        with handle:
+            candidates.extend(line.strip() for line in handle if line.strip())
+
+    paths = []
+    for candidate in candidates:
+        if os.path.isdir(candidate):
+            for root, dirs, files in os.walk(candidate):
+                dirs.sort()
+                paths.extend(os.path.join(root, name) for name in sorted(files))
+        elif os.path.exists(candidate):
+            paths.append(candidate)
+        else:
+            paths.extend(sorted(glob.glob(candidate, recursive=True)))
+
+    seen = set()
+    targets = []
+    for path in paths:
+        real_path = os.path.realpath(path)
+        if real_path in seen or not os.path.isfile(real_path):
+            continue
+        seen.add(real_path)
+        targets.append(path)
+    return targets
+
+
+def dedupe_by_hash(paths: List[str]) -> Tuple[List[Tuple[str, Optional[str]]], int]:
+    """
+    내용이 같은 바이너리를 SHA-256으로 제거합니다.
+    크기가 같은 파일이 있을 때만 해시를 계산하므로 대부분의 파일은 읽지 않습니다.
+
+    return:
+      Tuple[List[Tuple[str, Optional[str]]], int]: (경로, SHA-256 또는 None) 목록과 제거된 중복 수
+    """
+    by_size: Dict[int, List[str]] = defaultdict(list)
+    for path in paths:
+        by_size[os.path.getsize(path)].append(path)
+
+    seen = set()
+    result = []
+    duplicates = 0
+    for path in paths:
+        if len(by_size[os.path.getsize(path)]) == 1:
+            result.append((path, None))
+            continue
+        digest = file_sha256(path)
+        if digest in seen:
+            duplicates += 1
+            continue
+        seen.add(digest)
+        result.append((path, digest))
+    return result, duplicates
+
+
+def _analyze_one(path: str, digest: Optional[str], strings_min_length: int,
+                 cache_dir: Optional[str], stages: Tuple[str, ...]) -> Tuple[str, Dict]:
+    """
+    프로세스 풀 워커에서 실행되는 단일 바이너리 분석 함수입니다.
+    중복 제거 단계에서 해시를 계산하지 않은 파일은 워커에서 병렬로 해시를 계산합니다.
+
+    return:
+      Tuple[str, Dict]: (SHA-256, 직렬화된 ELFAnalysisResult)
+    """
+    cache = AnalysisCache(cache_dir) if cache_dir else None
+    # 배치 자체가 프로세스 풀이므로 가젯 탐색은 워커 안에서 순차로 실행합니다.
+    analyzer = ELFAnalyzer(path, strings_min_length=strings_min_length, cache=cache, gadget_jobs=1)
+    result = analyzer.analyze(stages=stages)
+    # 레코드를 다른 디렉토리에서 읽어도(main.py query --load) 산출물을 찾을 수 있도록 절대 경로로 기록합니다.
+    return analyzer.cache_key or digest or file_sha256(path), absolute_artifact_paths(result.to_dict())
+
+
+def run_batch(patterns: List[str], file_list: Optional[str] = None, jobs: Optional[int] = None,
+              strings_min_length: int = 4, cache_dir: Optional[str] = None,
+              summary: Optional[BatchSummary] = None,
+              stages: Tuple[str, ...] = DEFAULT_STAGES) -> Iterator[Dict]:
+    """
+    여러 ELF 파일을 프로세스 풀로 분석하고, 끝나는 순서대로 결과 레코드(dict)를 생성합니다.
+
+    arguments:
+      patterns (List[str]): 파일 경로 / 디렉토리 / glob 패턴 목록
+      file_list (Optional[str]): 경로 목록 파일
+      jobs (Optional[int]): 워커 프로세스 수 (None이면 CPU 수)
+      strings_min_length (int): 추출할 문자열의 최소 길이
+      cache_dir (Optional[str]): 캐시 디렉토리 (None이면 캐시를 사용하지 않음)
+      summary (Optional[BatchSummary]): 진행 결과를 기록할 요약 객체
+      stages (Tuple[str, ...]): 바이너리마다 실행할 분석 단계 (decompile은 제외, --decompile로 따로 실행)
+
+    return:
+      Iterator[Dict]: {"path", "sha256", "status", "result" 또는 "error"} 형식의 레코드
+                      (path 와 result 의 산출물 경로는 절대 경로)
+    """
+    summary = summary if summary is not None else BatchSummary()
+    start = time.perf_counter()
+
+    elf_paths = []
+    for path in collect_targets(patterns, file_list):
+        if is_elf(path):
+            elf_paths.append(path)
+        else:
+            summary.skipped += 1
+    targets, summary.duplicates = dedupe_by_hash(elf_paths)
+    summary.total = len(targets)
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(_analyze_one, path, digest, strings_min_length, cache_dir, stages): (path, digest)
+            for path, digest in targets
+        }
+        for future in as_completed(futures):
+            path, digest = futures[future]
+            record = {"path": os.path.abspath(path), "sha256": digest}
+            try:
+                record["sha256"], record["result"] = future.result()
+                record["status"] = "ok"
+                summary.succeeded += 1
+                summary.analyzed.append(path)
+                summary.metrics.append((path, ELFAnalysisResult.from_dict(record["result"]).metrics))
+            except Exception as e:
+                record["status"] = "error"
+                record["error"] = f"{type(e).__name__}: {e}"
+                summary.failed += 1
+                summary.errors.append((path, record["error"]))
+            summary.elapsed = time.perf_counter() - start
+            yield record
+    summary.elapsed = time.perf_counter() - start
+
+
+def print_batch(patterns: List[str], file_list: Optional[str] = None, jobs: Optional[int] = None,
+                strings_min_length: int = 4, cache_dir: Optional[str] = None,
+                stages: Tuple[str, ...] = DEFAULT_STAGES, store: Optional[ResultStore] = None) -> BatchSummary:
+    """
+    run_batch 결과를 바이너리 하나당 JSON 한 줄로 표준 출력에 쓰고,
+    진행 상황과 최종 요약은 표준 에러에 출력합니다.
+    store 가 주어지면 결과를 STORE_CHUNK 개씩 묶어 한 트랜잭션으로 저장합니다.
+    """
+    summary = BatchSummary()
+    done = 0
+    pending = []
+    for record in run_batch(patterns, file_list, jobs, strings_min_length, cache_dir, summary, stages):
+        done += 1
+        print(json.dumps(record), flush=True)
+        print(f"[{done}/{summary.total}] {record['status']}: {record['path']}", file=sys.stderr)
+        if store is not None:
+            pending.append(record)
+            if len(pending) >= STORE_CHUNK:
+                store.add_many(pending)
+                pending.clear()
+    if store is not None and pending:
+        store.add_many(pending)
+
+    print(f"[*] Batch finished in {summary.elapsed:.2f}s: "
+          f"{summary.succeeded} succeeded, {summary.failed} failed, "
+          f"{summary.skipped} non-ELF skipped, {summary.duplicates} duplicates skipped", file=sys.stderr)
+    for path, error in summary.errors:
+        print(f"[!] {path}: {error}", file=sys.stderr)
+    if not summary.total:
+        print("[!] No ELF files found in the given paths", file=sys.stderr)
+    return summary
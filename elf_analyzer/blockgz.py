@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+# elf_analyzer/blockgz.py
+#
+# 블록 단위로 압축한 gzip 산출물의 writer / reader 입니다.
+# decompile/decompile_script.py (Ghidra Jython 2.7) 에서도 불러오므로
+# 타입 주석, f-string 등 Python 3 전용 문법과 표준 라이브러리 밖의 모듈을 사용하지 않습니다.
+import bisect
+import os
+import struct
+import zlib
+
+# 압축 전 블록 크기 (가능하면 줄 경계에서 자릅니다)
+DEFAULT_BLOCK_SIZE = 64 * 1024
+DEFAULT_LEVEL = 6
+SUFFIX = '.gz'
+
+# 각 블록은 독립된 gzip member 이고, 헤더의 FEXTRA 에 'EP' 서브필드로
+# (member 전체 크기, 압축 전 크기, 블록 안의 줄바꿈 수)를 기록합니다.
+# zcat / zgrep 은 여러 member 를 이어서 읽으므로 일반 gzip 파일처럼 다룰 수 있습니다.
+_SUBFIELD_ID = b'EP'
+_SUBFIELD = struct.Struct('<III')
+_HEADER = struct.Struct('<BBBBIBBH2sH')
+_HEADER_SIZE = _HEADER.size + _SUBFIELD.size
+_TRAILER = struct.Struct('<II')
+_FLAG_EXTRA = 4
+_OS_UNKNOWN = 255
+
+
+class BlockGzipWriter(object):
+    """
+    텍스트 산출물을 압축 전 block_size 바이트 단위의 독립된 gzip member 로 나누어 기록합니다.
+    각 블록은 따로 압축을 풀 수 있으므로, BlockGzipReader 는 필요한 블록만 풀어 원하는 위치로 이동합니다.
+
+    사용 예제:
+      with BlockGzipWriter("logs/chall-1b1e0f834e4c/strings/chall.strings.gz") as f:
+          offset = f.tell()
+          f.write("hello\\n")
+    """
+    def __init__(self, path, block_size=DEFAULT_BLOCK_SIZE, level=DEFAULT_LEVEL):
+        """
+        생성자
+
+        arguments:
+          path (str): 저장할 파일 경로 (기존 파일은 덮어씀)
+          block_size (int): 압축 전 블록 크기 (바이트)
+          level (int): zlib 압축 수준 (1-9)
+        """
+        self.path = path
+        self.block_size = block_size
+        self.level = level
+        self._file = open(path, 'wb')
+        self._buffer = bytearray()
+        self._offset = 0
+        self._blocks = 0
+
+    def tell(self):
+        """
+        지금까지 기록한 압축 전 바이트 수(다음 write 의 압축 전 오프셋)를 반환합니다.
+        """
+        return self._offset
+
+    def write(self, data):
+        """
+        문자열(UTF-8 로 인코딩) 또는 바이트를 기록하고, 압축 전 바이트 길이를 반환합니다.
+        """
+        if not isinstance(data, (bytes, bytearray)):
+            data = data.encode('utf-8')
+        self._buffer += data
+        self._offset += len(data)
+        while len(self._buffer) >= self.block_size:
+            # 레코드(줄)가 블록 경계에 걸치지 않도록 블록 안의 마지막 줄바꿈에서 자릅니다.
+            cut = self._buffer.rfind(b'\n', 0, self.block_size) + 1 or self.block_size
+            self._flush_block(bytes(self._buffer[:cut]))
+            del self._buffer[:cut]
+        return len(data)
+
+    def _flush_block(self, data):
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        body = compressor.compress(data) + compressor.flush()
+        member_size = _HEADER_SIZE + len(body) + _TRAILER.size
+        self._file.write(_HEADER.pack(0x1f, 0x8b, 8, _FLAG_EXTRA, 0, 0, _OS_UNKNOWN,
+                                      4 + _SUBFIELD.size, _SUBFIELD_ID, _SUBFIELD.size))
+        self._file.write(_SUBFIELD.pack(member_size, len(data), data.count(b'\n')))
+        self._file.write(body)
+        self._file.write(_TRAILER.pack(zlib.crc32(data) & 0xffffffff, len(data) & 0xffffffff))
+        self._blocks += 1
+
+    def close(self):
+        if self._file is None:
+            return
+        # 빈 산출물도 올바른 gzip 파일이 되도록 빈 블록 하나는 기록합니다.
+        if self._buffer or not self._blocks:
+            self._flush_block(bytes(self._buffer))
+            del self._buffer[:]
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class BlockGzipReader(object):
+    """
+    BlockGzipWriter 로 기록한 파일을 읽습니다.
+    열 때 각 블록의 헤더만 읽어 (압축 파일 오프셋, 압축 전 오프셋, 앞선 줄 수) 색인을 만들고,
+    read() / line() 은 요청한 범위가 들어 있는 블록만 압축을 풉니다.
+
+    사용 예제:
+      with BlockGzipReader("logs/chall/decompile/decompile.c.gz") as reader:
+          code = reader.read(offset, length).decode("utf-8")
+          print(reader.line(10))
+          for line in reader:
+              ...
+    """
+    def __init__(self, path):
+        """
+        생성자
+
+        arguments:
+          path (str): BlockGzipWriter 로 기록한 파일 경로
+
+        예외:
+          ValueError: 블록 색인이 없는 gzip 파일이거나 손상된 파일인 경우
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        file_size = os.fstat(self._file.fileno()).st_size
+        # 블록별 압축 파일 오프셋 / member 크기 / 압축 전 시작 오프셋 / 앞선 블록들의 줄바꿈 수
+        self._positions = []
+        self._member_sizes = []
+        self._offsets = []
+        self._lines_before = []
+        offset = lines = position = 0
+        while position < file_size:
+            self._file.seek(position)
+            header = self._file.read(_HEADER_SIZE)
+            if len(header) < _HEADER_SIZE:
+                raise ValueError('%s: not a block-compressed artifact or truncated (offset %d)' % (path, position))
+            magic1, magic2, _, flags, _, _, _, _, subfield_id, subfield_size = _HEADER.unpack_from(header, 0)
+            if ((magic1, magic2) != (0x1f, 0x8b) or not flags & _FLAG_EXTRA
+                    or subfield_id != _SUBFIELD_ID or subfield_size != _SUBFIELD.size):
+                raise ValueError('%s: not a block-compressed artifact (offset %d)' % (path, position))
+            member_size, size, newlines = _SUBFIELD.unpack_from(header, _HEADER.size)
+            self._positions.append(position)
+            self._member_sizes.append(member_size)
+            self._offsets.append(offset)
+            self._lines_before.append(lines)
+            position += member_size
+            offset += size
+            lines += newlines
+        self.size = offset
+        self.line_count = lines
+        self._cached_block = None
+        self._cached_data = None
+
+    def __len__(self):
+        return len(self._positions)
+
+    def _block(self, index):
+        """
+        index 번째 블록의 압축을 풀어 반환합니다. (마지막으로 푼 블록 하나는 재사용합니다.)
+        """
+        if self._cached_block != index:
+            self._cached_data = self._inflate(index)
+            self._cached_block = index
+        return self._cached_data
+
+    def _inflate(self, index):
+        self._file.seek(self._positions[index] + _HEADER_SIZE)
+        body = self._file.read(self._member_sizes[index] - _HEADER_SIZE - _TRAILER.size)
+        return zlib.decompress(body, -zlib.MAX_WBITS)
+
+    def read(self, offset, length):
+        """
+        압축 전 오프셋 offset 에서 length 바이트를 읽어 반환합니다.
+        """
+        end = min(offset + length, self.size)
+        chunks = []
+        index = bisect.bisect_right(self._offsets, offset) - 1
+        while offset < end and index < len(self._positions):
+            data = self._block(index)
+            start = offset - self._offsets[index]
+            chunk = data[start:start + end - offset]
+            chunks.append(chunk)
+            offset += len(chunk)
+            index += 1
+        return b''.join(chunks)
+
+    def line(self, number):
+        """
+        number 번째(0부터) 줄을 줄바꿈 없이 문자열로 반환합니다.
+
+        예외:
+          IndexError: 줄 번호가 범위를 벗어난 경우
+        """
+        if number < 0 or number > self.line_count or (number == self.line_count and self._ends_with_newline()):
+            raise IndexError(number)
+        # number 번째 줄은 number 번째 줄바꿈 바로 다음에서 시작합니다.
+        index = max(bisect.bisect_left(self._lines_before, number) - 1, 0)
+        data = self._block(index)
+        skip = number - self._lines_before[index]
+        start = 0
+        for _ in range(skip):
+            start = data.index(b'\n', start) + 1
+        chunks = []
+        while True:
+            end = data.find(b'\n', start)
+            if end >= 0:
+                chunks.append(data[start:end])
+                break
+            chunks.append(data[start:])
+            index += 1
+            if index >= len(self._positions):
+                break
+            data = self._block(index)
+            start = 0
+        return b''.join(chunks).decode('utf-8', 'replace')
+
+    def _ends_with_newline(self):
+        return self.size > 0 and self.read(self.size - 1, 1) == b'\n'
+
+    def __iter__(self):
+        """
+        처음부터 한 줄씩(줄바꿈 포함) 문자열로 생성합니다. 블록 하나씩만 메모리에 올립니다.
+        """
+        pending = b''
+        for index in range(len(self._positions)):
+            lines = (pending + self._inflate(index)).split(b'\n')
+            pending = lines.pop()
+            for line in lines:
+                yield line.decode('utf-8', 'replace') + '\n'
+        if pending:
+            yield pending.decode('utf-8', 'replace')
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_lines(path):
+    """
+    산출물을 한 줄씩 읽는 반복자를 반환합니다.
+    .gz 로 끝나는 블록 압축 산출물과, 압축하지 않은 이전 형식의 산출물을 모두 읽을 수 있습니다.
+    """
+    if path.endswith(SUFFIX):
+        with BlockGzipReader(path) as reader:
+            for line in reader:
+                yield line
+        return
+    with open(path) as f:
+        for line in f:
+            yield line
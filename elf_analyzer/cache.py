@@ -0,0 +1,218 @@
+# elf_analyzer/cache.py
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(".", "cache")
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+RESULT_FILE = "result.json"
+INDEX_FILE = "index.json"
+
+
+def file_sha256(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    파일의 SHA-256 해시를 16진수 문자열로 반환합니다.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    바이너리의 SHA-256을 키로 하는 분석 결과 캐시입니다.
+    각 단계의 산출물(strings, ropgadget, decompile 등)과 직렬화된 ELFAnalysisResult를 저장하며,
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다. (LRU)
+
+    디렉토리 구조:
+      <cache_dir>/index.json
+      <cache_dir>/<sha256>/result.json
+      <cache_dir>/<sha256>/<stage>
+    """
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        생성자
+
+        arguments:
+          cache_dir (str): 캐시를 저장할 디렉토리
+          max_bytes (int): 캐시 전체의 최대 크기 (바이트)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.index_path = os.path.join(self.cache_dir, INDEX_FILE)
+
+    @contextmanager
+    def _locked_index(self) -> Iterator[Dict]:
+        """
+        여러 프로세스가 동시에 캐시를 사용할 수 있도록 파일 잠금을 건 상태로 인덱스를 읽고 씁니다.
+        """
+        with open(self.index_path + ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.index_path) as f:
+                        index = json.load(f)
+                except (FileNotFoundError, ValueError):
+                    index = {"entries": {}, "build_ids": {}}
+                yield index
+                tmp_path = self.index_path + ".tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(index, f)
+                os.replace(tmp_path, self.index_path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def key_for(self, file_path: str, build_id: Optional[str] = None) -> str:
+        """
+        파일의 캐시 키(SHA-256)를 반환합니다.
+        같은 BuildID, 파일 크기, 수정 시각으로 저장된 항목이 있으면 해시 계산을 생략합니다.
+
+        arguments:
+          file_path (str): 대상 파일 경로
+          build_id (Optional[str]): ELFFileInfo.build_id (빠른 사전 확인용)
+
+        return:
+          str: SHA-256 16진수 문자열
+        """
+        stat = os.stat(file_path)
+        if build_id:
+            with self._locked_index() as index:
+                candidate = index["build_ids"].get(build_id)
+                entry = index["entries"].get(candidate) if candidate else None
+                if entry and entry.get("file_size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+                    return candidate
+        return file_sha256(file_path)
+
+    def load_result(self, key: str) -> Optional[Dict]:
+        """
+        캐시된 분석 결과(dict)를 반환합니다. 없으면 None을 반환합니다.
+        """
+        result_path = os.path.join(self._entry_dir(key), RESULT_FILE)
+        try:
+            with open(result_path) as f:
+                result = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        self._touch(key)
+        return result
+
+    def store_result(self, key: str, result: Dict, file_path: Optional[str] = None,
+                     build_id: Optional[str] = None) -> None:
+        """
+        분석 결과(dict)를 캐시에 저장합니다.
+
+        arguments:
+          key (str): 캐시 키 (SHA-256)
+          result (Dict): 직렬화된 ELFAnalysisResult
+          file_path (Optional[str]): 원본 파일 경로 (BuildID 사전 확인 정보 기록용)
+          build_id (Optional[str]): 원본 파일의 BuildID
+        """
+        entry_dir = self._entry_dir(key)
+        os.makedirs(entry_dir, exist_ok=True)
+        tmp_path = os.path.join(entry_dir, RESULT_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp_path, os.path.join(entry_dir, RESULT_FILE))
+        with self._locked_index() as index:
+            entry = index["entries"].setdefault(key, {})
+            if file_path is not None:
+                stat = os.stat(file_path)
+                entry["file_size"] = stat.st_size
+                entry["mtime_ns"] = stat.st_mtime_ns
+            if build_id:
+                entry["build_id"] = build_id
+                index["build_ids"][build_id] = key
+        self._touch(key)
+
+    def artifact_path(self, key: str, stage: str) -> Optional[str]:
+        """
+        캐시에 저장된 단계 산출물의 경로를 반환합니다. 없으면 None을 반환합니다.
+        """
+        path = os.path.join(self._entry_dir(key), stage)
+        return path if os.path.isfile(path) else None
+
+    def put_artifact(self, key: str, stage: str, src_path: str) -> None:
+        """
+        단계 산출물 파일을 캐시에 복사합니다.
+        (원본 로그가 나중에 덮어써져도 캐시가 손상되지 않도록 하드 링크 대신 복사합니다.)
+        """
+        if not src_path or not os.path.isfile(src_path):
+            return
+        entry_dir = self._entry_dir(key)
+        os.makedirs(entry_dir, exist_ok=True)
+        tmp_path = os.path.join(entry_dir, stage + ".tmp")
+        shutil.copyfile(src_path, tmp_path)
+        os.replace(tmp_path, os.path.join(entry_dir, stage))
+        self._touch(key)
+
+    def restore_artifact(self, key: str, stage: str, dest_path: str) -> bool:
+        """
+        캐시된 단계 산출물을 dest_path로 복원합니다.
+        dest_path에 같은 크기의 파일이 이미 있으면 복사를 생략합니다.
+
+        return:
+          bool: 복원 성공 여부 (캐시에 산출물이 없으면 False)
+        """
+        cached = self.artifact_path(key, stage)
+        if cached is None:
+            return False
+        if not (os.path.isfile(dest_path) and os.path.getsize(dest_path) == os.path.getsize(cached)):
+            os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+            shutil.copyfile(cached, dest_path)
+        return True
+
+    def _touch(self, key: str) -> None:
+        """
+        항목의 마지막 사용 시각과 크기를 갱신하고, 필요하면 LRU 제거를 수행합니다.
+        """
+        entry_dir = self._entry_dir(key)
+        size = 0
+        if os.path.isdir(entry_dir):
+            for name in os.listdir(entry_dir):
+                path = os.path.join(entry_dir, name)
+                if os.path.isfile(path):
+                    size += os.path.getsize(path)
+        with self._locked_index() as index:
+            entry = index["entries"].setdefault(key, {})
+            entry["last_used"] = time.time()
+            entry["size"] = size
+            self._evict(index, keep=key)
+
+    def _evict(self, index: Dict, keep: Optional[str] = None) -> None:
+        """
+        전체 크기가 max_bytes 이하가 될 때까지 가장 오래 사용되지 않은 항목을 제거합니다.
+        """
+        entries = index["entries"]
+        total = sum(entry.get("size", 0) for entry in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= entries[key].get("size", 0)
+            build_id = entries[key].get("build_id")
+            if build_id and index["build_ids"].get(build_id) == key:
+                del index["build_ids"][build_id]
+            del entries[key]
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+
+    def clear(self) -> None:
+        """
+        캐시 전체를 비웁니다.
+        """
+        with self._locked_index() as index:
+            for key in list(index["entries"]):
+                shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            index["entries"] = {}
+            index["build_ids"] = {}
@@ -0,0 +1,213 @@
+# elf_analyzer/callgraph.py
+import struct
+import sys
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .symbols import DEFAULT_DANGEROUS_FUNCTIONS
+
+# decompile_script.py 의 Ghidra.exportCallGraph 가 쓰는 형식과 동일해야 합니다.
+CALLGRAPH_MAGIC = b"EPCG"
+CALLGRAPH_VERSION = 1
+CALLGRAPH_FILE = "callgraph.bin"
+_HEADER = struct.Struct("<4sIII")
+# 노드 플래그
+FLAG_EXTERNAL = 1
+FLAG_THUNK = 2
+
+
+def _load_array(typecode: str, data: bytes, offset: int, count: int) -> array:
+    values = array(typecode)
+    values.frombytes(data[offset:offset + values.itemsize * count])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class CallGraph:
+    """
+    decompile_script.py 가 디컴파일과 함께 저장한 호출 그래프(callgraph.bin)를 Ghidra 없이 읽어
+    도달 경로와 호출자를 조회합니다. 간선은 CSR 형식(offsets / targets 정수 배열)으로 보관하며,
+    모든 조회는 노드 수 + 간선 수에 비례하는 시간에 끝납니다.
+
+    파일 형식 (리틀 엔디언):
+      "EPCG", 버전(u32), 노드 수 N(u32), 간선 수 E(u32)
+      offsets u32[N+1], targets u32[E], entries u64[N], flags u8[N]
+      이름 테이블 길이(u32), UTF-8 이름을 줄바꿈으로 이은 문자열
+      (노드 i 가 호출하는 함수는 targets[offsets[i]:offsets[i+1]])
+
+    사용 예제:
+      graph = CallGraph.load("logs/chall/decompile/callgraph.bin")
+      print(graph.callers("gets"))
+      for sink, path in graph.sink_paths(root="main").items():
+          print(" -> ".join(path))
+    """
+    def __init__(self, names: Sequence[str], entries: Sequence[int], flags: Sequence[int],
+                 offsets: Sequence[int], targets: Sequence[int]):
+        """
+        생성자
+
+        arguments:
+          names (Sequence[str]): 노드(함수) 이름
+          entries (Sequence[int]): 노드의 시작 주소
+          flags (Sequence[int]): 노드 플래그 (FLAG_EXTERNAL, FLAG_THUNK)
+          offsets (Sequence[int]): CSR 행 시작 위치 (길이 N+1)
+          targets (Sequence[int]): 호출 대상 노드 번호 (길이 E)
+        """
+        self.names = list(names)
+        self.entries = entries
+        self.flags = flags
+        self.offsets = offsets
+        self.targets = targets
+        self._by_name: Dict[str, List[int]] = {}
+        for node, name in enumerate(self.names):
+            self._by_name.setdefault(name, []).append(node)
+        self._reverse = None
+
+    @classmethod
+    def load(cls, path: str) -> "CallGraph":
+        """
+        callgraph.bin 파일을 읽습니다.
+
+        예외:
+          ValueError: 호출 그래프 파일이 아니거나 지원하지 않는 버전인 경우
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{path}: not a call graph file")
+        magic, version, nodes, edges = _HEADER.unpack_from(data, 0)
+        if magic != CALLGRAPH_MAGIC or version != CALLGRAPH_VERSION:
+            raise ValueError(f"{path}: not a call graph file (or unsupported version {version})")
+        position = _HEADER.size
+        offsets = _load_array("I", data, position, nodes + 1)
+        position += 4 * (nodes + 1)
+        targets = _load_array("I", data, position, edges)
+        position += 4 * edges
+        entries = _load_array("Q", data, position, nodes)
+        position += 8 * nodes
+        flags = data[position:position + nodes]
+        position += nodes
+        (names_size,) = struct.unpack_from("<I", data, position)
+        names_blob = data[position + 4:position + 4 + names_size].decode("utf-8")
+        names = names_blob.split("\n") if nodes else []
+        return cls(names, entries, flags, offsets, targets)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def nodes(self, name: str) -> List[int]:
+        """
+        이름이 같은 모든 노드 번호를 반환합니다. (PLT thunk 와 외부 함수는 이름이 같은 별도 노드입니다.)
+        """
+        return self._by_name.get(name, [])
+
+    def is_external(self, node: int) -> bool:
+        return bool(self.flags[node] & FLAG_EXTERNAL)
+
+    def _successors(self, node: int) -> Sequence[int]:
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def _predecessors(self, node: int) -> Sequence[int]:
+        offsets, sources = self._reverse_csr()
+        return sources[offsets[node]:offsets[node + 1]]
+
+    def _reverse_csr(self):
+        """
+        호출자 조회용 역방향 CSR 을 계수 정렬로 한 번 만들어 둡니다. (O(N + E))
+        """
+        if self._reverse is None:
+            counts = array("I", bytes(4 * (len(self.names) + 1)))
+            for target in self.targets:
+                counts[target + 1] += 1
+            for node in range(len(self.names)):
+                counts[node + 1] += counts[node]
+            fill = array("I", counts)
+            sources = array("I", bytes(4 * len(self.targets)))
+            for node in range(len(self.names)):
+                for target in self._successors(node):
+                    sources[fill[target]] = node
+                    fill[target] += 1
+            self._reverse = (counts, sources)
+        return self._reverse
+
+    def callees(self, name: str) -> List[str]:
+        """
+        name 이 직접 호출하는 함수 이름 목록을 반환합니다.
+        """
+        return sorted({self.names[target] for node in self.nodes(name) for target in self._successors(node)})
+
+    def callers(self, name: str) -> List[str]:
+        """
+        name 을 직접 호출하는 함수 이름 목록을 반환합니다.
+        """
+        return sorted({self.names[source] for node in self.nodes(name) for source in self._predecessors(node)})
+
+    def _search(self, starts: Iterable[int], reverse: bool = False) -> Dict[int, Optional[int]]:
+        """
+        starts 에서 너비 우선 탐색하여 {도달한 노드: 직전 노드} 를 반환합니다.
+        """
+        parents: Dict[int, Optional[int]] = {}
+        queue = deque()
+        for node in starts:
+            if node not in parents:
+                parents[node] = None
+                queue.append(node)
+        neighbors = self._predecessors if reverse else self._successors
+        while queue:
+            node = queue.popleft()
+            for neighbor in neighbors(node):
+                if neighbor not in parents:
+                    parents[neighbor] = node
+                    queue.append(neighbor)
+        return parents
+
+    def reachable(self, name: str) -> List[str]:
+        """
+        name 에서 호출 관계를 따라 도달할 수 있는 모든 함수 이름을 반환합니다. (name 자신 제외)
+        """
+        starts = self.nodes(name)
+        return sorted({self.names[node] for node in self._search(starts) if node not in starts})
+
+    def transitive_callers(self, name: str) -> List[str]:
+        """
+        호출 관계를 거슬러 올라가 name 에 도달하는 모든 함수 이름을 반환합니다. (name 자신 제외)
+        """
+        starts = self.nodes(name)
+        return sorted({self.names[node] for node in self._search(starts, reverse=True) if node not in starts})
+
+    def sink_paths(self, sinks: Iterable[str] = DEFAULT_DANGEROUS_FUNCTIONS,
+                   root: str = "main") -> Dict[str, List[str]]:
+        """
+        root 에서 각 sink 까지의 가장 짧은 호출 경로를 한 번의 탐색으로 구합니다.
+        도달할 수 없는 sink 는 결과에 포함하지 않으며, 결과는 경로가 짧은 순서입니다.
+
+        arguments:
+          sinks (Iterable[str]): 찾을 함수 이름 목록 (기본값: 내장 위험 함수 목록, config.ini 의 목록은 analyzer.dangerous_function_names())
+          root (str): 시작 함수 이름
+
+        return:
+          Dict[str, List[str]]: {sink 이름: [root, ..., sink] 함수 이름 경로}
+        """
+        parents = self._search(self.nodes(root))
+        paths = {}
+        for sink in sinks:
+            reached = [node for node in self.nodes(sink) if node in parents]
+            if not reached:
+                continue
+            best = None
+            for node in reached:
+                path = []
+                while node is not None:
+                    path.append(self.names[node])
+                    node = parents[node]
+                path.reverse()
+                if best is None or len(path) < len(best):
+                    best = path
+            paths[sink] = best
+        return dict(sorted(paths.items(), key=lambda item: len(item[1])))
@@ -0,0 +1,73 @@
+# elf_analyzer/checksec.py
+from typing import Set
+from .elf_parser import (
+    ELFParser, ET_DYN, ET_REL, PT_GNU_RELRO, PT_GNU_STACK, PT_INTERP, PF_X,
+    SHT_DYNSYM, SHT_SYMTAB, DT_BIND_NOW, DT_DEBUG, DT_FLAGS, DT_FLAGS_1, DT_RPATH, DT_RUNPATH,
+    DF_BIND_NOW, DF_1_NOW,
+)
+from .models import ChecksecInfo
+
+# checksec.sh 와 동일하게 아래 심볼 중 하나가 있으면 Stack Canary가 적용된 것으로 봅니다.
+CANARY_SYMBOLS = {"__stack_chk_fail", "__stack_chk_guard", "__intel_security_cookie"}
+
+
+def _symbol_names(elf: ELFParser) -> Set[str]:
+    """
+    .dynsym(정적 바이너리는 .symtab) 심볼 이름 집합을 반환합니다.
+    섹션 헤더가 제거된 경우 동적 문자열 테이블을 대신 사용합니다.
+    """
+    names = {symbol.name for symbol in elf.symbols(SHT_DYNSYM) if symbol.name}
+    if not names:
+        names = {symbol.name for symbol in elf.symbols(SHT_SYMTAB) if symbol.name}
+    if not names:
+        names = set(elf.dynamic_string_names())
+    return names
+
+
+def _relro_status(elf: ELFParser) -> str:
+    if not elf.get_segments(PT_GNU_RELRO):
+        return "None"
+    bind_now = (
+        elf.dynamic_value(DT_BIND_NOW) is not None
+        or (elf.dynamic_value(DT_FLAGS) or 0) & DF_BIND_NOW
+        or (elf.dynamic_value(DT_FLAGS_1) or 0) & DF_1_NOW
+    )
+    return "Full" if bind_now else "Partial"
+
+
+def compute_checksec(elf: ELFParser) -> ChecksecInfo:
+    """
+    외부 checksec 명령어 없이 프로그램 헤더와 dynamic 섹션으로부터 보호 기법을 계산합니다.
+
+    arguments:
+      elf (ELFParser): 이미 열려 있는 ELFParser 인스턴스 (파일 정보 파싱과 mmap을 공유)
+
+    return:
+      ChecksecInfo: RELRO, Stack Canary, NX, PIE(공유 라이브러리는 DSO), FORTIFY, RPATH/RUNPATH 상태
+    """
+    names = _symbol_names(elf)
+
+    # PT_GNU_STACK이 없으면 대부분의 아키텍처에서 스택이 실행 가능합니다.
+    stack_segments = elf.get_segments(PT_GNU_STACK)
+    nx_status = bool(stack_segments) and not stack_segments[0].p_flags & PF_X
+
+    if elf.e_type == ET_REL:
+        pie_status = None
+    else:
+        # file 명령어와 같이 DF_1_PIE 가 있는 ET_DYN 을 PIE 로 보고, DF_1_PIE 를 기록하지 않던 예전 툴체인의
+        # PIE 실행 파일도 checksec.sh 처럼 인터프리터(PT_INTERP)나 DT_DEBUG 가 있으면 PIE 로 봅니다.
+        # 나머지 ET_DYN 은 공유 라이브러리(DSO)로 구분합니다.
+        pie_status = elf.is_pie() or (elf.e_type == ET_DYN and (
+            bool(elf.get_segments(PT_INTERP)) or elf.dynamic_value(DT_DEBUG) is not None))
+    shared_object = elf.e_type == ET_DYN and not pie_status
+
+    return ChecksecInfo(
+        relro=_relro_status(elf),
+        stack_canary=bool(names & CANARY_SYMBOLS),
+        nx=nx_status,
+        pie=pie_status,
+        fortify=any(name.endswith("_chk") and name not in CANARY_SYMBOLS for name in names),
+        rpath=elf.dynamic_string(DT_RPATH),
+        runpath=elf.dynamic_string(DT_RUNPATH),
+        shared_object=shared_object
+    )
@@ -0,0 +1,158 @@
+# elf_analyzer/decompile_index.py
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from .blockgz import BlockGzipReader, SUFFIX as COMPRESSED_SUFFIX
+from .callgraph import CallGraph
+
+
+@dataclass
+class DecompiledFunction:
+    """
+    decompile.index.json 에 기록된 함수 하나의 색인 정보입니다.
+
+    속성:
+      name (str): 함수 이름
+      entry (int): 함수 시작 주소
+      size (int): 함수 본문 크기 (바이트)
+      offset (int): decompile.c 내 C 코드의 바이트 오프셋 (압축 전 기준)
+      length (int): C 코드의 바이트 길이
+      hash (Optional[str]): 이전 버전과 비교하는 데 쓰는 함수의 정규화 해시 (이전 형식의 색인이면 None)
+      reused (bool): 이전 버전의 C 코드를 재사용했는지 여부
+    """
+    name: str
+    entry: int
+    size: int
+    offset: int
+    length: int
+    hash: Optional[str] = None
+    reused: bool = False
+
+
+class DecompileIndex:
+    """
+    decompile_script.py 가 만든 decompile.index.json 을 읽어
+    전체 파일을 읽지 않고 함수 하나의 C 코드로 바로 이동(seek)하는 리더입니다.
+    블록 압축된 decompile.c.gz 는 해당 함수가 들어 있는 블록만 압축을 풉니다.
+    (압축하지 않던 이전 형식의 decompile.c 도 읽을 수 있습니다.)
+
+    사용 예제:
+      index = DecompileIndex("logs/chall/decompile/decompile.index.json")
+      print(index.get("main"))
+      for function, code in index:
+          ...
+    """
+    def __init__(self, index_path: str):
+        """
+        생성자
+
+        arguments:
+          index_path (str): decompile.index.json 경로
+        """
+        self.index_path = index_path
+        with open(index_path) as f:
+            index = json.load(f)
+        self.binary = index.get("binary")
+        self.data_path = os.path.join(os.path.dirname(index_path), index.get("data_file", "decompile.c"))
+        self.functions = [
+            DecompiledFunction(entry["name"], int(entry["entry"], 16), entry["size"], entry["offset"], entry["length"],
+                               entry.get("hash"), entry.get("reused", False))
+            for entry in index.get("functions", [])
+        ]
+        self.failed: List[Dict] = index.get("failed", [])
+        self.notes: List[str] = index.get("notes", [])
+        # 이전 버전과 비교했으면 {"previous", "changed", "added", "removed", "reused"} (아니면 None)
+        self.diff: Optional[Dict] = index.get("diff")
+        # 호출 그래프를 저장하지 않던 이전 형식의 색인이면 None
+        callgraph_file = index.get("callgraph_file")
+        self.callgraph_path = os.path.join(os.path.dirname(index_path), callgraph_file) if callgraph_file else None
+        self._by_name: Dict[str, List[DecompiledFunction]] = {}
+        self._by_entry: Dict[int, DecompiledFunction] = {}
+        for function in self.functions:
+            self._by_name.setdefault(function.name, []).append(function)
+            self._by_entry[function.entry] = function
+
+    def __len__(self) -> int:
+        return len(self.functions)
+
+    def __contains__(self, key) -> bool:
+        return self.lookup(key) is not None
+
+    def names(self) -> List[str]:
+        """
+        색인된 함수 이름 목록을 반환합니다.
+        """
+        return [function.name for function in self.functions]
+
+    def lookup(self, key) -> Optional[DecompiledFunction]:
+        """
+        함수 이름, 시작 주소(int), 또는 "0x..." 문자열로 색인 정보를 찾습니다. (없으면 None)
+        """
+        if isinstance(key, int):
+            return self._by_entry.get(key)
+        if key.lower().startswith("0x"):
+            return self._by_entry.get(int(key, 16))
+        functions = self._by_name.get(key)
+        return functions[0] if functions else None
+
+    def callgraph(self) -> Optional[CallGraph]:
+        """
+        디컴파일과 함께 저장된 호출 그래프를 읽어 반환합니다. (없으면 None)
+        """
+        if self.callgraph_path is None or not os.path.isfile(self.callgraph_path):
+            return None
+        return CallGraph.load(self.callgraph_path)
+
+    @contextmanager
+    def _open_data(self) -> Iterator[Callable[[int, int], bytes]]:
+        """
+        C 코드 파일을 열고 (오프셋, 길이)로 읽는 함수를 넘깁니다.
+        """
+        if self.data_path.endswith(COMPRESSED_SUFFIX):
+            with BlockGzipReader(self.data_path) as reader:
+                yield reader.read
+            return
+        with open(self.data_path, "rb") as f:
+            def read(offset: int, length: int) -> bytes:
+                f.seek(offset)
+                return f.read(length)
+            yield read
+
+    def read(self, function: DecompiledFunction) -> str:
+        """
+        색인 정보가 가리키는 C 코드만 읽어 반환합니다.
+        """
+        with self._open_data() as read:
+            return read(function.offset, function.length).decode("utf-8")
+
+    def get(self, key) -> Optional[str]:
+        """
+        함수 이름 또는 주소로 C 코드를 반환합니다. (없으면 None)
+        """
+        function = self.lookup(key)
+        return self.read(function) if function else None
+
+    def __iter__(self) -> Iterator[Tuple[DecompiledFunction, str]]:
+        """
+        (색인 정보, C 코드)를 기록된 순서대로 하나씩 읽어 생성합니다.
+        """
+        with self._open_data() as read:
+            for function in self.functions:
+                yield function, read(function.offset, function.length).decode("utf-8")
+
+    def records(self) -> Iterator[Dict]:
+        """
+        decompile.run.stream_decompile 과 같은 형식, 같은 키의 레코드(function / failed / done)를 생성합니다.
+        (캐시에서 복원한 결과도 스트리밍 결과와 같은 방식으로 처리할 수 있습니다.)
+        """
+        for function, code in self:
+            yield {"event": "function", "binary": self.binary, "name": function.name,
+                   "entry": hex(function.entry), "size": function.size, "code": code, "reused": function.reused}
+        for failed in self.failed:
+            yield dict(failed, event="failed", binary=self.binary, entry=hex(int(failed["entry"], 16)))
+        done = {"event": "done", "binary": self.binary, "index": self.index_path}
+        if self.diff is not None:
+            done["diff"] = self.diff
+        yield done
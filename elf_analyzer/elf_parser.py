@@ -0,0 +1,591 @@
+# elf_analyzer/elf_parser.py
+import mmap
+import struct
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+from .models import ELFFileInfo
+
+ELF_MAGIC = b"\x7fELF"
+
+# e_ident
+EI_CLASS = 4
+EI_DATA = 5
+EI_VERSION = 6
+EI_OSABI = 7
+ELFCLASS32 = 1
+ELFCLASS64 = 2
+ELFDATA2LSB = 1
+ELFDATA2MSB = 2
+
+# e_type
+ET_REL = 1
+ET_EXEC = 2
+ET_DYN = 3
+ET_CORE = 4
+
+# p_type
+PT_LOAD = 1
+PT_DYNAMIC = 2
+PT_INTERP = 3
+PT_NOTE = 4
+PT_GNU_STACK = 0x6474E551
+PT_GNU_RELRO = 0x6474E552
+
+# sh_type
+SHT_SYMTAB = 2
+SHT_STRTAB = 3
+SHT_RELA = 4
+SHT_NOTE = 7
+SHT_NOBITS = 8
+SHT_REL = 9
+SHT_DYNSYM = 11
+
+# st_shndx
+SHN_UNDEF = 0
+
+# e_machine
+EM_386 = 3
+EM_ARM = 40
+EM_X86_64 = 62
+EM_AARCH64 = 183
+
+# d_tag
+DT_NULL = 0
+DT_PLTGOT = 3
+DT_STRTAB = 5
+DT_STRSZ = 10
+DT_RPATH = 15
+DT_DEBUG = 21
+DT_BIND_NOW = 24
+DT_RUNPATH = 29
+DT_FLAGS = 30
+DT_FLAGS_1 = 0x6FFFFFFB
+DF_BIND_NOW = 0x8
+DF_1_NOW = 0x1
+DF_1_PIE = 0x08000000
+
+# p_flags
+PF_X = 0x1
+PF_W = 0x2
+PF_R = 0x4
+
+# note 타입 (GNU)
+NT_GNU_ABI_TAG = 1
+NT_GNU_BUILD_ID = 3
+
+# file 명령어와 동일한 표기를 사용합니다.
+MACHINE_NAMES = {
+    2: "SPARC",
+    3: "Intel 80386",
+    8: "MIPS",
+    20: "PowerPC or cisco 4500",
+    21: "64-bit PowerPC or cisco 7500",
+    22: "IBM S/390",
+    40: "ARM",
+    43: "SPARC V9",
+    62: "x86-64",
+    183: "ARM aarch64",
+    243: "UCB RISC-V",
+}
+
+OSABI_NAMES = {
+    0: "SYSV",
+    1: "HP-UX",
+    2: "NetBSD",
+    3: "GNU/Linux",
+    6: "Solaris",
+    9: "FreeBSD",
+    12: "OpenBSD",
+    97: "ARM",
+    255: "embedded",
+}
+
+ABI_TAG_OS_NAMES = {
+    0: "GNU/Linux",
+    1: "GNU/Hurd",
+    2: "Solaris",
+    3: "FreeBSD",
+}
+
+
+def is_elf(file_path: str) -> bool:
+    """
+    파일 앞 4바이트의 매직 넘버로 ELF 파일 여부를 확인합니다.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            return f.read(4) == ELF_MAGIC
+    except OSError:
+        return False
+
+
+class ELFParseError(ValueError):
+    """
+    ELF 형식이 아니거나 헤더가 손상된 파일을 파싱할 때 발생하는 예외입니다.
+    """
+
+
+@dataclass
+class ProgramHeader:
+    """
+    ELF 프로그램 헤더(세그먼트) 하나를 나타내는 데이터 클래스입니다.
+    """
+    p_type: int
+    p_flags: int
+    p_offset: int
+    p_vaddr: int
+    p_filesz: int
+    p_memsz: int
+    p_align: int
+
+
+@dataclass
+class SectionHeader:
+    """
+    ELF 섹션 헤더 하나를 나타내는 데이터 클래스입니다.
+    """
+    name: str
+    sh_type: int
+    sh_flags: int
+    sh_addr: int
+    sh_offset: int
+    sh_size: int
+    sh_link: int
+    sh_info: int
+    sh_entsize: int
+
+
+@dataclass
+class Symbol:
+    """
+    .symtab / .dynsym 의 심볼 하나를 나타내는 데이터 클래스입니다.
+    """
+    name: str
+    value: int
+    size: int
+    info: int
+    shndx: int
+
+    @property
+    def bind(self) -> int:
+        return self.info >> 4
+
+    @property
+    def type(self) -> int:
+        return self.info & 0xF
+
+
+@dataclass
+class Relocation:
+    """
+    .rel.* / .rela.* 섹션의 재배치 항목 하나를 나타내는 데이터 클래스입니다.
+    """
+    offset: int
+    type: int
+    symbol_index: int
+    addend: int
+
+
+class ELFParser:
+    """
+    mmap 기반의 순수 파이썬 ELF 리더입니다.
+    필요한 헤더만 읽으므로 파일 전체를 메모리에 적재하지 않습니다.
+
+    사용 예제:
+      with ELFParser("./chall") as elf:
+          info = elf.file_info()
+    """
+    def __init__(self, file_path: str):
+        """
+        생성자
+
+        arguments:
+          file_path (str): 파싱할 ELF 파일의 경로
+        """
+        self.file_path = file_path
+        self._file = open(file_path, "rb")
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 빈 파일은 mmap 할 수 없습니다.
+            self._file.close()
+            raise ELFParseError(f"{file_path}: empty file")
+        try:
+            self._parse_header()
+        except Exception:
+            self.close()
+            raise
+        self._program_headers: Optional[List[ProgramHeader]] = None
+        self._section_headers: Optional[List[SectionHeader]] = None
+        self._dynamic: Optional[List[Tuple[int, int]]] = None
+
+    def close(self) -> None:
+        """
+        mmap과 파일 핸들을 닫습니다.
+        """
+        self.data.close()
+        self._file.close()
+
+    def __enter__(self) -> "ELFParser":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _parse_header(self) -> None:
+        """
+        e_ident 와 ELF 헤더를 파싱합니다.
+        """
+        if len(self.data) < 16 or self.data[:4] != ELF_MAGIC:
+            raise ELFParseError(f"{self.file_path}: not an ELF file")
+        self.ei_class = self.data[EI_CLASS]
+        self.ei_data = self.data[EI_DATA]
+        self.ei_version = self.data[EI_VERSION]
+        self.ei_osabi = self.data[EI_OSABI]
+        if self.ei_class not in (ELFCLASS32, ELFCLASS64):
+            raise ELFParseError(f"{self.file_path}: invalid ELF class {self.ei_class}")
+        if self.ei_data not in (ELFDATA2LSB, ELFDATA2MSB):
+            raise ELFParseError(f"{self.file_path}: invalid ELF data encoding {self.ei_data}")
+
+        self.is_64 = self.ei_class == ELFCLASS64
+        self.endian = "<" if self.ei_data == ELFDATA2LSB else ">"
+        header_format = "HHIQQQIHHHHHH" if self.is_64 else "HHIIIIIHHHHHH"
+        try:
+            (self.e_type, self.e_machine, self.e_version, self.e_entry,
+             self.e_phoff, self.e_shoff, self.e_flags, self.e_ehsize,
+             self.e_phentsize, self.e_phnum, self.e_shentsize, self.e_shnum,
+             self.e_shstrndx) = struct.unpack_from(self.endian + header_format, self.data, 16)
+        except struct.error:
+            raise ELFParseError(f"{self.file_path}: truncated ELF header")
+
+    def read(self, offset: int, size: int) -> bytes:
+        """
+        파일의 offset 위치에서 size 바이트를 읽어 반환합니다.
+        """
+        return self.data[offset:offset + size]
+
+    def read_cstring(self, offset: int) -> str:
+        """
+        offset 위치에서 NULL로 끝나는 문자열을 읽어 반환합니다.
+        """
+        end = self.data.find(b"\0", offset)
+        if end == -1:
+            end = len(self.data)
+        return self.data[offset:end].decode("latin-1")
+
+    @property
+    def program_headers(self) -> List[ProgramHeader]:
+        """
+        프로그램 헤더 목록 (처음 접근 시 파싱 후 캐시)
+        """
+        if self._program_headers is None:
+            if self.is_64:
+                fmt, order = self.endian + "IIQQQQQQ", (0, 1, 2, 3, 5, 6, 7)
+            else:
+                fmt, order = self.endian + "IIIIIIII", (0, 6, 1, 2, 4, 5, 7)
+            size = struct.calcsize(fmt)
+            headers = []
+            for i in range(self.e_phnum):
+                offset = self.e_phoff + i * self.e_phentsize
+                if offset + size > len(self.data):
+                    break
+                raw = struct.unpack_from(fmt, self.data, offset)
+                headers.append(ProgramHeader(*(raw[j] for j in order)))
+            self._program_headers = headers
+        return self._program_headers
+
+    @property
+    def section_headers(self) -> List[SectionHeader]:
+        """
+        섹션 헤더 목록 (처음 접근 시 파싱 후 캐시, 섹션 헤더가 없으면 빈 리스트)
+        """
+        if self._section_headers is None:
+            fmt = self.endian + ("IIQQQQIIQQ" if self.is_64 else "IIIIIIIIII")
+            size = struct.calcsize(fmt)
+            raw_headers = []
+            if self.e_shoff:
+                for i in range(self.e_shnum):
+                    offset = self.e_shoff + i * self.e_shentsize
+                    if offset + size > len(self.data):
+                        break
+                    raw_headers.append(struct.unpack_from(fmt, self.data, offset))
+
+            strtab_offset = None
+            if 0 <= self.e_shstrndx < len(raw_headers):
+                strtab_offset = raw_headers[self.e_shstrndx][4]
+
+            headers = []
+            for (sh_name, sh_type, sh_flags, sh_addr, sh_offset, sh_size,
+                 sh_link, sh_info, _sh_addralign, sh_entsize) in raw_headers:
+                name = self.read_cstring(strtab_offset + sh_name) if strtab_offset is not None else ""
+                headers.append(SectionHeader(name, sh_type, sh_flags, sh_addr, sh_offset,
+                                             sh_size, sh_link, sh_info, sh_entsize))
+            self._section_headers = headers
+        return self._section_headers
+
+    def get_section(self, name: str) -> Optional[SectionHeader]:
+        """
+        이름으로 섹션 헤더를 찾아 반환합니다. (없으면 None)
+        """
+        for section in self.section_headers:
+            if section.name == name:
+                return section
+        return None
+
+    def get_segments(self, p_type: int) -> List[ProgramHeader]:
+        """
+        주어진 p_type의 프로그램 헤더 목록을 반환합니다.
+        """
+        return [ph for ph in self.program_headers if ph.p_type == p_type]
+
+    def interpreter(self) -> Optional[str]:
+        """
+        PT_INTERP 세그먼트에 기록된 인터프리터 경로를 반환합니다. (없으면 None)
+        """
+        for ph in self.get_segments(PT_INTERP):
+            return self.read_cstring(ph.p_offset)
+        return None
+
+    def dynamic_entries(self) -> List[Tuple[int, int]]:
+        """
+        PT_DYNAMIC 세그먼트의 (d_tag, d_val) 목록을 반환합니다. (DT_NULL 이전까지)
+        """
+        if self._dynamic is None:
+            entries = []
+            fmt = self.endian + ("qQ" if self.is_64 else "iI")
+            size = struct.calcsize(fmt)
+            for ph in self.get_segments(PT_DYNAMIC):
+                end = min(ph.p_offset + ph.p_filesz, len(self.data))
+                for offset in range(ph.p_offset, end - size + 1, size):
+                    tag, value = struct.unpack_from(fmt, self.data, offset)
+                    if tag == DT_NULL:
+                        break
+                    entries.append((tag, value))
+                break
+            self._dynamic = entries
+        return self._dynamic
+
+    def dynamic_value(self, tag: int) -> Optional[int]:
+        """
+        주어진 d_tag의 첫 번째 값을 반환합니다. (없으면 None)
+        """
+        for d_tag, value in self.dynamic_entries():
+            if d_tag == tag:
+                return value
+        return None
+
+    def vaddr_to_offset(self, vaddr: int) -> Optional[int]:
+        """
+        가상 주소를 PT_LOAD 세그먼트 기준의 파일 오프셋으로 변환합니다. (매핑되지 않으면 None)
+        """
+        for ph in self.get_segments(PT_LOAD):
+            if ph.p_vaddr <= vaddr < ph.p_vaddr + ph.p_filesz:
+                return ph.p_offset + (vaddr - ph.p_vaddr)
+        return None
+
+    def offset_to_vaddr(self, offset: int) -> Optional[int]:
+        """
+        파일 오프셋을 PT_LOAD 세그먼트 기준의 가상 주소로 변환합니다. (매핑되지 않으면 None)
+        """
+        for ph in self.get_segments(PT_LOAD):
+            if ph.p_offset <= offset < ph.p_offset + ph.p_filesz:
+                return ph.p_vaddr + (offset - ph.p_offset)
+        return None
+
+    def dynamic_string(self, tag: int) -> Optional[str]:
+        """
+        DT_RPATH, DT_RUNPATH 처럼 동적 문자열 테이블을 가리키는 d_tag의 문자열을 반환합니다.
+        """
+        value = self.dynamic_value(tag)
+        strtab = self.dynamic_value(DT_STRTAB)
+        if value is None or strtab is None:
+            return None
+        offset = self.vaddr_to_offset(strtab)
+        if offset is None:
+            return None
+        return self.read_cstring(offset + value)
+
+    def symbols(self, sh_type: int = SHT_DYNSYM) -> Iterator[Symbol]:
+        """
+        주어진 타입(SHT_DYNSYM 또는 SHT_SYMTAB)의 심볼 테이블을 순회합니다.
+        """
+        for section in self.section_headers:
+            if section.sh_type == sh_type:
+                yield from self.section_symbols(section)
+
+    def section_symbols(self, section: SectionHeader) -> Iterator[Symbol]:
+        """
+        심볼 테이블 섹션 하나의 심볼을 테이블 순서대로 순회합니다. (재배치 항목의 심볼 번호와 일치)
+        """
+        if self.is_64:
+            fmt, order = self.endian + "IBBHQQ", (0, 4, 5, 1, 3)
+        else:
+            fmt, order = self.endian + "IIIBBH", (0, 1, 2, 3, 5)
+        size = struct.calcsize(fmt)
+        sections = self.section_headers
+        if not 0 <= section.sh_link < len(sections):
+            return
+        strtab_offset = sections[section.sh_link].sh_offset
+        entsize = section.sh_entsize or size
+        end = min(section.sh_offset + section.sh_size, len(self.data))
+        for offset in range(section.sh_offset, end - size + 1, entsize):
+            raw = struct.unpack_from(fmt, self.data, offset)
+            st_name, value, sym_size, info, shndx = (raw[j] for j in order)
+            yield Symbol(self.read_cstring(strtab_offset + st_name), value, sym_size, info, shndx)
+
+    def relocations(self, section: SectionHeader) -> Iterator[Relocation]:
+        """
+        SHT_REL / SHT_RELA 섹션의 재배치 항목을 순회합니다.
+        """
+        has_addend = section.sh_type == SHT_RELA
+        if self.is_64:
+            fmt, shift, mask = self.endian + ("QQq" if has_addend else "QQ"), 32, 0xFFFFFFFF
+        else:
+            fmt, shift, mask = self.endian + ("IIi" if has_addend else "II"), 8, 0xFF
+        size = struct.calcsize(fmt)
+        entsize = section.sh_entsize or size
+        end = min(section.sh_offset + section.sh_size, len(self.data))
+        for offset in range(section.sh_offset, end - size + 1, entsize):
+            raw = struct.unpack_from(fmt, self.data, offset)
+            yield Relocation(raw[0], raw[1] & mask, raw[1] >> shift, raw[2] if has_addend else 0)
+
+    def dynamic_string_names(self) -> List[str]:
+        """
+        섹션 헤더 없이도 동작하도록 DT_STRTAB 전체를 NULL 기준으로 나누어 반환합니다.
+        (섹션이 제거된 바이너리에서 import 심볼 이름을 확인할 때 사용합니다.)
+        """
+        strtab = self.dynamic_value(DT_STRTAB)
+        strsz = self.dynamic_value(DT_STRSZ)
+        if strtab is None or strsz is None:
+            return []
+        offset = self.vaddr_to_offset(strtab)
+        if offset is None:
+            return []
+        return [name.decode("latin-1") for name in self.read(offset, strsz).split(b"\0") if name]
+
+    def _iter_note_area(self, offset: int, size: int, align: int) -> Iterator[Tuple[str, int, bytes]]:
+        """
+        offset부터 size 바이트 범위의 note 레코드를 (name, type, desc) 형태로 순회합니다.
+        """
+        align = 8 if align == 8 else 4
+        end = min(offset + size, len(self.data))
+        while offset + 12 <= end:
+            namesz, descsz, n_type = struct.unpack_from(self.endian + "III", self.data, offset)
+            name_start = offset + 12
+            desc_start = name_start + ((namesz + align - 1) & ~(align - 1))
+            next_offset = desc_start + ((descsz + align - 1) & ~(align - 1))
+            if desc_start + descsz > end:
+                break
+            name = self.data[name_start:name_start + namesz].rstrip(b"\0").decode("latin-1")
+            yield name, n_type, self.data[desc_start:desc_start + descsz]
+            offset = next_offset
+
+    def notes(self) -> Iterator[Tuple[str, int, bytes]]:
+        """
+        PT_NOTE 세그먼트(없으면 SHT_NOTE 섹션)의 note 레코드를 순회합니다.
+        """
+        segments = self.get_segments(PT_NOTE)
+        if segments:
+            for ph in segments:
+                yield from self._iter_note_area(ph.p_offset, ph.p_filesz, ph.p_align)
+        else:
+            for section in self.section_headers:
+                if section.sh_type == SHT_NOTE:
+                    yield from self._iter_note_area(section.sh_offset, section.sh_size, 4)
+
+    def build_id(self) -> Optional[str]:
+        """
+        .note.gnu.build-id 의 BuildID를 16진수 문자열로 반환합니다. (없으면 None)
+        """
+        for name, n_type, desc in self.notes():
+            if name == "GNU" and n_type == NT_GNU_BUILD_ID:
+                return desc.hex()
+        return None
+
+    def target_os(self) -> Optional[str]:
+        """
+        .note.ABI-tag 로부터 대상 운영체제 문자열을 반환합니다. (예: "GNU/Linux 3.2.0")
+        """
+        for name, n_type, desc in self.notes():
+            if name == "GNU" and n_type == NT_GNU_ABI_TAG and len(desc) >= 16:
+                os_id, major, minor, patch = struct.unpack_from(self.endian + "IIII", desc)
+                os_name = ABI_TAG_OS_NAMES.get(os_id, f"OS {os_id}")
+                return f"{os_name} {major}.{minor}.{patch}"
+        return None
+
+    def has_symtab(self) -> bool:
+        """
+        .symtab 섹션 존재 여부를 반환합니다. (없으면 stripped)
+        """
+        return any(section.sh_type == SHT_SYMTAB for section in self.section_headers)
+
+    def is_pie(self) -> bool:
+        """
+        file 명령어와 같은 기준으로 PIE 실행 파일 여부를 판단합니다.
+        """
+        if self.e_type != ET_DYN:
+            return False
+        # file 명령어와 마찬가지로 DF_1_PIE 플래그가 있어야 PIE 실행 파일로 봅니다.
+        return bool((self.dynamic_value(DT_FLAGS_1) or 0) & DF_1_PIE)
+
+    def _type_string(self) -> str:
+        if self.e_type == ET_DYN:
+            return "pie executable" if self.is_pie() else "shared object"
+        return {
+            ET_REL: "relocatable",
+            ET_EXEC: "executable",
+            ET_CORE: "core file",
+        }.get(self.e_type, f"unknown type {self.e_type}")
+
+    def _linking_string(self) -> str:
+        if self.e_type == ET_REL:
+            return ""
+        has_interp = self.interpreter() is not None
+        if self.e_type == ET_DYN and not has_interp and self.is_pie():
+            return "static-pie linked"
+        if has_interp or self.get_segments(PT_DYNAMIC):
+            return "dynamically linked"
+        return "statically linked"
+
+    def file_info(self) -> ELFFileInfo:
+        """
+        ELF 헤더 정보를 ELFFileInfo 데이터 클래스로 반환합니다.
+
+        return:
+          ELFFileInfo: 파싱된 파일 정보 데이터 클래스 인스턴스
+        """
+        osabi = OSABI_NAMES.get(self.ei_osabi, str(self.ei_osabi))
+        return ELFFileInfo(
+            bit_format="64-bit" if self.is_64 else "32-bit",
+            endian="LSB" if self.endian == "<" else "MSB",
+            is_pie=self.is_pie(),
+            cpu_arch=MACHINE_NAMES.get(self.e_machine, f"machine {self.e_machine}"),
+            version=f"version {self.ei_version} ({osabi})",
+            linking=self._linking_string(),
+            interpreter=self.interpreter(),
+            build_id=self.build_id(),
+            target_os=self.target_os(),
+            is_stripped=not self.has_symtab()
+        )
+
+    def describe(self) -> str:
+        """
+        file 명령어 출력과 같은 형식의 요약 문자열을 반환합니다.
+        """
+        info = self.file_info()
+        tokens = [
+            f"ELF {info.bit_format} {info.endian} {self._type_string()}",
+            info.cpu_arch,
+            info.version,
+        ]
+        if info.linking:
+            tokens.append(info.linking)
+        if info.interpreter:
+            tokens.append(f"interpreter {info.interpreter}")
+        if info.build_id:
+            kind = {20: "sha1", 16: "md5/uuid", 8: "xxHash"}.get(len(info.build_id) // 2, "unknown")
+            tokens.append(f"BuildID[{kind}]={info.build_id}")
+        if info.target_os:
+            tokens.append(f"for {info.target_os}")
+        tokens.append("stripped" if info.is_stripped else "not stripped")
+        return f"{self.file_path}: " + ", ".join(tokens)
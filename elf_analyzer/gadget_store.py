@@ -0,0 +1,354 @@
+# elf_analyzer/gadget_store.py
+import bisect
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from .blockgz import open_lines
+from .models import Gadget
+
+MAGIC = b"EPGS"
+VERSION = 1
+FLAG_64 = 0x1
+# magic, version, flags, 가젯 수, 명령어 문자열 수, 명령어 문자열 바이트 수, 시퀀스 항목 수, 레지스터 수, 레지스터 항목 수, 레지스터 이름 바이트 수
+_HEADER = struct.Struct("<4sIIIIIIIII")
+_ALIGN = 8
+
+# 결과를 기록하지 않는 명령어 (첫 번째 피연산자가 레지스터여도 쓰기로 보지 않습니다.)
+_NO_WRITE = frozenset([
+    "push", "cmp", "test", "jmp", "call", "ret", "retf", "nop", "int", "int3", "syscall", "sysenter",
+    "iret", "iretd", "iretq", "sysret", "sysretq", "hlt", "bt", "ucomiss", "ucomisd", "comiss", "comisd",
+])
+
+_GPR_FAMILIES = [
+    ("rax", "eax", ("al", "ah", "ax")), ("rbx", "ebx", ("bl", "bh", "bx")),
+    ("rcx", "ecx", ("cl", "ch", "cx")), ("rdx", "edx", ("dl", "dh", "dx")),
+    ("rsi", "esi", ("sil", "si")), ("rdi", "edi", ("dil", "di")),
+    ("rbp", "ebp", ("bpl", "bp")), ("rsp", "esp", ("spl", "sp")),
+] + [(f"r{n}", f"r{n}d", (f"r{n}b", f"r{n}w")) for n in range(8, 16)]
+
+
+def _register_families(is_64: bool) -> Dict[str, str]:
+    """
+    부분 레지스터 이름을 전체 레지스터 이름으로 바꾸는 표를 반환합니다. (예: "edi" -> "rdi", 32비트에서는 "di" -> "edi")
+    """
+    families = {}
+    for full, half, parts in _GPR_FAMILIES:
+        canonical = full if is_64 else half
+        for name in (full, half) + parts:
+            families[name] = canonical
+    return families
+
+
+_FAMILIES = {True: _register_families(True), False: _register_families(False)}
+_REGISTER_RE = re.compile(r"^[a-z][a-z0-9]*$")
+
+
+def normalize_instructions(instructions: str) -> str:
+    """
+    명령어 시퀀스를 비교하기 좋은 형태로 정규화합니다.
+    소문자로 바꾸고 공백을 하나로 줄이며, 명령어 사이를 " ; "로 통일합니다. (예: "POP rdi;ret" -> "pop rdi ; ret")
+    """
+    parts = [" ".join(part.split()) for part in instructions.lower().split(";")]
+    return " ; ".join(part for part in parts if part)
+
+
+def registers_written(instructions: str, is_64: bool = True) -> Set[str]:
+    """
+    명령어 시퀀스가 값을 기록하는 범용 레지스터 집합을 반환합니다.
+    부분 레지스터는 전체 레지스터 이름으로 바꾸며 (eax -> rax), 스택 포인터의 암묵적인 변경은 제외합니다.
+
+    arguments:
+      instructions (str): " ; "로 구분한 명령어 문자열
+      is_64 (bool): 64비트 바이너리 여부 (레지스터 이름 정규화에 사용)
+
+    return:
+      Set[str]: 기록되는 레지스터 이름 집합
+    """
+    families = _FAMILIES[is_64]
+    written = set()
+    for instruction in normalize_instructions(instructions).split(" ; "):
+        mnemonic, _, operand_text = instruction.partition(" ")
+        operands = [operand.strip() for operand in operand_text.split(",")] if operand_text else []
+        if mnemonic == "leave":
+            written.add(families["rbp"])
+            continue
+        if mnemonic in _NO_WRITE or mnemonic.startswith("j") or not operands:
+            continue
+        targets = operands if mnemonic == "xchg" else operands[:1]
+        for target in targets:
+            if _REGISTER_RE.match(target):
+                written.add(families.get(target, target))
+    return written
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) & ~(_ALIGN - 1)
+
+
+class _SortedTexts(Sequence):
+    """
+    정렬 순서 배열을 명령어 문자열 시퀀스처럼 보이게 하여 bisect 로 탐색할 수 있게 합니다.
+    """
+    def __init__(self, store: "GadgetStore"):
+        self.store = store
+
+    def __len__(self) -> int:
+        return len(self.store.order)
+
+    def __getitem__(self, index: int) -> str:
+        return self.store.instructions(self.store.order[index])
+
+
+class GadgetStore:
+    """
+    가젯 목록을 배열 기반으로 압축하여 저장하고, 명령어 시퀀스와 기록 레지스터로 빠르게 찾는 저장소입니다.
+    주소는 array('Q'), 명령어는 중복 없이 한 번만 저장한 문자열 표의 번호로 보관합니다.
+    정규화한 명령어 시퀀스 순서의 색인으로 완전 일치 / 접두사 검색을 O(log n) 에,
+    레지스터별 색인으로 특정 레지스터에 값을 쓰는 가젯 검색을 O(1) 에 처리합니다.
+    save() 로 저장한 파일은 load() 가 mmap 하여 다시 파싱하지 않고 바로 사용합니다.
+
+    사용 예제:
+      store = GadgetStore.load("logs/chall-1b1e0f834e4c/gadgets/chall.gadgets")
+      for address, instructions in store.find("pop rdi ; ret"):
+          print(hex(address), instructions)
+      for address, instructions in store.find_prefix("pop rdi"):
+          ...
+      rdi_gadgets = store.writes("rdi", "rsi")
+    """
+    def __init__(self, is_64: bool, addresses, sequence_offsets, sequence_items, order,
+                 instruction_offsets, instruction_blob, register_names: List[str],
+                 register_offsets, register_items, mapped: Optional[mmap.mmap] = None):
+        """
+        생성자 (직접 호출하지 말고 from_gadgets / from_text / load 를 사용합니다.)
+        """
+        self.is_64 = is_64
+        self.addresses = addresses
+        self.sequence_offsets = sequence_offsets
+        self.sequence_items = sequence_items
+        self.order = order
+        self.instruction_offsets = instruction_offsets
+        self.instruction_blob = instruction_blob
+        self.register_names = register_names
+        self.register_offsets = register_offsets
+        self.register_items = register_items
+        self._register_ids = {name: index for index, name in enumerate(register_names)}
+        self._mapped = mapped
+        self._instruction = lru_cache(maxsize=None)(self._decode_instruction)
+
+    @classmethod
+    def from_gadgets(cls, gadgets: Iterable[Gadget], is_64: bool) -> "GadgetStore":
+        """
+        Gadget 목록으로 저장소를 만듭니다.
+        """
+        return cls._build(((gadget.address, gadget.instructions) for gadget in gadgets), is_64)
+
+    @classmethod
+    def from_text(cls, path: str, is_64: Optional[bool] = None) -> "GadgetStore":
+        """
+        ROPgadget 형식("0x<주소> : <명령어>")의 텍스트 파일(블록 압축 .gz 포함)로 저장소를 만듭니다.
+        is_64가 None이면 주소의 자릿수(16자리)로 판단합니다.
+        """
+        entries = []
+        for line in open_lines(path):
+            if not line.startswith("0x") or " : " not in line:
+                continue
+            address, instructions = line.rstrip("\n").split(" : ", 1)
+            if is_64 is None:
+                is_64 = len(address) == 18
+            entries.append((int(address, 16), instructions))
+        return cls._build(entries, bool(is_64))
+
+    @classmethod
+    def _build(cls, entries: Iterable[Tuple[int, str]], is_64: bool) -> "GadgetStore":
+        addresses = array("Q")
+        sequence_offsets = array("I", [0])
+        sequence_items = array("I")
+        instruction_ids: Dict[str, int] = {}
+        register_lists: Dict[str, List[int]] = {}
+        texts = []
+        for index, (address, instructions) in enumerate(entries):
+            text = normalize_instructions(instructions)
+            addresses.append(address)
+            for instruction in text.split(" ; "):
+                # 같은 명령어 문자열은 한 번만 저장하고 번호로 참조합니다. (intern)
+                sequence_items.append(instruction_ids.setdefault(sys.intern(instruction), len(instruction_ids)))
+            sequence_offsets.append(len(sequence_items))
+            for register in registers_written(text, is_64):
+                register_lists.setdefault(register, []).append(index)
+            texts.append(text)
+
+        order = array("I", sorted(range(len(texts)), key=texts.__getitem__))
+        instruction_offsets = array("I", [0])
+        blob = bytearray()
+        for instruction in instruction_ids:
+            blob += instruction.encode("utf-8")
+            instruction_offsets.append(len(blob))
+        register_names = sorted(register_lists)
+        register_offsets = array("I", [0])
+        register_items = array("I")
+        for register in register_names:
+            register_items.extend(register_lists[register])
+            register_offsets.append(len(register_items))
+        return cls(is_64, addresses, sequence_offsets, sequence_items, order,
+                   instruction_offsets, bytes(blob), register_names, register_offsets, register_items)
+
+    def save(self, path: str) -> None:
+        """
+        저장소를 mmap 으로 바로 읽을 수 있는 바이너리 파일로 저장합니다.
+        각 배열은 8바이트 경계에 리틀 엔디안으로 기록합니다.
+        """
+        register_blob = "\n".join(self.register_names).encode("utf-8")
+        sections = [
+            self.addresses, self.sequence_offsets, self.sequence_items, self.order,
+            self.instruction_offsets, self.instruction_blob,
+            self.register_offsets, self.register_items, register_blob,
+        ]
+        header = _HEADER.pack(
+            MAGIC, VERSION, FLAG_64 if self.is_64 else 0, len(self.addresses),
+            len(self.instruction_offsets) - 1, len(self.instruction_blob), len(self.sequence_items),
+            len(self.register_names), len(self.register_items), len(register_blob),
+        )
+        with open(path + ".tmp", "wb") as f:
+            f.write(header)
+            for section in sections:
+                f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
+                if isinstance(section, array):
+                    section = array(section.typecode, section)
+                    if sys.byteorder != "little":
+                        section.byteswap()
+                    section = section.tobytes()
+                f.write(bytes(section))
+        # 기록이 끝난 뒤에만 교체하여 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 합니다.
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path: str) -> "GadgetStore":
+        """
+        save() 로 저장한 파일을 mmap 하여 저장소를 엽니다.
+        배열은 복사하지 않고 memoryview 로 파일을 직접 참조합니다.
+        가젯 저장소 파일이 아니거나 버전이 다르면 ValueError를 발생시킵니다.
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, flags, gadget_count, instruction_count, blob_size, item_count,
+             register_count, register_item_count, register_blob_size) = _HEADER.unpack_from(mapped, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path}: not a gadget store (version {VERSION})")
+        except (struct.error, ValueError):
+            mapped.close()
+            raise
+
+        view = memoryview(mapped)
+        offset = _HEADER.size
+        sections = []
+        for typecode, count in (("Q", gadget_count), ("I", gadget_count + 1), ("I", item_count),
+                                ("I", gadget_count), ("I", instruction_count + 1), ("B", blob_size),
+                                ("I", register_count + 1), ("I", register_item_count),
+                                ("B", register_blob_size)):
+            offset = _aligned(offset)
+            size = array(typecode).itemsize * count
+            section = view[offset:offset + size]
+            if typecode != "B":
+                if sys.byteorder == "little":
+                    section = section.cast(typecode)
+                else:
+                    section = array(typecode, section.tobytes())
+                    section.byteswap()
+            sections.append(section)
+            offset += size
+        (addresses, sequence_offsets, sequence_items, order, instruction_offsets, instruction_blob,
+         register_offsets, register_items, register_blob) = sections
+        register_names = bytes(register_blob).decode("utf-8").split("\n") if register_count else []
+        return cls(bool(flags & FLAG_64), addresses, sequence_offsets, sequence_items, order,
+                   instruction_offsets, instruction_blob, register_names, register_offsets, register_items,
+                   mapped)
+
+    def close(self) -> None:
+        """
+        load() 로 연 파일의 mmap 을 닫습니다.
+        """
+        if self._mapped is not None:
+            for name in ("addresses", "sequence_offsets", "sequence_items", "order", "instruction_offsets",
+                         "instruction_blob", "register_offsets", "register_items"):
+                section = getattr(self, name)
+                if isinstance(section, memoryview):
+                    section.release()
+            self._mapped.close()
+            self._mapped = None
+
+    def __enter__(self) -> "GadgetStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def _decode_instruction(self, instruction_id: int) -> str:
+        start = self.instruction_offsets[instruction_id]
+        end = self.instruction_offsets[instruction_id + 1]
+        return bytes(self.instruction_blob[start:end]).decode("utf-8")
+
+    def instructions(self, index: int) -> str:
+        """
+        index 번째 가젯의 (정규화된) 명령어 문자열을 반환합니다.
+        """
+        start, end = self.sequence_offsets[index], self.sequence_offsets[index + 1]
+        return " ; ".join(self._instruction(self.sequence_items[i]) for i in range(start, end))
+
+    def __getitem__(self, index: int) -> Tuple[int, str]:
+        """
+        index 번째 가젯의 (주소, 명령어 문자열)을 반환합니다.
+        """
+        return self.addresses[index], self.instructions(index)
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def _range(self, low_key: str, high_key: Optional[str]) -> Iterator[Tuple[int, str]]:
+        texts = _SortedTexts(self)
+        low = bisect.bisect_left(texts, low_key)
+        high = bisect.bisect_right(texts, high_key, lo=low) if high_key is not None else len(texts)
+        for position in range(low, high):
+            yield self[self.order[position]]
+
+    def find(self, instructions: str) -> List[Tuple[int, str]]:
+        """
+        명령어 시퀀스가 정확히 일치하는 가젯을 반환합니다. (예: "pop rdi ; ret")
+
+        return:
+          List[Tuple[int, str]]: (주소, 명령어 문자열) 목록
+        """
+        key = normalize_instructions(instructions)
+        return list(self._range(key, key))
+
+    def find_prefix(self, prefix: str) -> List[Tuple[int, str]]:
+        """
+        명령어 시퀀스가 prefix 로 시작하는 가젯을 명령어 문자열 순서로 반환합니다. (예: "pop rdi")
+        """
+        key = normalize_instructions(prefix)
+        return list(self._range(key, key + "\U0010ffff"))
+
+    def writes(self, *registers: str) -> List[Tuple[int, str]]:
+        """
+        주어진 레지스터에 모두 값을 기록하는 가젯을 반환합니다. (예: writes("rdi"), writes("rdi", "rsi"))
+        부분 레지스터 이름도 전체 레지스터로 바꾸어 찾습니다. (edi -> rdi)
+        """
+        families = _FAMILIES[self.is_64]
+        selected: Optional[Set[int]] = None
+        for register in registers:
+            register_id = self._register_ids.get(families.get(register.lower(), register.lower()))
+            if register_id is None:
+                return []
+            start, end = self.register_offsets[register_id], self.register_offsets[register_id + 1]
+            indexes = set(self.register_items[start:end])
+            selected = indexes if selected is None else selected & indexes
+        return [self[index] for index in sorted(selected or ())]
@@ -0,0 +1,280 @@
+# elf_analyzer/gadgets.py
+import mmap
+import os
+import re
+import resource
+import time
+from typing import Dict, List, Optional, Tuple
+from .elf_parser import ELFParser, EM_386, EM_X86_64, PF_X
+from .models import ChildMetrics, Gadget
+from .profiling import record_child
+
+DEFAULT_DEPTH = 10
+# 이보다 작은 실행 영역은 프로세스 풀을 띄우는 비용이 더 크므로 현재 프로세스에서 탐색합니다.
+MIN_PARALLEL_BYTES = 256 * 1024
+MIN_SLICE_BYTES = 64 * 1024
+# 가장 긴 종료 패턴의 길이 (슬라이스 끝에서 이만큼 더 읽어야 경계에 걸친 패턴을 찾을 수 있습니다.)
+MAX_PATTERN_SIZE = 8
+
+# ROPgadget 과 동일한 종료 패턴입니다. (정규식, 바이트 길이)
+ROP_PATTERNS = [
+    (rb"\xc3", 1),                # ret
+    (rb"\xc2[\x00-\xff]{2}", 3),  # ret <imm>
+    (rb"\xcb", 1),                # retf
+    (rb"\xca[\x00-\xff]{2}", 3),  # retf <imm>
+    (rb"\xf2\xc3", 2),            # bnd ret
+    (rb"\xf2\xc2[\x00-\xff]{2}", 4),
+]
+
+_JOP_REGISTER_PATTERNS = [
+    (rb"\xff[\xd0-\xd7\xe0-\xe7]", 2),                                       # call/jmp reg
+    (rb"\xff[\x10-\x13\x16-\x17\x20-\x23\x26-\x27]", 2),                     # call/jmp [reg]
+    (rb"\xff[\x14\x24]\x24", 3),                                             # call/jmp [esp]
+    (rb"\xff[\x50-\x53\x55-\x57\x60-\x63\x65-\x67][\x00-\xff]", 3),          # call/jmp [reg + imm8]
+    (rb"\xff[\x54\x64]\x24[\x00-\xff]", 4),                                  # call/jmp [esp + imm8]
+    (rb"\xff[\x90-\x93\x95-\x97\xa0-\xa3\xa5-\xa7][\x00-\xff]{4}", 6),       # call/jmp [reg + imm32]
+    (rb"\xff[\x94\xa4]\x24[\x00-\xff]{4}", 7),                               # call/jmp [esp + imm32]
+]
+
+_JOP_COMMON_PATTERNS = [
+    (rb"\xeb[\x00-\xff]", 2),                       # jmp rel8
+    (rb"\xe9[\x00-\xff]{4}", 5),                    # jmp rel32
+    (rb"\xf2\xff[\x20\x21\x22\x23\x26\x27]{1}", 3), # bnd jmp [reg]
+    (rb"\xf2\xff[\xe0\xe1\xe2\xe3\xe4\xe6\xe7]{1}", 3),
+    (rb"\xf2\xff[\x10\x11\x12\x13\x16\x17]{1}", 3),
+    (rb"\xf2\xff[\xd0\xd1\xd2\xd3\xd4\xd6\xd7]{1}", 3),
+]
+
+SYS_PATTERNS = [
+    (rb"\xcd\x80", 2),                          # int 0x80
+    (rb"\x0f\x34", 2),                          # sysenter
+    (rb"\x0f\x05", 2),                          # syscall
+    (rb"\x65\xff\x15\x10\x00\x00\x00", 7),      # call dword ptr gs:[0x10]
+    (rb"\xcd\x80\xc3", 3),
+    (rb"\x0f\x34\xc3", 3),
+    (rb"\x0f\x05\xc3", 3),
+    (rb"\x65\xff\x15\x10\x00\x00\x00\xc3", 8),
+    (rb"\x0f\x07", 2),                          # sysret
+    (rb"\x48\x0f\x07", 3),
+    (rb"\xcf", 1),                              # iret
+]
+
+# 가젯의 마지막 명령어가 될 수 있는 분기 명령어 (중간에 나오면 가젯이 아닙니다.)
+_BRANCHES = frozenset([
+    "ret", "repz ret", "retf", "int", "sysenter", "jmp", "notrack jmp", "call", "notrack call",
+    "syscall", "iret", "iretd", "iretq", "sysret", "sysretq",
+])
+
+
+def jop_patterns(is_64: bool) -> List[Tuple[bytes, int]]:
+    """
+    JOP 종료 패턴 목록을 반환합니다.
+    x86-64 에서는 REX.B(0x41) 접두사를 붙여 r8 ~ r15 레지스터 분기도 찾습니다.
+    """
+    patterns = list(_JOP_REGISTER_PATTERNS)
+    if is_64:
+        patterns += [(b"\x41" + pattern, size + 1) for pattern, size in _JOP_REGISTER_PATTERNS]
+    return patterns + _JOP_COMMON_PATTERNS
+
+
+def _load_capstone():
+    """
+    capstone 모듈을 처음 사용할 때 import 합니다. (import 비용이 커서 가젯 탐색 단계에서만 불러옵니다.)
+    capstone이 없으면 None을 반환하며, 이 경우 ROPgadget 명령어로 대체합니다.
+    """
+    try:
+        import capstone
+    except ImportError:
+        return None
+    return capstone
+
+
+def is_supported(elf: ELFParser) -> bool:
+    """
+    내장 가젯 탐색기로 처리할 수 있는 바이너리인지 확인합니다. (capstone 설치 및 x86 / x86-64)
+    """
+    return elf.e_machine in (EM_386, EM_X86_64) and _load_capstone() is not None
+
+
+def _scan_slice(task: Tuple) -> List[Tuple[Tuple[int, ...], int, str, bytes]]:
+    """
+    프로세스 풀 워커에서 실행되는 함수입니다.
+    실행 영역의 [start, end) 구간에서 시작하는 종료 패턴마다 depth 바이트까지 거슬러 올라가며 디스어셈블합니다.
+    바이트를 직접 넘기지 않고 워커가 파일을 다시 mmap 하므로 프로세스 간 복사가 없습니다.
+
+    return:
+      List[Tuple[Tuple[int, ...], int, str, bytes]]: (정렬 키, 주소, 명령어 문자열, 바이트) 목록
+        (명령어 문자열이 같은 가젯은 정렬 키가 가장 작은 것 하나만 남깁니다.)
+    """
+    (file_path, segment_index, segment_offset, segment_size, segment_vaddr,
+     start, end, is_64, depth, categories, filter_pattern) = task
+
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        segment_end = min(segment_offset + segment_size, len(data))
+        base = max(0, start - depth)
+        opcodes = data[segment_offset + base:min(segment_offset + end + MAX_PATTERN_SIZE, segment_end)]
+
+    capstone = _load_capstone()
+    md = capstone.Cs(capstone.CS_ARCH_X86, capstone.CS_MODE_64 if is_64 else capstone.CS_MODE_32)
+    filter_re = re.compile(filter_pattern)
+    found: Dict[str, Tuple[Tuple[int, ...], int, str, bytes]] = {}
+    for category, patterns in enumerate(categories):
+        for pattern_index, (pattern, size) in enumerate(patterns):
+            for match in re.compile(pattern).finditer(opcodes, start - base):
+                ref = base + match.start()
+                if ref >= end:
+                    break
+                for i in range(depth):
+                    gadget_start = ref - i
+                    if gadget_start < 0:
+                        continue
+                    code = opcodes[gadget_start - base:ref + size - base]
+                    vaddr = segment_vaddr + gadget_start
+                    decodes = list(md.disasm_lite(code, vaddr))
+                    if not decodes or sum(decode[1] for decode in decodes) != i + size:
+                        continue
+                    mnemonics = [decode[2] for decode in decodes]
+                    if mnemonics[-1] not in _BRANCHES:
+                        continue
+                    if any(mnemonic in _BRANCHES or "ret" in mnemonic for mnemonic in mnemonics[:-1]):
+                        continue
+                    if any(filter_re.match(mnemonic) for mnemonic in mnemonics):
+                        continue
+                    text = " ; ".join(
+                        f"{mnemonic} {op_str}" if op_str else mnemonic
+                        for _, _, mnemonic, op_str in decodes
+                    ).replace("  ", " ")
+                    key = (segment_index, category, pattern_index, ref, i)
+                    if text not in found or key < found[text][0]:
+                        found[text] = (key, vaddr, text, bytes(code))
+    return list(found.values())
+
+
+def _scan_slice_measured(task: Tuple) -> Tuple[List[Tuple[Tuple[int, ...], int, str, bytes]], float, int]:
+    """
+    워커 프로세스에서 _scan_slice 를 실행하고 (결과, 사용한 CPU 시간, 워커의 최대 RSS(KiB)) 를 반환합니다.
+    """
+    start = time.process_time()
+    result = _scan_slice(task)
+    return result, time.process_time() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class GadgetFinder:
+    """
+    실행 가능한 세그먼트를 mmap 하여 ROP / JOP / SYS 가젯을 찾는 내장 가젯 탐색기입니다.
+    ROPgadget 과 같은 종료 패턴과 검사 규칙을 사용하므로 같은 가젯을 찾으며,
+    세그먼트를 여러 구간으로 나누어 프로세스 풀에서 병렬로 탐색합니다.
+
+    사용 예제:
+      for gadget in GadgetFinder("./chall", only="pop|ret").find():
+          print(hex(gadget.address), gadget.instructions)
+    """
+    def __init__(self, file_path: str, depth: int = DEFAULT_DEPTH, rop: bool = True, jop: bool = True,
+                 sys: bool = True, only: Optional[str] = None, filter: Optional[str] = None,
+                 jobs: Optional[int] = None):
+        """
+        생성자
+
+        arguments:
+          file_path (str): 분석할 ELF 파일의 경로
+          depth (int): 종료 명령어로부터 거슬러 올라갈 최대 바이트 수 (ROPgadget --depth)
+          rop (bool): ret 계열로 끝나는 가젯을 찾을지 여부 (ROPgadget --norop 의 반대)
+          jop (bool): jmp / call 계열로 끝나는 가젯을 찾을지 여부 (ROPgadget --nojop 의 반대)
+          sys (bool): syscall / int 0x80 계열로 끝나는 가젯을 찾을지 여부 (ROPgadget --nosys 의 반대)
+          only (Optional[str]): "|"로 구분한 명령어 목록, 이 명령어로만 이루어진 가젯만 남깁니다. (ROPgadget --only)
+          filter (Optional[str]): "|"로 구분한 명령어 목록, 이 명령어가 포함된 가젯을 제외합니다. (ROPgadget --filter)
+          jobs (Optional[int]): 워커 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 탐색)
+        """
+        if depth < 1:
+            raise ValueError("depth must be >= 1")
+        self.file_path = file_path
+        self.depth = depth
+        self.rop = rop
+        self.jop = jop
+        self.sys = sys
+        self.only = set(only.split("|")) if only else None
+        self.filter_pattern = "(db|int3" + (f"|{filter}" if filter else "") + ")$"
+        self.jobs = jobs if jobs is not None else (os.cpu_count() or 1)
+        with ELFParser(file_path) as elf:
+            if not is_supported(elf):
+                raise ValueError("GadgetFinder requires capstone and an x86 / x86-64 binary")
+            self.is_64 = elf.e_machine == EM_X86_64
+            # ROPgadget 과 같이 실행 권한이 있는 모든 프로그램 헤더를 탐색합니다.
+            self.segments = [
+                (header.p_offset, header.p_memsz, header.p_vaddr)
+                for header in elf.program_headers
+                if header.p_flags & PF_X and header.p_memsz
+            ]
+
+    def _categories(self) -> List[List[Tuple[bytes, int]]]:
+        categories = []
+        if self.rop:
+            categories.append(ROP_PATTERNS)
+        if self.jop:
+            categories.append(jop_patterns(self.is_64))
+        if self.sys:
+            categories.append(SYS_PATTERNS)
+        return categories
+
+    def _tasks(self) -> List[Tuple]:
+        """
+        실행 영역을 워커 수의 4배 정도의 구간으로 나눈 작업 목록을 만듭니다.
+        """
+        total = sum(size for _, size, _ in self.segments)
+        slice_size = max(MIN_SLICE_BYTES, -(-total // (self.jobs * 4)))
+        categories = self._categories()
+        tasks = []
+        for index, (offset, size, vaddr) in enumerate(self.segments):
+            for start in range(0, size, slice_size):
+                tasks.append((self.file_path, index, offset, size, vaddr, start, min(start + slice_size, size),
+                              self.is_64, self.depth, categories, self.filter_pattern))
+        return tasks
+
+    def find(self) -> List[Gadget]:
+        """
+        가젯을 찾아 명령어 문자열 순으로 정렬된 목록을 반환합니다.
+        명령어 문자열이 같은 가젯은 ROPgadget 과 같이 처음 발견된 주소 하나만 남깁니다.
+
+        return:
+          List[Gadget]: 찾은 가젯 목록
+        """
+        tasks = self._tasks()
+        total = sum(size for _, size, _ in self.segments)
+        if self.jobs > 1 and len(tasks) > 1 and total >= MIN_PARALLEL_BYTES:
+            from concurrent.futures import ProcessPoolExecutor
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                measured = list(executor.map(_scan_slice_measured, tasks))
+            results = [result for result, _, _ in measured]
+            # 워커 프로세스의 자원 사용량을 현재 분석 단계(ropgadget)에 자식 프로세스로 기록합니다.
+            record_child(ChildMetrics(
+                command="gadget-workers",
+                wall_time=time.perf_counter() - start,
+                cpu_time=sum(cpu_time for _, cpu_time, _ in measured),
+                peak_rss_kb=max(peak_rss_kb for _, _, peak_rss_kb in measured),
+            ))
+        else:
+            results = [_scan_slice(task) for task in tasks]
+
+        unique: Dict[str, Tuple[Tuple[int, ...], int, str, bytes]] = {}
+        for result in results:
+            for found in result:
+                current = unique.get(found[2])
+                if current is None or found[0] < current[0]:
+                    unique[found[2]] = found
+
+        gadgets = []
+        for text in sorted(unique):
+            _, vaddr, _, raw = unique[text]
+            if self.only is not None and any(
+                    instruction.split(" ")[0] not in self.only for instruction in text.split(" ; ")):
+                continue
+            gadgets.append(Gadget(address=vaddr, instructions=text, raw=raw))
+        return gadgets
+
+
+def format_gadget(gadget: Gadget, is_64: bool) -> str:
+    """
+    가젯 하나를 ROPgadget 출력과 같은 "0x<주소> : <명령어>" 형식의 한 줄로 변환합니다.
+    """
+    return f"0x{gadget.address:0{16 if is_64 else 8}x} : {gadget.instructions}"
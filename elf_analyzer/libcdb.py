@@ -0,0 +1,427 @@
+# elf_analyzer/libcdb.py
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from dataclasses import asdict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .cache import file_sha256
+from .elf_parser import ELFParseError, ELFParser, EM_X86_64, SHT_DYNSYM, SHT_SYMTAB, is_elf
+from .models import LibcEntry
+
+DEFAULT_DATABASE_DIR = "libcdb"
+RECORDS_FILE = "libcs.jsonl"
+INDEX_FILE = "libcs.idx"
+
+# 등록할 때 오프셋을 저장하는 심볼 (str_bin_sh 는 "/bin/sh" 문자열의 오프셋)
+KEY_SYMBOLS = (
+    "system", "puts", "printf", "read", "write", "open", "execve", "__libc_start_main",
+    "setcontext", "environ", "_IO_2_1_stdin_", "_IO_2_1_stdout_", "_IO_list_all",
+    "__malloc_hook", "__free_hook",
+)
+STR_BIN_SH = "str_bin_sh"
+# one_gadget 후보를 찾을 때 "/bin/sh" 를 인자로 받는 호출 대상
+_EXEC_FUNCTIONS = ("execve", "execv", "execvpe", "posix_spawn", "posix_spawnp")
+# lea r64, [rip + disp32] (REX.W / REX.WR, ModRM mod=00 rm=101)
+_LEA_RIP = re.compile(rb"[\x48\x4c]\x8d[\x05\x0d\x15\x1d\x25\x2d\x35\x3d]", re.DOTALL)
+# lea 뒤에서 호출을 찾을 최대 거리 (바이트)
+_CALL_WINDOW = 0x100
+_BANNER = re.compile(rb"GNU C Library [^\n\0]*version [0-9][^\n\0]*")
+
+INDEX_MAGIC = b"EPLC"
+INDEX_VERSION = 1
+_HEADER = struct.Struct("<4sIIIII")
+_BUILD_ID_SLOT = struct.Struct("<QI")
+_SYMBOL_SLOT = struct.Struct("<QII")
+
+
+def _key(text: str) -> int:
+    """
+    해시 색인의 키를 64비트 정수로 만듭니다. (0은 빈 슬롯을 나타내므로 사용하지 않습니다.)
+    """
+    return int.from_bytes(hashlib.sha1(text.encode()).digest()[:8], "little") or 1
+
+
+def _symbol_key(name: str, offset: int) -> int:
+    # ASLR 은 페이지 단위로 적용되므로 유출된 주소의 하위 12비트는 libc 오프셋과 같습니다.
+    return _key(f"{name}@{offset & 0xfff:03x}")
+
+
+def _table_size(count: int) -> int:
+    size = 1
+    while size < count * 2:
+        size <<= 1
+    return size
+
+
+def find_one_gadgets(elf: ELFParser, bin_sh: Optional[int]) -> List[int]:
+    """
+    "/bin/sh" 문자열을 가리키는 lea 명령어 뒤 _CALL_WINDOW 바이트 안에서
+    execve / posix_spawn 계열 함수를 호출하는 위치를 찾아, lea 명령어의 오프셋을 후보로 반환합니다.
+    (one_gadget 처럼 레지스터 / 스택 제약 조건을 계산하지는 않으므로 실제 사용 전 확인이 필요합니다.
+     x86-64 libc 만 지원합니다.)
+    """
+    text = elf.get_section(".text")
+    if elf.e_machine != EM_X86_64 or text is None or bin_sh is None:
+        return []
+    targets = set()
+    for sh_type in (SHT_DYNSYM, SHT_SYMTAB):
+        for symbol in elf.symbols(sh_type):
+            if symbol.shndx and symbol.name.split("@")[0] in _EXEC_FUNCTIONS:
+                targets.add(symbol.value)
+    data = elf.read(text.sh_offset, text.sh_size)
+    candidates = []
+    for match in _LEA_RIP.finditer(data):
+        start = match.start()
+        if start + 7 > len(data):
+            continue
+        address = text.sh_addr + start
+        if address + 7 + struct.unpack_from("<i", data, start + 3)[0] != bin_sh:
+            continue
+        end = min(start + 7 + _CALL_WINDOW, len(data) - 5)
+        position = data.find(b"\xe8", start + 7, end)
+        while position != -1:
+            if text.sh_addr + position + 5 + struct.unpack_from("<i", data, position + 1)[0] in targets:
+                candidates.append(address)
+                break
+            position = data.find(b"\xe8", position + 1, end)
+    return candidates
+
+
+def describe_libc(file_path: str) -> Optional[LibcEntry]:
+    """
+    libc 파일에서 BuildID, 주요 심볼 오프셋, "/bin/sh" 오프셋, one_gadget 후보를 추출합니다.
+    __libc_start_main 을 정의하지 않는 파일(libc 가 아닌 파일)이면 None 을 반환합니다.
+    """
+    with ELFParser(file_path) as elf:
+        defined: Dict[str, int] = {}
+        for sh_type in (SHT_DYNSYM, SHT_SYMTAB):
+            for symbol in elf.symbols(sh_type):
+                if symbol.shndx and symbol.name:
+                    defined.setdefault(symbol.name, symbol.value)
+        if "__libc_start_main" not in defined:
+            return None
+        symbols = {name: defined[name] for name in KEY_SYMBOLS if name in defined}
+        position = elf.data.find(b"/bin/sh\0")
+        bin_sh = elf.offset_to_vaddr(position) if position != -1 else None
+        if bin_sh is not None:
+            symbols[STR_BIN_SH] = bin_sh
+        banner = _BANNER.search(elf.data)
+        info = elf.file_info()
+        return LibcEntry(
+            sha256=file_sha256(file_path),
+            path=os.path.abspath(file_path),
+            build_id=info.build_id,
+            cpu_arch=info.cpu_arch,
+            version=banner.group().decode("latin-1").rstrip(".") if banner else None,
+            symbols=symbols,
+            one_gadgets=find_one_gadgets(elf, bin_sh),
+        )
+
+
+def iter_libc_files(paths: Iterable[str]) -> Iterator[str]:
+    """
+    경로(파일 또는 디렉토리)에서 이름에 "libc" 가 들어간 ELF 파일을 재귀적으로 찾습니다.
+    (libc-database 의 libc6_2.35-0ubuntu3_amd64.so, 배포판의 libc.so.6, libc-2.31.so 등)
+    """
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for dir_path, _, file_names in os.walk(path):
+            for name in sorted(file_names):
+                file_path = os.path.join(dir_path, name)
+                if "libc" in name and not os.path.islink(file_path) and is_elf(file_path):
+                    yield file_path
+
+
+class LibcDatabase:
+    """
+    오프라인 libc 식별 데이터베이스입니다.
+    등록된 libc 마다 JSON 한 줄(libcs.jsonl)을 저장하고, BuildID 와 (심볼, 하위 12비트 오프셋) 키로
+    레코드를 찾는 해시 색인(libcs.idx)을 mmap 하여 조회합니다. 조회는 색인의 슬롯 몇 개와
+    후보 레코드만 읽으므로 등록된 libc 수와 관계없이 1ms 이내에 끝납니다.
+
+    색인 형식 (리틀 엔디언):
+      "EPLC", 버전, 레코드 수 R, BuildID 슬롯 수, 심볼 슬롯 수, posting 수 (각 u32)
+      레코드 오프셋 u64[R]                         (libcs.jsonl 안의 바이트 오프셋)
+      BuildID 슬롯 (키 u64, 레코드 번호 + 1 u32)    (선형 탐사 해시 테이블)
+      심볼 슬롯 (키 u64, posting 시작 u32, 개수 u32)
+      posting u32[]                                  (키마다 레코드 번호 목록)
+
+    사용 예제:
+      db = LibcDatabase()
+      db.add(["/path/to/libc-database/db"])
+      entry = db.by_build_id("6196744a316dbd57c0fd8968df1680aac482cec4")
+      for entry in db.find({"puts": 0x7f1234577980, "system": 0x7f123454c490}):
+          print(entry.version, hex(entry.symbols["str_bin_sh"]), entry.one_gadgets)
+    """
+    def __init__(self, path: str = DEFAULT_DATABASE_DIR):
+        """
+        생성자
+
+        arguments:
+          path (str): 데이터베이스 디렉토리 (없으면 add() 할 때 생성)
+        """
+        self.path = path
+        self.records_path = os.path.join(path, RECORDS_FILE)
+        self.index_path = os.path.join(path, INDEX_FILE)
+        self._records = None
+        self._index = None
+        self._open()
+
+    def _open(self) -> None:
+        self.close()
+        if not os.path.isfile(self.index_path):
+            return
+        self._records = open(self.records_path, "rb")
+        with open(self.index_path, "rb") as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count, self._build_id_slots, self._symbol_slots, _ = _HEADER.unpack_from(self._index, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self.close()
+            raise ValueError(f"{self.index_path}: not a libc database index (or unsupported version)")
+        self._build_id_base = _HEADER.size + 8 * self._count
+        self._symbol_base = self._build_id_base + _BUILD_ID_SLOT.size * self._build_id_slots
+        self._postings_base = self._symbol_base + _SYMBOL_SLOT.size * self._symbol_slots
+
+    def close(self) -> None:
+        """
+        색인 mmap 과 레코드 파일을 닫습니다.
+        """
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        if self._records is not None:
+            self._records.close()
+            self._records = None
+
+    def __enter__(self) -> "LibcDatabase":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count if self._index is not None else 0
+
+    def _record(self, number: int) -> LibcEntry:
+        (offset,) = struct.unpack_from("<Q", self._index, _HEADER.size + 8 * number)
+        self._records.seek(offset)
+        return LibcEntry(**json.loads(self._records.readline()))
+
+    def by_build_id(self, build_id: str) -> Optional[LibcEntry]:
+        """
+        BuildID(16진수 문자열)로 libc 를 찾습니다. (없으면 None)
+        """
+        if self._index is None:
+            return None
+        build_id = build_id.lower()
+        key = _key(build_id)
+        mask = self._build_id_slots - 1
+        slot = key & mask
+        while True:
+            slot_key, number = _BUILD_ID_SLOT.unpack_from(self._index, self._build_id_base + _BUILD_ID_SLOT.size * slot)
+            if slot_key == 0:
+                return None
+            if slot_key == key:
+                entry = self._record(number - 1)
+                if entry.build_id == build_id:
+                    return entry
+            slot = (slot + 1) & mask
+
+    def _postings(self, key: int) -> Sequence[int]:
+        mask = self._symbol_slots - 1
+        slot = key & mask
+        while True:
+            slot_key, start, count = _SYMBOL_SLOT.unpack_from(self._index, self._symbol_base + _SYMBOL_SLOT.size * slot)
+            if slot_key == 0:
+                return ()
+            if slot_key == key:
+                return struct.unpack_from(f"<{count}I", self._index, self._postings_base + 4 * start)
+            slot = (slot + 1) & mask
+
+    def find(self, leaks: Dict[str, int]) -> List[LibcEntry]:
+        """
+        유출된 주소(또는 오프셋)의 하위 12비트가 모두 일치하는 libc 목록을 반환합니다.
+
+        arguments:
+          leaks (Dict[str, int]): 심볼 이름 -> 유출된 주소 (예: {"puts": 0x7f...980}, str_bin_sh 포함)
+
+        return:
+          List[LibcEntry]: 일치하는 libc 목록 (등록 순서)
+        """
+        if self._index is None or not leaks:
+            return []
+        postings = sorted((self._postings(_symbol_key(name, address)) for name, address in leaks.items()), key=len)
+        candidates = set(postings[0])
+        for numbers in postings[1:]:
+            candidates.intersection_update(numbers)
+            if not candidates:
+                return []
+        matches = []
+        for number in sorted(candidates):
+            entry = self._record(number)
+            # 해시 충돌로 들어온 후보를 걸러냅니다.
+            if all(name in entry.symbols and (entry.symbols[name] - address) & 0xfff == 0
+                   for name, address in leaks.items()):
+                matches.append(entry)
+        return matches
+
+    def match_file(self, file_path: str) -> Optional[LibcEntry]:
+        """
+        문제와 함께 받은 libc 파일의 BuildID 로 등록된 libc 를 찾습니다. (BuildID 가 없거나 등록되지 않았으면 None)
+        """
+        with ELFParser(file_path) as elf:
+            build_id = elf.build_id()
+        return self.by_build_id(build_id) if build_id else None
+
+    def entries(self) -> Iterator[LibcEntry]:
+        """
+        등록된 모든 libc 를 등록 순서대로 생성합니다.
+        """
+        for number in range(len(self)):
+            yield self._record(number)
+
+    def add(self, paths: Iterable[str]) -> List[LibcEntry]:
+        """
+        경로(파일 또는 디렉토리)에서 libc 를 찾아 등록하고 색인을 다시 만듭니다.
+        이미 등록된 파일(SHA-256 기준)은 건너뜁니다.
+
+        return:
+          List[LibcEntry]: 새로 등록한 libc 목록
+        """
+        os.makedirs(self.path, exist_ok=True)
+        known = {entry.sha256 for entry in self.entries()}
+        added = []
+        with open(self.records_path, "a") as f:
+            for file_path in iter_libc_files(paths):
+                try:
+                    entry = describe_libc(file_path)
+                except ELFParseError as e:
+                    print(f"[!] Skipping {file_path}: {e}", file=sys.stderr)
+                    continue
+                if entry is None or entry.sha256 in known:
+                    continue
+                known.add(entry.sha256)
+                f.write(json.dumps(asdict(entry)) + "\n")
+                added.append(entry)
+        self.rebuild_index()
+        return added
+
+    def rebuild_index(self) -> None:
+        """
+        libcs.jsonl 전체로 해시 색인을 다시 만듭니다.
+        """
+        offsets: List[int] = []
+        build_ids: List[Tuple[int, int]] = []
+        postings: Dict[int, List[int]] = {}
+        if os.path.isfile(self.records_path):
+            with open(self.records_path, "rb") as f:
+                offset = 0
+                for line in f:
+                    if line.strip():
+                        number = len(offsets)
+                        offsets.append(offset)
+                        data = json.loads(line)
+                        if data.get("build_id"):
+                            build_ids.append((_key(data["build_id"]), number))
+                        for name, value in data["symbols"].items():
+                            postings.setdefault(_symbol_key(name, value), []).append(number)
+                    offset += len(line)
+
+        build_id_slots = _table_size(len(build_ids))
+        build_id_table = bytearray(_BUILD_ID_SLOT.size * build_id_slots)
+        for key, number in build_ids:
+            slot = key & (build_id_slots - 1)
+            while _BUILD_ID_SLOT.unpack_from(build_id_table, _BUILD_ID_SLOT.size * slot)[0]:
+                slot = (slot + 1) & (build_id_slots - 1)
+            _BUILD_ID_SLOT.pack_into(build_id_table, _BUILD_ID_SLOT.size * slot, key, number + 1)
+
+        symbol_slots = _table_size(len(postings))
+        symbol_table = bytearray(_SYMBOL_SLOT.size * symbol_slots)
+        posting_items: List[int] = []
+        for key, numbers in postings.items():
+            slot = key & (symbol_slots - 1)
+            while _SYMBOL_SLOT.unpack_from(symbol_table, _SYMBOL_SLOT.size * slot)[0]:
+                slot = (slot + 1) & (symbol_slots - 1)
+            _SYMBOL_SLOT.pack_into(symbol_table, _SYMBOL_SLOT.size * slot, key, len(posting_items), len(numbers))
+            posting_items.extend(numbers)
+
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(offsets), build_id_slots, symbol_slots,
+                                 len(posting_items)))
+            f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+            f.write(build_id_table)
+            f.write(symbol_table)
+            f.write(struct.pack(f"<{len(posting_items)}I", *posting_items))
+        # 열려 있는 mmap 을 닫은 뒤 교체하고 다시 엽니다.
+        self.close()
+        os.replace(tmp_path, self.index_path)
+        self._open()
+
+
+def _format_entry(entry: LibcEntry) -> str:
+    lines = [f"{entry.version or 'unknown version'} ({entry.cpu_arch})",
+             f"  path: {entry.path}", f"  build_id: {entry.build_id}"]
+    for name, offset in entry.symbols.items():
+        lines.append(f"  {name}: {hex(offset)}")
+    if entry.one_gadgets:
+        lines.append(f"  one_gadget candidates: {', '.join(hex(offset) for offset in entry.one_gadgets)}")
+    return "\n".join(lines)
+
+
+def _leak(value: str) -> Tuple[str, int]:
+    name, _, address = value.partition("=")
+    if not name or not address:
+        raise argparse.ArgumentTypeError(f"expected name=address, got {value!r}")
+    return name, int(address, 0)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    사용 예제:
+      python -m elf_analyzer.libcdb add ~/libc-database/db /lib/x86_64-linux-gnu
+      python -m elf_analyzer.libcdb find puts=0x7f1234577980 system=0x7f123454c490
+      python -m elf_analyzer.libcdb buildid 6196744a316dbd57c0fd8968df1680aac482cec4
+      python -m elf_analyzer.libcdb match ./libc.so.6
+    """
+    parser = argparse.ArgumentParser(description="Offline libc identification database.")
+    parser.add_argument("--db", default=DEFAULT_DATABASE_DIR, help="Database directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Register every libc found in the given files / directories")
+    add.add_argument("paths", nargs="+")
+    find = commands.add_parser("find", help="Find libcs matching leaked addresses (low 12 bits)")
+    find.add_argument("leaks", nargs="+", type=_leak, help="name=address, e.g. puts=0x7f1234577980")
+    build_id = commands.add_parser("buildid", help="Look up a libc by GNU BuildID")
+    build_id.add_argument("build_id")
+    match = commands.add_parser("match", help="Look up the BuildID of a libc file")
+    match.add_argument("file")
+    args = parser.parse_args(argv)
+
+    with LibcDatabase(args.db) as db:
+        if args.command == "add":
+            added = db.add(args.paths)
+            print(f"[*] Added {len(added)} libc(s), {len(db)} in {args.db}")
+            return 0
+        if args.command == "find":
+            entries = db.find(dict(args.leaks))
+        else:
+            entry = db.by_build_id(args.build_id) if args.command == "buildid" else db.match_file(args.file)
+            entries = [entry] if entry else []
+        for entry in entries:
+            print(_format_entry(entry))
+        if not entries:
+            print("[!] No matching libc", file=sys.stderr)
+            return 1
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
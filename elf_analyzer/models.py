@@ -1,9 +1,6 @@
 # elf_analyzer/models.py
-from dataclasses import dataclass, field
-from typing import List, Optional
-
-from dataclasses import dataclass, field
-from typing import List, Optional
+from dataclasses import MISSING, asdict, dataclass, field, fields, is_dataclass
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple
 
 @dataclass
 class ChecksecInfo:
@@ -14,12 +11,20 @@ class ChecksecInfo:
       relro (str): RELRO 상태 (예: "Partial", "Full", "None", "Unknown", "Not found")
       stack_canary (Optional[bool]): Stack Canary 상태 (True, False 또는 None)
       nx (Optional[bool]): NX 상태 (True, False 또는 None)
-      pie (Optional[bool]): PIE 상태 (True, False 또는 None)
+      pie (Optional[bool]): PIE 상태 (True, False 또는 None, 공유 라이브러리는 False)
+      fortify (Optional[bool]): FORTIFY_SOURCE 적용 여부 (*_chk 함수 import 여부)
+      rpath (Optional[str]): DT_RPATH 값 (없으면 None)
+      runpath (Optional[str]): DT_RUNPATH 값 (없으면 None)
+      shared_object (bool): DF_1_PIE 가 없는 ET_DYN, 즉 공유 라이브러리(checksec 의 "DSO") 여부
     """
     relro: str
     stack_canary: Optional[bool]
     nx: Optional[bool]
     pie: Optional[bool]
+    fortify: Optional[bool] = None
+    rpath: Optional[str] = None
+    runpath: Optional[str] = None
+    shared_object: bool = False
 
 @dataclass
 class ELFFileInfo:
@@ -50,24 +55,246 @@ class ELFFileInfo:
     is_stripped: bool
 
 @dataclass
+class ExtractedString:
+    """
+    ELF 파일에서 추출한 문자열 하나를 저장하는 데이터 클래스입니다.
+
+    속성:
+      offset (int): 파일 내 오프셋
+      vaddr (Optional[int]): 로드되는 가상 주소 (매핑되지 않으면 None)
+      section (Optional[str]): 문자열이 속한 섹션 이름 (없으면 None)
+      encoding (str): 인코딩 ("ascii" 또는 "utf-16le")
+      value (str): 문자열 값
+    """
+    offset: int
+    vaddr: Optional[int]
+    section: Optional[str]
+    encoding: str
+    value: str
+
+@dataclass
+class Gadget:
+    """
+    내장 가젯 탐색기가 찾은 ROP / JOP / SYS 가젯 하나를 저장하는 데이터 클래스입니다.
+
+    속성:
+      address (int): 가젯 시작 가상 주소
+      instructions (str): " ; "로 구분한 명령어 문자열 (예: "pop rdi ; ret")
+      raw (bytes): 가젯의 기계어 바이트
+    """
+    address: int
+    instructions: str
+    raw: bytes
+
+@dataclass
+class ImportedFunction:
+    """
+    바이너리가 import 하는 함수 하나의 PLT / GOT 주소를 저장하는 데이터 클래스입니다.
+
+    속성:
+      name (str): 함수 이름
+      plt (Optional[int]): PLT 스텁 주소 (찾지 못하면 None)
+      got (Optional[int]): GOT 슬롯 주소 (찾지 못하면 None)
+    """
+    name: str
+    plt: Optional[int]
+    got: Optional[int]
+
+@dataclass
+class LibcEntry:
+    """
+    libc 데이터베이스에 등록된 libc 빌드 하나의 정보를 저장하는 데이터 클래스입니다.
+
+    속성:
+      sha256 (str): 파일의 SHA-256 (같은 파일을 두 번 등록하지 않는 데 사용)
+      path (str): 등록할 때의 파일 경로
+      build_id (Optional[str]): GNU BuildID (없으면 None)
+      cpu_arch (str): CPU 아키텍처 (예: "x86-64")
+      version (Optional[str]): "GNU C Library ... version 2.35" 배너 (찾지 못하면 None)
+      symbols (Dict[str, int]): 주요 심볼 이름 -> libc 기준 오프셋 (str_bin_sh 는 "/bin/sh" 문자열)
+      one_gadgets (List[int]): execve("/bin/sh", ...) 호출 직전의 one_gadget 후보 오프셋
+    """
+    sha256: str
+    path: str
+    build_id: Optional[str]
+    cpu_arch: str
+    version: Optional[str] = None
+    symbols: Dict[str, int] = field(default_factory=dict)
+    one_gadgets: List[int] = field(default_factory=list)
+
+@dataclass
+class ChildMetrics:
+    """
+    분석 단계가 실행한 자식 프로세스(또는 워커 프로세스 묶음)의 자원 사용량을 저장하는 데이터 클래스입니다.
+
+    속성:
+      command (str): 실행 파일 이름 (예: "analyzeHeadless", "ROPgadget", "gadget-workers")
+      wall_time (float): 경과 시간 (초)
+      cpu_time (float): user + sys CPU 시간 (초)
+      peak_rss_kb (int): 최대 RSS (KiB)
+      returncode (Optional[int]): 종료 코드 (워커 프로세스 묶음은 None)
+    """
+    command: str
+    wall_time: float
+    cpu_time: float
+    peak_rss_kb: int
+    returncode: Optional[int] = None
+
+@dataclass
+class StageMetrics:
+    """
+    분석 단계 하나의 실행 시간과 자원 사용량을 저장하는 데이터 클래스입니다.
+
+    속성:
+      stage (str): 단계 이름
+      wall_time (float): 경과 시간 (초, 단계 안에서 실행된 다른 단계의 시간 제외)
+      cpu_time (float): 단계를 실행한 스레드의 user + sys CPU 시간 (초, 단계 안에서 실행된 다른 단계의 시간 제외)
+      child_cpu_time (float): 자식 프로세스의 user + sys CPU 시간 합계 (초)
+      peak_rss_kb (int): 단계 종료 시점까지의 분석 프로세스 최대 RSS와 자식 프로세스 최대 RSS 중 큰 값 (KiB)
+      cached (bool): 캐시에서 복원되었는지 여부
+      children (List[ChildMetrics]): 자식 프로세스별 자원 사용량
+    """
+    stage: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    child_cpu_time: float = 0.0
+    peak_rss_kb: int = 0
+    cached: bool = False
+    children: List[ChildMetrics] = field(default_factory=list)
+
+# 생성된 __eq__ 와 dataclasses.asdict() 는 모든 필드를 읽어 평가되지 않은 단계를 실행하므로
+# eq=False 로 두고 평가된 필드만 비교합니다. 평가 전의 결과에는 asdict() 대신 to_dict()를 사용하세요.
+@dataclass(repr=False, eq=False)
 class ELFAnalysisResult:
     """
     ELF 파일 분석 결과를 저장하는 데이터 클래스입니다.
+    ELFAnalyzer가 만든 결과는 지연 평가됩니다. 아직 실행하지 않은 단계의 필드에 처음 접근하면
+    해당 단계(STAGE_FIELDS)를 실행하고, 그 값을 저장해 두었다가 다시 사용합니다.
     
     속성:
-      file_info_raw (str): file 명령어로부터 추출한 순수한 문자열
+      file_info_raw (str): ELF 헤더로부터 생성한 file 명령어 형식의 요약 문자열
       file_info (ELFFileInfo): ELF 파일의 기본 파일 정보를 저장하는 데이터 클래스
       checksec_info (ChecksecInfo): checksec 명령어를 통해 수집된 보안 관련 정보를 구조화된 데이터로 저장
       checksec_analysis (List[str]): checksec 정보를 기반으로 한 추가 분석 메시지 리스트
       strings_file (Optional[str]): ELF 파일에서 추출된 문자열이 저장된 파일 경로 (없으면 None)
       ropgadget_file (Optional[str]): ELF 파일에서 추출된 gadget 저장된 파일 경로 (없으면 None)
-      decompile_file (Optional[str]): ELF 파일의 디컴파일 파일이 저장된 파일 경로 (없으면 None)
+      gadget_store_file (Optional[str]): GadgetStore.load()로 열 수 있는 가젯 색인 파일 경로 (없으면 None)
+      symbols_file (Optional[str]): SymbolIndex.load()로 열 수 있는 심볼 / PLT / GOT 색인 파일 경로 (없으면 None)
+      dangerous_functions (List[ImportedFunction]): import 하는 위험 함수와 PLT / GOT 주소 목록
+      decompile_file (Optional[str]): ELF 파일의 디컴파일 색인(decompile.index.json) 경로 (없으면 None)
+      metrics (List[StageMetrics]): 실행한 단계별 소요 시간과 자원 사용량 (단계가 실행된 순서)
     """
-    file_info_raw: str
-    file_info: ELFFileInfo
-    checksec_info: ChecksecInfo
+    # 분석 단계별로 채워지는 필드 목록 (--only / --skip 에 사용하는 단계 이름)
+    STAGE_FIELDS: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "fileinfo": ("file_info_raw", "file_info"),
+        "checksec": ("checksec_info", "checksec_analysis"),
+        "symbols": ("symbols_file", "dangerous_functions"),
+        "strings": ("strings_file",),
+        "ropgadget": ("ropgadget_file", "gadget_store_file"),
+        "decompile": ("decompile_file",),
+    }
+
+    file_info_raw: Optional[str] = None
+    file_info: Optional[ELFFileInfo] = None
+    checksec_info: Optional[ChecksecInfo] = None
     checksec_analysis: List[str] = field(default_factory=list)
     strings_file: Optional[str] = None
     ropgadget_file: Optional[str] = None
+    gadget_store_file: Optional[str] = None
+    symbols_file: Optional[str] = None
+    dangerous_functions: List[ImportedFunction] = field(default_factory=list)
     decompile_file: Optional[str] = None
+    metrics: List[StageMetrics] = field(default_factory=list)
+
+    @classmethod
+    def pending(cls, resolver: Optional[Callable[[str], None]] = None) -> "ELFAnalysisResult":
+        """
+        모든 필드가 아직 평가되지 않은 결과를 만듭니다.
+        평가되지 않은 필드에 접근하면 resolver(단계 이름)를 호출하며, resolver는 해당 단계의 필드를 채워야 합니다.
+        resolver가 없으면 평가되지 않은 필드는 기본값(None 또는 빈 리스트)을 반환합니다.
+        """
+        result = cls.__new__(cls)
+        result.__dict__["_resolver"] = resolver
+        result.__dict__["metrics"] = []
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        # 인스턴스에 값이 없는 필드에 처음 접근할 때만 호출됩니다.
+        stage = _FIELD_STAGES.get(name)
+        if stage is None:
+            raise AttributeError(name)
+        resolver = self.__dict__.get("_resolver")
+        if resolver is not None:
+            resolver(stage)
+        if name not in self.__dict__:
+            return _FIELD_DEFAULTS[name]()
+        return self.__dict__[name]
+
+    def evaluated(self, stage: str) -> bool:
+        """
+        단계의 필드가 모두 평가되었는지 여부를 반환합니다. (단계를 실행하지 않습니다.)
+        """
+        return all(name in self.__dict__ for name in self.STAGE_FIELDS[stage])
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{f.name}={self.__dict__[f.name]!r}" for f in fields(self) if f.name in self.__dict__)
+        return f"{type(self).__name__}({values})"
+
+    def __eq__(self, other: Any) -> bool:
+        # 평가된 필드만 비교하므로 비교가 단계를 실행하지 않습니다.
+        if not isinstance(other, ELFAnalysisResult):
+            return NotImplemented
+        names = [f.name for f in fields(self)]
+        return ([(name, self.__dict__.get(name, MISSING)) for name in names]
+                == [(name, other.__dict__.get(name, MISSING)) for name in names])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON으로 직렬화할 수 있는 dict로 변환합니다.
+        아직 평가되지 않은 단계의 필드는 포함하지 않으므로, 이 메서드가 단계를 실행하지는 않습니다.
+        """
+        data = {}
+        for f in fields(self):
+            if f.name in self.__dict__:
+                value = self.__dict__[f.name]
+                if is_dataclass(value):
+                    value = asdict(value)
+                elif isinstance(value, list):
+                    value = [asdict(item) if is_dataclass(item) else item for item in value]
+                data[f.name] = value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ELFAnalysisResult":
+        """
+        to_dict()로 만든 dict로부터 ELFAnalysisResult를 복원합니다.
+        dict에 없는 필드는 평가되지 않은 상태로 남습니다.
+        """
+        data = dict(data)
+        if data.get("file_info") is not None:
+            data["file_info"] = ELFFileInfo(**data["file_info"])
+        if data.get("checksec_info") is not None:
+            data["checksec_info"] = ChecksecInfo(**data["checksec_info"])
+        if data.get("dangerous_functions") is not None:
+            data["dangerous_functions"] = [ImportedFunction(**item) for item in data["dangerous_functions"]]
+        if data.get("metrics") is not None:
+            data["metrics"] = [
+                StageMetrics(**dict(item, children=[ChildMetrics(**child) for child in item.get("children", [])]))
+                for item in data["metrics"]
+            ]
+        result = cls.pending()
+        names = {f.name for f in fields(cls)}
+        result.__dict__.update((name, value) for name, value in data.items() if name in names)
+        return result
+
 
+_FIELD_STAGES = {name: stage for stage, names in ELFAnalysisResult.STAGE_FIELDS.items() for name in names}
+_FIELD_DEFAULTS = {
+    f.name: (f.default_factory if f.default_factory is not MISSING else (lambda value=f.default: value))
+    for f in fields(ELFAnalysisResult)
+}
+# dataclass가 만든 클래스 속성(기본값)이 남아 있으면 __getattr__ 가 호출되지 않으므로 제거합니다.
+# (기본값은 생성자의 기본 인자에 이미 반영되어 있습니다.)
+for _name in _FIELD_STAGES:
+    if _name in ELFAnalysisResult.__dict__:
+        delattr(ELFAnalysisResult, _name)
@@ -1,46 +1,116 @@
 # elf_analyzer/printer.py
-from typing import List
+from typing import Iterable, List, Optional
+from .analyzer import dangerous_function_names
+from .decompile_index import DecompileIndex
 from .models import ELFAnalysisResult
 
-def print_analysis_result(result: ELFAnalysisResult):
+def print_analysis_result(result: ELFAnalysisResult, stages: Optional[Iterable[str]] = None):
     """
     ELF 분석 결과를 출력합니다.
+    이미 평가된 단계만 출력하며, 출력 때문에 새로운 단계를 실행하지는 않습니다.
 
     arguments:
       result (ELFAnalysisResult): ELF 파일 분석 결과 데이터 클래스 인스턴스
+      stages (Optional[Iterable[str]]): 출력할 단계 목록 (None이면 평가된 모든 단계)
     """
+    selected = set(stages) if stages is not None else set(ELFAnalysisResult.STAGE_FIELDS)
+
+    def shown(stage: str) -> bool:
+        return stage in selected and result.evaluated(stage)
+
     RED = "\033[91m"
     BLUE = "\033[94m"
     GREEN = "\033[92m"
     RESET = "\033[0m"
-    print(f"{RED}[File Information Raw]{RESET}")
-    print(result.file_info_raw)
-    print()
-    print(f"{BLUE}[Parsed File Information]{RESET}")
-    print(f"Bit Format: {result.file_info.bit_format}")
-    print(f"Endian: {result.file_info.endian}")
-    print(f"PIE: {result.file_info.is_pie}")
-    print(f"CPU Architecture: {result.file_info.cpu_arch}")
-    print(f"Version: {result.file_info.version}")
-    print(f"Linking: {result.file_info.linking}")
-    print(f"Interpreter: {result.file_info.interpreter}")
-    print(f"Build ID: {result.file_info.build_id}")
-    print(f"Target OS: {result.file_info.target_os}")
-    print(f"Is Stripped: {result.file_info.is_stripped}")
-    print()
-    print(f"{GREEN}[checksec Information]{RESET}")
-    print(f"RELRO: {result.checksec_info.relro}")
-    print(f"Stack Canary: {result.checksec_info.stack_canary}")
-    print(f"NX: {result.checksec_info.nx}")
-    print(f"PIE: {result.checksec_info.pie}")
-    print()
-    print(f"{GREEN}[checksec Analysis]{RESET}")
-    for msg in result.checksec_analysis:
-        print(msg)
-    print()
-    if result.strings_file:
+    if shown("fileinfo"):
+        print(f"{RED}[File Information Raw]{RESET}")
+        print(result.file_info_raw)
+        print()
+        print(f"{BLUE}[Parsed File Information]{RESET}")
+        print(f"Bit Format: {result.file_info.bit_format}")
+        print(f"Endian: {result.file_info.endian}")
+        print(f"PIE: {result.file_info.is_pie}")
+        print(f"CPU Architecture: {result.file_info.cpu_arch}")
+        print(f"Version: {result.file_info.version}")
+        print(f"Linking: {result.file_info.linking}")
+        print(f"Interpreter: {result.file_info.interpreter}")
+        print(f"Build ID: {result.file_info.build_id}")
+        print(f"Target OS: {result.file_info.target_os}")
+        print(f"Is Stripped: {result.file_info.is_stripped}")
+        print()
+    if shown("checksec"):
+        print(f"{GREEN}[checksec Information]{RESET}")
+        print(f"RELRO: {result.checksec_info.relro}")
+        print(f"Stack Canary: {result.checksec_info.stack_canary}")
+        print(f"NX: {result.checksec_info.nx}")
+        print(f"PIE: {'DSO' if result.checksec_info.shared_object else result.checksec_info.pie}")
+        print(f"FORTIFY: {result.checksec_info.fortify}")
+        print(f"RPATH: {result.checksec_info.rpath}")
+        print(f"RUNPATH: {result.checksec_info.runpath}")
+        print()
+        print(f"{GREEN}[checksec Analysis]{RESET}")
+        for msg in result.checksec_analysis:
+            print(msg)
+        print()
+    if shown("symbols"):
+        print(f"{RED}[Dangerous Functions]{RESET}")
+        for function in result.dangerous_functions:
+            plt = hex(function.plt) if function.plt is not None else "-"
+            got = hex(function.got) if function.got is not None else "-"
+            print(f"{function.name}: PLT {plt}, GOT {got}")
+        if not result.dangerous_functions:
+            print("None")
+        print()
+    if shown("strings") and result.strings_file:
         print(f"Strings saved to: {result.strings_file}")
-    if result.ropgadget_file:
+    if shown("ropgadget") and result.ropgadget_file:
         print(f"RopGadget saved to: {result.ropgadget_file}")
+    if shown("symbols") and result.symbols_file:
+        print(f"Symbol index saved to: {result.symbols_file}")
+    if shown("ropgadget") and result.gadget_store_file:
+        print(f"Gadget store saved to: {result.gadget_store_file}")
+    if shown("decompile") and result.decompile_file:
+        print(f"Decompile index saved to: {result.decompile_file}")
+        print_decompile_diff(result.decompile_file)
+        print_sink_paths(result.decompile_file)
     print()
 
+
+def print_decompile_diff(index_path: str, limit: int = 20):
+    """
+    디컴파일 결과가 이전 버전과 비교된 경우 바뀐 / 추가된 / 사라진 함수 목록을 출력합니다.
+
+    arguments:
+      index_path (str): decompile.index.json 경로
+      limit (int): 종류별로 출력할 최대 함수 이름 수
+    """
+    diff = DecompileIndex(index_path).diff
+    if not diff:
+        return
+    print(f"Compared with: {diff['previous']} ({diff['reused']} function(s) reused)")
+    for label in ("changed", "added", "removed"):
+        names = diff[label]
+        more = f" ... (+{len(names) - limit})" if len(names) > limit else ""
+        print(f"  {label.capitalize()} ({len(names)}): {', '.join(names[:limit])}{more}")
+
+
+def print_sink_paths(index_path: str, root: str = "main", sinks: Optional[Iterable[str]] = None):
+    """
+    디컴파일과 함께 저장된 호출 그래프에서 root 부터 위험 함수까지의 가장 짧은 호출 경로를 출력합니다.
+
+    arguments:
+      index_path (str): decompile.index.json 경로
+      root (str): 시작 함수 이름
+      sinks (Optional[Iterable[str]]): 찾을 위험 함수 목록 (None이면 symbols 단계와 같은 config.ini 의 목록)
+    """
+    graph = DecompileIndex(index_path).callgraph()
+    if graph is None or not graph.nodes(root):
+        return
+    RED = "\033[91m"
+    RESET = "\033[0m"
+    print(f"{RED}[Reachable Dangerous Functions]{RESET}")
+    paths = graph.sink_paths(dangerous_function_names() if sinks is None else sinks, root=root)
+    for sink, path in paths.items():
+        print(f"{sink}: {' -> '.join(path)}")
+    if not paths:
+        print("None")
@@ -0,0 +1,254 @@
+# elf_analyzer/profiling.py
+import json
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from typing import Any, Dict, Generator, Iterator, List, Optional, Sequence, Tuple
+from .models import ChildMetrics, StageMetrics
+
+# 스레드별 CPU 시간을 측정합니다. (RUSAGE_THREAD 가 없는 플랫폼에서는 프로세스 전체)
+_RUSAGE_THREAD = getattr(resource, "RUSAGE_THREAD", resource.RUSAGE_SELF)
+PROMETHEUS_PREFIX = "easy_pwntools"
+
+_local = threading.local()
+
+
+def _stack() -> List[Tuple[StageMetrics, List[float]]]:
+    """
+    현재 스레드에서 측정 중인 (단계 측정값, [안쪽 단계의 경과 시간, CPU 시간]) 스택을 반환합니다.
+    """
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def _cpu_seconds(usage) -> float:
+    return usage.ru_utime + usage.ru_stime
+
+
+def _pop_frame(frame: Tuple[StageMetrics, List[float]]) -> Optional[Tuple[StageMetrics, List[float]]]:
+    """
+    스택에서 frame 을 (맨 위가 아니어도) 찾아 제거하고, 그 바로 아래의 바깥 단계를 반환합니다.
+    생성기처럼 단계가 들어간 순서와 다르게 끝나더라도 다른 단계의 측정값을 잘못 꺼내지 않습니다.
+    """
+    stack = _stack()
+    for index in range(len(stack) - 1, -1, -1):
+        if stack[index] is frame:
+            del stack[index]
+            return stack[index - 1] if index else None
+    return None
+
+
+@contextmanager
+def _measure(metrics: StageMetrics) -> Iterator[None]:
+    """
+    with 블록의 경과 시간과 CPU 시간에서 안쪽 단계의 시간을 뺀 값을 metrics 에 더합니다.
+    바깥 단계는 이 블록의 전체 시간을 자신의 시간에서 뺍니다.
+    """
+    frame = (metrics, [0.0, 0.0])
+    start = time.perf_counter()
+    thread_start = resource.getrusage(_RUSAGE_THREAD)
+    _stack().append(frame)
+    try:
+        yield
+    finally:
+        wall_time = time.perf_counter() - start
+        cpu_time = _cpu_seconds(resource.getrusage(_RUSAGE_THREAD)) - _cpu_seconds(thread_start)
+        outer = _pop_frame(frame)
+        metrics.wall_time += max(wall_time - frame[1][0], 0.0)
+        metrics.cpu_time += max(cpu_time - frame[1][1], 0.0)
+        if outer is not None:
+            outer[1][0] += wall_time
+            outer[1][1] += cpu_time
+
+
+def _finish(metrics: StageMetrics) -> None:
+    metrics.child_cpu_time = sum(child.cpu_time for child in metrics.children)
+    # ru_maxrss 는 Linux에서 KiB 단위입니다.
+    metrics.peak_rss_kb = max([resource.getrusage(resource.RUSAGE_SELF).ru_maxrss]
+                              + [child.peak_rss_kb for child in metrics.children])
+
+
+@contextmanager
+def measure_stage(stage: str) -> Iterator[StageMetrics]:
+    """
+    with 블록을 하나의 분석 단계로 측정합니다.
+    블록 안에서 run_child() / record_child() 로 기록한 자식 프로세스는 이 단계에 포함됩니다.
+    단계 안에서 다른 단계를 실행하면 (예: 캐시 키 계산을 위한 fileinfo) 각각 따로 측정하고,
+    단계별 값을 더한 합계가 실제 실행 시간을 넘지 않도록 바깥 단계의 시간에서 안쪽 단계의 시간을 뺍니다.
+    생성기 안에서 yield 를 사이에 두고 측정하려면 measure_generator() 를 사용해야 합니다.
+
+    사용 예제:
+      with measure_stage("strings") as metrics:
+          ...
+      print(metrics.wall_time, metrics.cpu_time)
+    """
+    metrics = StageMetrics(stage=stage)
+    try:
+        with _measure(metrics):
+            yield metrics
+    finally:
+        _finish(metrics)
+
+
+def measure_generator(metrics: StageMetrics, generator: Generator[Any, None, Any]) -> Generator[Any, None, Any]:
+    """
+    생성기가 실행되는 구간(next 호출)만 metrics 의 단계로 측정하며 생성기의 값과 반환값을 그대로 전달합니다.
+    생성기가 멈춰 있는 동안 소비자가 실행한 단계는 이 단계 안쪽으로 취급하지 않습니다.
+    끝까지 소비하지 않고 닫아도 생성기를 닫는 데 걸린 시간(자식 프로세스 종료 등)까지 측정을 마칩니다.
+
+    사용 예제:
+      metrics = StageMetrics(stage="decompile")
+      for record in measure_generator(metrics, stream_decompile(["./chall"])):
+          ...
+      print(metrics.wall_time, metrics.child_cpu_time)
+    """
+    try:
+        while True:
+            with _measure(metrics):
+                try:
+                    item = next(generator)
+                except StopIteration as stop:
+                    return stop.value
+            yield item
+    finally:
+        with _measure(metrics):
+            generator.close()
+        _finish(metrics)
+
+
+def record_child(child: ChildMetrics) -> None:
+    """
+    현재 스레드에서 측정 중인 단계에 자식 프로세스의 자원 사용량을 추가합니다. (측정 중이 아니면 무시)
+    """
+    stack = _stack()
+    if stack:
+        stack[-1][0].children.append(child)
+
+
+def run_child(command: Sequence[str], **popen_kwargs) -> ChildMetrics:
+    """
+    자식 프로세스를 실행하고 os.wait4()로 종료를 기다려 그 프로세스만의 CPU 시간과 최대 RSS를 기록합니다.
+    stdout / stderr 를 PIPE 로 지정하면 교착될 수 있으므로 파일 또는 DEVNULL 을 사용해야 합니다.
+
+    arguments:
+      command (Sequence[str]): 실행할 명령어
+      popen_kwargs: subprocess.Popen 에 전달할 인자 (stdout, stderr, cwd 등)
+
+    return:
+      ChildMetrics: 자식 프로세스의 자원 사용량 (returncode 포함)
+    """
+    import subprocess
+    start = time.perf_counter()
+    process = subprocess.Popen(list(command), **popen_kwargs)
+    try:
+        return wait_child(process, start)
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+
+
+def wait_child(process, start: float, block: bool = True) -> Optional[ChildMetrics]:
+    """
+    subprocess.Popen 으로 시작한 자식 프로세스를 os.wait4()로 기다려 자원 사용량을 기록합니다.
+    (process.poll() / wait() 로 먼저 회수하면 rusage 를 얻을 수 없으므로 이 함수로만 회수해야 합니다.)
+
+    arguments:
+      process (subprocess.Popen): 자식 프로세스 (args 와 returncode 가 사용/갱신됨)
+      start (float): 프로세스를 시작한 time.perf_counter() 값
+      block (bool): False 이면 아직 실행 중일 때 기다리지 않고 None 을 반환
+
+    return:
+      Optional[ChildMetrics]: 자식 프로세스의 자원 사용량 (returncode 포함)
+    """
+    pid, status, usage = os.wait4(process.pid, 0 if block else os.WNOHANG)
+    if pid == 0:
+        return None
+    process.returncode = os.waitstatus_to_exitcode(status)
+    child = ChildMetrics(
+        command=os.path.basename(process.args[0]),
+        wall_time=time.perf_counter() - start,
+        cpu_time=_cpu_seconds(usage),
+        peak_rss_kb=usage.ru_maxrss,
+        returncode=process.returncode,
+    )
+    record_child(child)
+    return child
+
+
+def metrics_to_json(entries: Sequence[Tuple[str, List[StageMetrics]]]) -> str:
+    """
+    (바이너리 경로, 단계별 측정값) 목록을 JSON 문자열로 변환합니다.
+    """
+    return json.dumps([
+        {"binary": binary, "stages": [asdict(metrics) for metrics in stage_metrics]}
+        for binary, stage_metrics in entries
+    ], indent=2)
+
+
+def _labels(values: Dict[str, str]) -> str:
+    """
+    Prometheus 라벨 문자열을 만듭니다. (역슬래시, 큰따옴표, 줄바꿈 이스케이프)
+    """
+    escaped = []
+    for key, value in values.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{key}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def metrics_to_prometheus(entries: Sequence[Tuple[str, List[StageMetrics]]]) -> str:
+    """
+    (바이너리 경로, 단계별 측정값) 목록을 Prometheus textfile collector 형식으로 변환합니다.
+    단계 지표에는 binary / stage / cached 라벨을, 자식 프로세스 지표에는 binary / stage / command 라벨을 붙입니다.
+    """
+    stage_metrics = [
+        ("stage_wall_seconds", "Wall-clock time of an analysis stage", lambda m: m.wall_time),
+        ("stage_cpu_seconds", "CPU time of the thread that ran an analysis stage", lambda m: m.cpu_time),
+        ("stage_child_cpu_seconds", "CPU time of child processes started by an analysis stage", lambda m: m.child_cpu_time),
+        ("stage_peak_rss_bytes", "Peak resident set size observed during an analysis stage", lambda m: m.peak_rss_kb * 1024),
+    ]
+    child_metrics = [
+        ("child_wall_seconds", "Wall-clock time of a child process", lambda c: c.wall_time),
+        ("child_cpu_seconds", "CPU time of a child process", lambda c: c.cpu_time),
+        ("child_peak_rss_bytes", "Peak resident set size of a child process", lambda c: c.peak_rss_kb * 1024),
+    ]
+    lines = []
+    for name, help_text, value in stage_metrics:
+        lines += [f"# HELP {PROMETHEUS_PREFIX}_{name} {help_text}", f"# TYPE {PROMETHEUS_PREFIX}_{name} gauge"]
+        for binary, metrics_list in entries:
+            for metrics in metrics_list:
+                labels = _labels({"binary": binary, "stage": metrics.stage, "cached": str(metrics.cached).lower()})
+                lines.append(f"{PROMETHEUS_PREFIX}_{name}{labels} {value(metrics)}")
+    for name, help_text, value in child_metrics:
+        lines += [f"# HELP {PROMETHEUS_PREFIX}_{name} {help_text}", f"# TYPE {PROMETHEUS_PREFIX}_{name} gauge"]
+        for binary, metrics_list in entries:
+            for metrics in metrics_list:
+                for child in metrics.children:
+                    labels = _labels({"binary": binary, "stage": metrics.stage, "command": child.command})
+                    lines.append(f"{PROMETHEUS_PREFIX}_{name}{labels} {value(child)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(entries: Sequence[Tuple[str, List[StageMetrics]]], json_path: Optional[str] = None,
+                  prometheus_path: Optional[str] = None) -> None:
+    """
+    측정값을 JSON 파일 또는 Prometheus textfile 로 저장합니다.
+    node_exporter 가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+
+    arguments:
+      entries (Sequence[Tuple[str, List[StageMetrics]]]): (바이너리 경로, 단계별 측정값) 목록
+      json_path (Optional[str]): JSON 파일 경로 (None이면 저장하지 않음)
+      prometheus_path (Optional[str]): Prometheus textfile(.prom) 경로 (None이면 저장하지 않음)
+    """
+    for path, render in ((json_path, metrics_to_json), (prometheus_path, metrics_to_prometheus)):
+        if not path:
+            continue
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(render(entries))
+        os.replace(tmp_path, path)
@@ -0,0 +1,564 @@
+# elf_analyzer/service.py
+"""
+분석 요청을 받는 로컬 서비스입니다. (localhost HTTP 또는 Unix 소켓)
+미리 띄워 둔 워커 프로세스 풀에서 ELFAnalyzer 단계를 실행하므로, 요청마다 Python 시작과
+설정 적재 비용이 들지 않습니다. decompile 단계는 계속 띄워 둔 Ghidra JVM(DecompileWorker)에서 실행합니다.
+
+API (요청 / 응답 본문은 JSON):
+  POST /jobs                  {"path": "/abs/chall", "stages": ["checksec", ...]} 로 작업 등록
+                              (Content-Type: application/octet-stream 이면 본문을 바이너리로 업로드,
+                               ?name=chall&stages=checksec,strings 로 표시 이름과 단계 지정)
+                              -> 202 {"id", "status", ...}, 대기열이 가득 차면 503 + Retry-After
+  GET  /jobs                  작업 목록
+  GET  /jobs/<id>?wait=30     작업 상태와 결과 (wait 초 동안 끝나기를 기다림)
+  GET  /jobs/<id>/events      상태가 바뀔 때마다 JSON 한 줄씩 스트리밍 (끝나면 연결 종료)
+  GET  /health                워커 수, 대기 / 실행 중인 작업 수
+
+사용 예제:
+  python -m elf_analyzer.service --port 8765 --jobs 4
+  curl -s -XPOST localhost:8765/jobs -d '{"path": "/abs/path/chall"}'
+  curl -s -XPOST 'localhost:8765/jobs?name=chall' -H 'Content-Type: application/octet-stream' --data-binary @chall
+  curl -s 'localhost:8765/jobs/<id>?wait=60'
+  python -m elf_analyzer.service --socket /tmp/easy-pwntools.sock
+  curl -s --unix-socket /tmp/easy-pwntools.sock localhost/health
+"""
+import argparse
+import hashlib
+import json
+import os
+import queue
+import socketserver
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .analyzer import DEFAULT_STAGES, STAGES, ELFAnalyzer, absolute_artifact_paths
+from .cache import DEFAULT_CACHE_DIR, AnalysisCache, file_sha256
+from .elf_parser import is_elf
+
+DEFAULT_PORT = 8765
+DEFAULT_UPLOAD_DIR = "uploads"
+DEFAULT_MAX_PENDING = 64
+DEFAULT_MAX_UPLOAD_MB = 256
+# 메모리에 남겨 둘 끝난 작업 수 (넘으면 오래된 작업부터 제거)
+DEFAULT_KEEP_FINISHED = 1000
+# /events 스트림에서 상태 변화가 없을 때 현재 상태를 다시 보내는 간격 (초)
+EVENT_HEARTBEAT = 15.0
+MAX_WAIT = 300.0
+
+QUEUED = "queued"
+RUNNING = "running"
+DECOMPILING = "decompiling"
+DONE = "done"
+ERROR = "error"
+FINISHED_STATES = (DONE, ERROR)
+
+# 워커 프로세스마다 한 번 만들어 재사용하는 캐시
+_worker_cache: Optional[AnalysisCache] = None
+
+
+def _init_worker(cache_dir: Optional[str]) -> None:
+    """
+    워커 프로세스를 시작할 때 캐시를 열고, 첫 요청에서 불러올 모듈(capstone 등)을 미리 불러옵니다.
+    """
+    global _worker_cache
+    _worker_cache = AnalysisCache(cache_dir) if cache_dir else None
+    from .gadgets import _load_capstone
+    _load_capstone()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _analyze(path: str, stages: Tuple[str, ...], strings_min_length: int) -> Tuple[str, Dict]:
+    """
+    워커 프로세스에서 바이너리 하나를 분석합니다.
+
+    return:
+      Tuple[str, Dict]: (캐시 키 또는 SHA-256, 직렬화된 ELFAnalysisResult)
+    """
+    # 서비스 자체가 프로세스 풀이므로 가젯 탐색은 워커 안에서 순차로 실행합니다.
+    analyzer = ELFAnalyzer(path, strings_min_length=strings_min_length, cache=_worker_cache, gadget_jobs=1)
+    result = analyzer.analyze(stages=stages)
+    return analyzer.cache_key or file_sha256(path), absolute_artifact_paths(result.to_dict())
+
+
+class ServiceBusy(Exception):
+    """
+    대기열이 가득 차서 작업을 받을 수 없을 때 발생합니다.
+    """
+
+
+class AnalysisJob:
+    """
+    서비스에 등록된 분석 작업 하나의 상태입니다. (상태 변경은 AnalysisService 의 잠금 안에서만 합니다.)
+    """
+    def __init__(self, path: str, stages: Tuple[str, ...], name: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.path = path
+        self.name = name or os.path.basename(path)
+        self.stages = stages
+        self.status = QUEUED
+        self.sha256: Optional[str] = None
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.submitted = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        # 상태가 바뀔 때마다 증가하며, /events 스트림이 변화를 감지하는 데 사용합니다.
+        self.version = 0
+
+    @property
+    def finished_state(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "id": self.id, "name": self.name, "path": self.path, "stages": list(self.stages), "status": self.status,
+            "sha256": self.sha256, "submitted": self.submitted, "started": self.started, "finished": self.finished,
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        if include_result and self.result is not None:
+            data["result"] = self.result
+        return data
+
+
+class AnalysisService:
+    """
+    대기열(최대 max_pending 개)과 동시 실행 제한(jobs 개)을 가진 분석 작업 관리자입니다.
+    jobs 개의 디스패처 스레드가 대기열에서 작업을 꺼내 미리 띄워 둔 워커 프로세스 풀에서 분석하고,
+    decompile 단계가 있는 작업은 DecompileWorker(Ghidra JVM 하나)를 가진 스레드가 차례로 처리합니다.
+
+    사용 예제:
+      service = AnalysisService(jobs=4)
+      job = service.submit("/abs/chall", ("checksec", "strings"))
+      service.wait(job, timeout=60)
+      print(job.to_dict())
+      service.close()
+    """
+    def __init__(self, jobs: Optional[int] = None, max_pending: int = DEFAULT_MAX_PENDING,
+                 strings_min_length: int = 4, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 upload_dir: str = DEFAULT_UPLOAD_DIR, keep_finished: int = DEFAULT_KEEP_FINISHED):
+        """
+        생성자
+
+        arguments:
+          jobs (Optional[int]): 동시에 분석할 작업 수 = 워커 프로세스 수 (None이면 CPU 수)
+          max_pending (int): 실행을 기다릴 수 있는 최대 작업 수 (넘으면 submit 이 ServiceBusy 발생)
+          strings_min_length (int): 추출할 문자열의 최소 길이
+          cache_dir (Optional[str]): 분석 결과 캐시 디렉토리 (None이면 캐시를 사용하지 않음)
+          upload_dir (str): 업로드한 바이너리를 저장할 디렉토리
+          keep_finished (int): 메모리에 남겨 둘 끝난 작업 수
+        """
+        self.jobs = jobs or os.cpu_count() or 1
+        self.strings_min_length = strings_min_length
+        self.upload_dir = upload_dir
+        self.keep_finished = keep_finished
+        self._changed = threading.Condition()
+        self._jobs: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+        self._pending: "queue.Queue[AnalysisJob]" = queue.Queue(maxsize=max_pending)
+        self._decompile_pending: "queue.Queue[Optional[AnalysisJob]]" = queue.Queue()
+        self.cache_dir = cache_dir
+        self._executor_lock = threading.Lock()
+        self._executor = self._start_executor()
+        self._closed = False
+        self._dispatchers = [threading.Thread(target=self._dispatch, name=f"analysis-{index}", daemon=True)
+                             for index in range(self.jobs)]
+        for thread in self._dispatchers:
+            thread.start()
+        self._decompiler = None
+
+    def _start_executor(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker, initargs=(self.cache_dir,))
+        # 첫 요청이 워커 시작 비용을 내지 않도록 워커 프로세스를 모두 띄워 둡니다.
+        for future in [executor.submit(_ping) for _ in range(self.jobs)]:
+            future.result()
+        return executor
+
+    def _replace_executor(self, broken: ProcessPoolExecutor) -> None:
+        """
+        워커 프로세스가 비정상 종료(segfault, OOM kill 등)하여 깨진 프로세스 풀을 새 풀로 바꿉니다.
+        여러 디스패처가 같은 풀의 고장을 보더라도 한 번만 바꿉니다.
+        """
+        with self._executor_lock:
+            if self._executor is broken:
+                broken.shutdown(wait=False)
+                self._executor = self._start_executor()
+
+    def _run_analysis(self, job: AnalysisJob, stages: Tuple[str, ...]) -> Tuple[str, Dict]:
+        """
+        워커 프로세스 풀에서 분석을 실행합니다.
+        이미 깨진 풀에는 작업이 들어가지 않았으므로 풀을 바꾼 뒤 다시 넣고,
+        실행 중에 풀이 깨지면 풀을 바꾼 뒤 BrokenProcessPool 을 그대로 발생시킵니다.
+        """
+        while True:
+            with self._executor_lock:
+                executor = self._executor
+            try:
+                future = executor.submit(_analyze, job.path, stages, self.strings_min_length)
+            except BrokenProcessPool:
+                self._replace_executor(executor)
+                continue
+            try:
+                return future.result()
+            except BrokenProcessPool:
+                self._replace_executor(executor)
+                raise
+
+    def _update(self, job: AnalysisJob, **values) -> None:
+        with self._changed:
+            for name, value in values.items():
+                setattr(job, name, value)
+            job.version += 1
+            self._changed.notify_all()
+
+    def submit(self, path: str, stages: Sequence[str] = DEFAULT_STAGES, name: Optional[str] = None) -> AnalysisJob:
+        """
+        분석 작업을 대기열에 넣습니다.
+
+        예외:
+          ValueError: 경로나 단계 목록의 형식이 잘못되었거나, 파일이 없거나 ELF 파일이 아니거나, 알 수 없는 단계인 경우
+          ServiceBusy: 대기열이 가득 찬 경우
+        """
+        # JSON 요청 본문을 그대로 넘겨받으므로 타입부터 확인합니다.
+        if not isinstance(path, str):
+            raise ValueError("path must be a string")
+        if isinstance(stages, str):
+            stages = [stages]
+        if not isinstance(stages, (list, tuple)) or not all(isinstance(stage, str) for stage in stages):
+            raise ValueError("stages must be a list of stage names")
+        unknown = sorted(set(stages) - set(STAGES))
+        if unknown:
+            raise ValueError(f"Unknown analysis stage: {', '.join(unknown)} (available: {', '.join(STAGES)})")
+        stages = tuple(stage for stage in STAGES if stage in stages)
+        if not stages:
+            raise ValueError("No analysis stage requested")
+        if not os.path.isfile(path) or not is_elf(path):
+            raise ValueError(f"Not an ELF file: {path}")
+        job = AnalysisJob(os.path.abspath(path), stages, name)
+        with self._changed:
+            if self._closed:
+                raise ServiceBusy("service is shutting down")
+            try:
+                self._pending.put_nowait(job)
+            except queue.Full:
+                raise ServiceBusy(f"{self._pending.maxsize} job(s) already waiting")
+            self._jobs[job.id] = job
+            self._evict_finished()
+        return job
+
+    def submit_upload(self, data: bytes, name: Optional[str] = None,
+                      stages: Sequence[str] = DEFAULT_STAGES) -> AnalysisJob:
+        """
+        업로드한 바이너리를 upload_dir/<sha256> 에 저장한 뒤 분석 작업을 등록합니다.
+        클라이언트가 보낸 이름은 작업의 표시 이름으로만 사용하므로, 이름이 같은 다른 업로드와
+        파일이나 산출물(logs/<sha256>-.../)이 섞이지 않습니다.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.upload_dir, digest)
+        if not os.path.isfile(path):
+            os.makedirs(self.upload_dir, exist_ok=True)
+            temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        return self.submit(path, stages, name=os.path.basename(name or "") or None)
+
+    def _evict_finished(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished_state]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        with self._changed:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[AnalysisJob]:
+        with self._changed:
+            return list(self._jobs.values())
+
+    def wait(self, job: AnalysisJob, timeout: float) -> bool:
+        """
+        작업이 끝날 때까지 최대 timeout 초 기다리고, 끝났는지 여부를 반환합니다.
+        """
+        with self._changed:
+            return self._changed.wait_for(lambda: job.finished_state, timeout)
+
+    def events(self, job: AnalysisJob, heartbeat: float = EVENT_HEARTBEAT) -> Iterator[Dict[str, Any]]:
+        """
+        작업 상태가 바뀔 때마다 상태(dict)를 생성하고, 작업이 끝나면(결과 포함) 종료합니다.
+        heartbeat 초 동안 변화가 없으면 현재 상태를 다시 생성합니다.
+        """
+        version = -1
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: job.version != version, heartbeat)
+                version = job.version
+                data = job.to_dict(include_result=job.finished_state)
+            yield data
+            if data["status"] in FINISHED_STATES:
+                return
+
+    def health(self) -> Dict[str, Any]:
+        with self._changed:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {"workers": self.jobs, "max_pending": self._pending.maxsize, "jobs": counts}
+
+    def _dispatch(self) -> None:
+        while True:
+            job = self._pending.get()
+            if job is None:
+                return
+            self._update(job, status=RUNNING, started=time.time())
+            analysis_stages = tuple(stage for stage in job.stages if stage != "decompile")
+            try:
+                sha256, result = self._run_analysis(job, analysis_stages)
+            except BrokenProcessPool:
+                # 풀이 깨질 때 실행 중이던 작업만 실패로 표시되고, 다음 작업은 새 풀에서 실행됩니다.
+                self._update(job, status=ERROR, error="analysis worker process terminated abruptly",
+                             finished=time.time())
+                continue
+            except Exception as e:
+                self._update(job, status=ERROR, error=f"{type(e).__name__}: {e}", finished=time.time())
+                continue
+            if "decompile" in job.stages:
+                self._update(job, status=DECOMPILING, sha256=sha256, result=result)
+                self._start_decompiler()
+                self._decompile_pending.put(job)
+            else:
+                self._update(job, status=DONE, sha256=sha256, result=result, finished=time.time())
+
+    def _start_decompiler(self) -> None:
+        with self._changed:
+            if self._decompiler is None:
+                self._decompiler = threading.Thread(target=self._decompile_loop, name="decompile", daemon=True)
+                self._decompiler.start()
+
+    def _decompile_loop(self) -> None:
+        """
+        하나의 DecompileWorker(Ghidra JVM)로 decompile 작업을 차례로 처리합니다.
+        JVM 이 비정상 종료하면 DecompileWorker 가 다음 요청에서 다시 시작합니다.
+        """
+        from decompile.run import DecompileWorker
+        with DecompileWorker() as worker:
+            while True:
+                job = self._decompile_pending.get()
+                if job is None:
+                    return
+                try:
+                    index_path = worker.submit(job.path)
+                except SystemExit:
+                    # decompile/run.py 는 Ghidra 나 스크립트를 찾지 못하면 sys.exit() 합니다.
+                    self._update(job, status=ERROR, error="decompiler is not available (Ghidra not found)",
+                                 finished=time.time())
+                    continue
+                except Exception as e:
+                    self._update(job, status=ERROR, error=f"{type(e).__name__}: {e}", finished=time.time())
+                    continue
+                result = dict(job.result or {}, decompile_file=os.path.abspath(index_path))
+                self._update(job, status=DONE, result=result, finished=time.time())
+
+    def close(self) -> None:
+        """
+        새 작업을 받지 않고, 실행 중인 작업이 끝나면 워커를 종료합니다. (대기 중인 작업은 처리하지 않습니다.)
+        """
+        with self._changed:
+            self._closed = True
+        while True:
+            try:
+                job = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                self._update(job, status=ERROR, error="service stopped", finished=time.time())
+        for _ in self._dispatchers:
+            self._pending.put(None)
+        for thread in self._dispatchers:
+            thread.join()
+        if self._decompiler is not None:
+            self._decompile_pending.put(None)
+            self._decompiler.join()
+        with self._executor_lock:
+            self._executor.shutdown()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "easy-pwntools"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self) -> AnalysisService:
+        return self.server.service
+
+    def address_string(self) -> str:
+        # Unix 소켓 연결은 클라이언트 주소가 없습니다.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: HTTPStatus, data: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: HTTPStatus, message: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send_json(status, {"error": message}, headers)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = [part for part in url.path.split("/") if part]
+        if parts == ["health"]:
+            self._send_json(HTTPStatus.OK, self.service.health())
+            return
+        if parts == ["jobs"]:
+            self._send_json(HTTPStatus.OK, [job.to_dict(include_result=False) for job in self.service.list()])
+            return
+        if len(parts) not in (2, 3) or parts[0] != "jobs" or (len(parts) == 3 and parts[2] != "events"):
+            self._error(HTTPStatus.NOT_FOUND, f"no such endpoint: {url.path}")
+            return
+        job = self.service.get(parts[1])
+        if job is None:
+            self._error(HTTPStatus.NOT_FOUND, f"no such job: {parts[1]}")
+            return
+        if len(parts) == 3:
+            self._stream_events(job)
+            return
+        try:
+            wait = min(float(query.get("wait", ["0"])[0]), MAX_WAIT)
+        except ValueError:
+            self._error(HTTPStatus.BAD_REQUEST, "wait must be a number of seconds")
+            return
+        if wait > 0:
+            self.service.wait(job, wait)
+        self._send_json(HTTPStatus.OK, job.to_dict())
+
+    def _stream_events(self, job: AnalysisJob) -> None:
+        """
+        상태가 바뀔 때마다 JSON 한 줄(NDJSON)을 보냅니다. 길이를 미리 알 수 없으므로 끝나면 연결을 닫습니다.
+        """
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for event in self.service.events(job):
+                self.wfile.write(json.dumps(event).encode() + b"\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path.rstrip("/") != "/jobs":
+            self._error(HTTPStatus.NOT_FOUND, f"no such endpoint: {url.path}")
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._error(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+            self.close_connection = True
+            return
+        if length > self.server.max_upload:
+            self._error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"request body over {self.server.max_upload} bytes")
+            self.close_connection = True
+            return
+        body = self.rfile.read(length)
+        stages = [stage for value in query.get("stages", []) for stage in value.split(",") if stage]
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/octet-stream"):
+                job = self.service.submit_upload(body, query.get("name", [None])[0], stages or DEFAULT_STAGES)
+            else:
+                request = json.loads(body or b"{}")
+                if not isinstance(request, dict) or "path" not in request:
+                    raise ValueError('expected {"path": ..., "stages": [...]}')
+                job = self.service.submit(request["path"], request.get("stages") or stages or DEFAULT_STAGES)
+        except ServiceBusy as e:
+            self._error(HTTPStatus.SERVICE_UNAVAILABLE, f"queue full: {e}", {"Retry-After": "1"})
+            return
+        except ValueError as e:
+            self._error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        self._send_json(HTTPStatus.ACCEPTED, job.to_dict(), {"Location": f"/jobs/{job.id}"})
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(service: AnalysisService, port: int = DEFAULT_PORT, socket_path: Optional[str] = None,
+          max_upload: int = DEFAULT_MAX_UPLOAD_MB * 1024 * 1024, verbose: bool = False) -> None:
+    """
+    서비스를 localhost:port 또는 Unix 소켓(socket_path)에서 실행합니다. (Ctrl+C 로 종료)
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = _UnixHTTPServer(socket_path, _Handler)
+        # 소켓 파일을 만든 사용자만 접근할 수 있도록 합니다.
+        os.chmod(socket_path, 0o600)
+        address = socket_path
+    else:
+        server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        address = f"http://127.0.0.1:{server.server_address[1]}"
+    server.service = service
+    server.max_upload = max_upload
+    server.verbose = verbose
+    print(f"[*] Listening on {address} with {service.jobs} worker(s)", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local ELF analysis service with a job queue and warm workers.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on (127.0.0.1 only)")
+    parser.add_argument("--socket", help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--jobs", type=int, default=None, help="Binaries analyzed at the same time (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING,
+                        help="Jobs allowed to wait in the queue before new submissions get 503")
+    parser.add_argument("--max-upload-mb", type=int, default=DEFAULT_MAX_UPLOAD_MB, help="Largest accepted upload")
+    parser.add_argument("--upload-dir", default=DEFAULT_UPLOAD_DIR, help="Directory for uploaded binaries")
+    parser.add_argument("--strings-min-length", type=int, default=4, help="Minimum length of extracted strings")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory of the analysis result cache")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the analysis result cache")
+    parser.add_argument("--verbose", action="store_true", help="Log every HTTP request to stderr")
+    args = parser.parse_args(argv)
+
+    service = AnalysisService(args.jobs, args.max_pending, args.strings_min_length,
+                              None if args.no_cache else args.cache_dir, args.upload_dir)
+    serve(service, args.port, args.socket, args.max_upload_mb * 1024 * 1024, args.verbose)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
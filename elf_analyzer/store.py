@@ -0,0 +1,327 @@
+# elf_analyzer/store.py
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .cache import file_sha256
+from .models import ELFAnalysisResult
+from .symbols import SymbolIndex
+
+DEFAULT_STORE_PATH = "results.db"
+SCHEMA_VERSION = 1
+
+# ELFFileInfo / ChecksecInfo 필드를 그대로 열로 저장합니다. (나머지 결과는 result 열의 JSON)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS binaries (
+    id INTEGER PRIMARY KEY,
+    sha256 TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    build_id TEXT,
+    bit_format TEXT,
+    endian TEXT,
+    cpu_arch TEXT COLLATE NOCASE,
+    linking TEXT,
+    interpreter TEXT,
+    is_stripped INTEGER,
+    relro TEXT COLLATE NOCASE,
+    stack_canary INTEGER,
+    nx INTEGER,
+    pie INTEGER,
+    fortify INTEGER,
+    rpath TEXT,
+    runpath TEXT,
+    analyzed_at REAL NOT NULL,
+    result TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS imports (
+    name TEXT NOT NULL,
+    binary_id INTEGER NOT NULL,
+    PRIMARY KEY (name, binary_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS binaries_build_id ON binaries (build_id);
+CREATE INDEX IF NOT EXISTS binaries_cpu_arch ON binaries (cpu_arch);
+CREATE INDEX IF NOT EXISTS binaries_mitigations ON binaries (pie, stack_canary, nx, relro, fortify);
+CREATE INDEX IF NOT EXISTS imports_binary_id ON imports (binary_id);
+"""
+
+_COLUMNS = (
+    "sha256", "path", "build_id", "bit_format", "endian", "cpu_arch", "linking", "interpreter", "is_stripped",
+    "relro", "stack_canary", "nx", "pie", "fortify", "rpath", "runpath", "analyzed_at", "result",
+)
+_INSERT = f"INSERT INTO binaries ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+# 목록 출력에 사용하는 열 (result JSON 은 --json 일 때만 읽습니다)
+_SUMMARY_COLUMNS = ("path", "sha256", "build_id", "cpu_arch", "relro", "stack_canary", "nx", "pie", "fortify")
+
+
+def _record_imports(path: str, sha256: str, result: Dict[str, Any]) -> List[str]:
+    """
+    symbols 단계의 색인 파일에서 import 함수 이름을 읽습니다.
+    색인 파일이 없으면(symbols 단계를 실행하지 않았거나 산출물이 지워진 경우) 같은 내용의 바이너리가 path 에
+    남아 있을 때 ELF 를 다시 읽고, 그것도 안 되면 경고를 출력한 뒤 결과에 남은 위험 함수 이름만 사용합니다.
+    """
+    symbols_file = result.get("symbols_file")
+    if symbols_file and os.path.isfile(symbols_file):
+        try:
+            return SymbolIndex.load(symbols_file).imports
+        except (OSError, ValueError, KeyError):
+            pass
+    try:
+        if os.path.isfile(path) and file_sha256(path) == sha256:
+            return SymbolIndex.from_file(path).imports
+    except (OSError, ValueError):
+        pass
+    print(f"[!] {path}: symbol index not found, storing only the dangerous function imports",
+          file=sys.stderr)
+    return [function["name"] for function in result.get("dangerous_functions") or []]
+
+
+def _row(path: str, sha256: str, result: Dict[str, Any]) -> Tuple:
+    file_info = result.get("file_info") or {}
+    checksec = result.get("checksec_info") or {}
+    build_id = file_info.get("build_id")
+    values = {
+        "sha256": sha256, "path": path, "build_id": build_id.lower() if build_id else None,
+        "analyzed_at": time.time(), "result": json.dumps(result),
+    }
+    for name in ("bit_format", "endian", "cpu_arch", "linking", "interpreter", "is_stripped"):
+        values[name] = file_info.get(name)
+    for name in ("relro", "stack_canary", "nx", "pie", "fortify", "rpath", "runpath"):
+        values[name] = checksec.get(name)
+    return tuple(values[name] for name in _COLUMNS)
+
+
+class ResultStore:
+    """
+    여러 바이너리의 분석 결과(ELFAnalysisResult)를 SQLite 파일 하나에 모아 색인된 조건으로 조회합니다.
+    ELFFileInfo / ChecksecInfo 필드와 BuildID 는 열로, import 함수 이름은 (이름, 바이너리) 색인 테이블로 저장하므로
+    "PIE 와 canary 가 없고 gets 를 import 하는 바이너리" 같은 질의를 다시 분석하지 않고 색인으로 찾습니다.
+    같은 SHA-256 의 결과를 다시 저장하면 이전 결과를 덮어씁니다.
+
+    사용 예제:
+      with ResultStore("results.db") as store:
+          store.add_many(run_batch(["./bins"]))
+          for row in store.query(pie=False, stack_canary=False, imports=["gets"]):
+              print(row["path"])
+    """
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        """
+        생성자
+
+        arguments:
+          path (str): SQLite 파일 경로 (없으면 생성)
+
+        예외:
+          ValueError: 다른 스키마 버전으로 만든 파일인 경우
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        # 대량 저장 중에도 다른 프로세스가 조회할 수 있도록 WAL 모드를 사용합니다.
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            self.connection.close()
+            raise ValueError(f"{path}: unsupported result store schema version {version}")
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM binaries").fetchone()[0]
+
+    def add(self, path: str, sha256: str, result: ELFAnalysisResult) -> None:
+        """
+        바이너리 하나의 분석 결과를 저장합니다.
+        """
+        self.add_many([{"path": path, "sha256": sha256, "status": "ok", "result": result.to_dict()}])
+
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        배치 분석 레코드({"path", "sha256", "status", "result"})를 한 트랜잭션으로 저장합니다.
+        status 가 "ok" 가 아닌 레코드는 건너뜁니다.
+
+        return:
+          int: 저장한 레코드 수
+        """
+        count = 0
+        with self.connection:
+            cursor = self.connection.cursor()
+            for record in records:
+                if record.get("status", "ok") != "ok" or not record.get("sha256"):
+                    continue
+                result = record["result"]
+                cursor.execute("DELETE FROM imports WHERE binary_id IN (SELECT id FROM binaries WHERE sha256 = ?)",
+                               (record["sha256"],))
+                cursor.execute("DELETE FROM binaries WHERE sha256 = ?", (record["sha256"],))
+                path = os.path.abspath(record["path"])
+                cursor.execute(_INSERT, _row(path, record["sha256"], result))
+                binary_id = cursor.lastrowid
+                cursor.executemany("INSERT OR IGNORE INTO imports (name, binary_id) VALUES (?, ?)",
+                                   ((name, binary_id) for name in _record_imports(path, record["sha256"], result)))
+                count += 1
+        return count
+
+    def query(self, pie: Optional[bool] = None, stack_canary: Optional[bool] = None, nx: Optional[bool] = None,
+              relro: Optional[str] = None, fortify: Optional[bool] = None, stripped: Optional[bool] = None,
+              cpu_arch: Optional[str] = None, build_id: Optional[str] = None, imports: Sequence[str] = (),
+              path: Optional[str] = None, limit: Optional[int] = None,
+              with_result: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        조건을 모두 만족하는 바이너리를 경로 순서로 생성합니다. (None 인 조건은 사용하지 않습니다.)
+
+        arguments:
+          pie / stack_canary / nx / fortify / stripped (Optional[bool]): 보호 기법 / strip 여부
+          relro (Optional[str]): RELRO 상태 ("Full", "Partial", "None", 대소문자 무시)
+          cpu_arch (Optional[str]): CPU 아키텍처 (예: "x86-64", 대소문자 무시)
+          build_id (Optional[str]): GNU BuildID
+          imports (Sequence[str]): 모두 import 해야 하는 함수 이름 목록
+          path (Optional[str]): 경로 glob 패턴 (예: "*/ctf/*")
+          limit (Optional[int]): 최대 결과 수
+          with_result (bool): True이면 "result" 에 저장된 전체 결과(dict)를 포함
+
+        return:
+          Iterator[Dict[str, Any]]: 열 이름 -> 값 (보호 기법 값은 True / False / None)
+        """
+        conditions = []
+        parameters: List[Any] = []
+        for column, value in (("pie", pie), ("stack_canary", stack_canary), ("nx", nx), ("fortify", fortify),
+                              ("is_stripped", stripped), ("relro", relro), ("cpu_arch", cpu_arch),
+                              ("build_id", build_id.lower() if build_id else None)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                parameters.append(value)
+        for name in imports:
+            conditions.append("id IN (SELECT binary_id FROM imports WHERE name = ?)")
+            parameters.append(name)
+        if path:
+            conditions.append("path GLOB ?")
+            parameters.append(path)
+        columns = _SUMMARY_COLUMNS + (("result",) if with_result else ())
+        sql = f"SELECT {', '.join(columns)} FROM binaries"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY path"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        for row in self.connection.execute(sql, parameters):
+            data = dict(row)
+            for column in ("stack_canary", "nx", "pie", "fortify"):
+                if data[column] is not None:
+                    data[column] = bool(data[column])
+            if with_result:
+                data["result"] = json.loads(data["result"])
+            yield data
+
+    def imports_of(self, sha256: str) -> List[str]:
+        """
+        저장된 바이너리가 import 하는 함수 이름 목록을 반환합니다.
+        """
+        rows = self.connection.execute(
+            "SELECT name FROM imports WHERE binary_id = (SELECT id FROM binaries WHERE sha256 = ?) ORDER BY name",
+            (sha256,))
+        return [row[0] for row in rows]
+
+    def close(self) -> None:
+        if self.connection is None:
+            return
+        self.connection.close()
+        self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _read_records(paths: Sequence[str]) -> Iterator[Dict[str, Any]]:
+    """
+    main.py --batch 가 출력한 JSON Lines 파일("-"이면 표준 입력)에서 레코드를 읽습니다.
+    """
+    for path in paths:
+        handle = sys.stdin if path == "-" else open(path)
+        with handle:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _yes_no(value: str) -> bool:
+    lowered = value.lower()
+    if lowered in ("yes", "y", "true", "1", "on"):
+        return True
+    if lowered in ("no", "n", "false", "0", "off"):
+        return False
+    raise argparse.ArgumentTypeError(f"expected yes or no, got {value!r}")
+
+
+def _format_flag(value: Optional[bool]) -> str:
+    return "?" if value is None else ("yes" if value else "no")
+
+
+def _format_row(row: Dict[str, Any]) -> str:
+    return (f"{row['path']}  arch={row['cpu_arch'] or '?'} relro={row['relro'] or '?'} "
+            f"canary={_format_flag(row['stack_canary'])} nx={_format_flag(row['nx'])} "
+            f"pie={_format_flag(row['pie'])} fortify={_format_flag(row['fortify'])} "
+            f"build_id={row['build_id'] or '-'}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    사용 예제:
+      python main.py --batch ./bins --store results.db > /dev/null
+      python main.py query --pie no --canary no --imports gets
+      python main.py query --path '*/ctf/*' --count
+      python main.py query --load batch.jsonl
+      python main.py query --build-id 7d70f0b3c70d1c8565857d3f53c27dafb8eddb68 --json
+    """
+    parser = argparse.ArgumentParser(prog="main.py query", description="Query stored analysis results.")
+    parser.add_argument("--db", default=DEFAULT_STORE_PATH, help="Result store (SQLite) file")
+    parser.add_argument("--load", nargs="+", metavar="JSONL",
+                        help="Store records printed by 'main.py --batch' ('-' for stdin) before querying")
+    parser.add_argument("--pie", type=_yes_no, help="yes / no")
+    parser.add_argument("--canary", type=_yes_no, help="yes / no")
+    parser.add_argument("--nx", type=_yes_no, help="yes / no")
+    parser.add_argument("--fortify", type=_yes_no, help="yes / no")
+    parser.add_argument("--stripped", type=_yes_no, help="yes / no")
+    parser.add_argument("--relro", help="Full / Partial / None")
+    parser.add_argument("--arch", help="CPU architecture (e.g. x86-64)")
+    parser.add_argument("--build-id", help="GNU BuildID")
+    parser.add_argument("--imports", default="", help="Comma-separated functions that must all be imported (e.g. gets,system)")
+    parser.add_argument("--path", help="Glob pattern the stored path must match")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of results")
+    parser.add_argument("--count", action="store_true", help="Print only the number of matching binaries")
+    parser.add_argument("--json", action="store_true", help="Print one JSON object (with the full result) per binary")
+    args = parser.parse_args(argv)
+
+    with ResultStore(args.db) as store:
+        if args.load:
+            added = store.add_many(_read_records(args.load))
+            print(f"[*] Stored {added} result(s), {len(store)} in {args.db}", file=sys.stderr)
+            filters = (args.pie, args.canary, args.nx, args.fortify, args.stripped, args.relro, args.arch,
+                       args.build_id, args.imports, args.path)
+            if all(value is None or value == "" for value in filters) and not (args.count or args.json):
+                return 0
+        rows = store.query(pie=args.pie, stack_canary=args.canary, nx=args.nx, relro=args.relro,
+                           fortify=args.fortify, stripped=args.stripped, cpu_arch=args.arch,
+                           build_id=args.build_id, imports=[name for name in args.imports.split(",") if name],
+                           path=args.path, limit=args.limit, with_result=args.json)
+        count = 0
+        for row in rows:
+            count += 1
+            if args.count:
+                continue
+            print(json.dumps(row) if args.json else _format_row(row))
+        if args.count:
+            print(count)
+        return 0 if count else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+# elf_analyzer/strings_extractor.py
+import bisect
+import heapq
+import re
+from typing import Iterator, List, Optional, Tuple
+from .elf_parser import ELFParser, SHT_NOBITS
+from .models import ExtractedString
+
+ENCODINGS = ("ascii", "utf-16le")
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# GNU strings 와 동일하게 출력 가능한 ASCII 문자와 탭을 문자열로 취급합니다.
+_PRINTABLE = rb"[\x20-\x7e\t]"
+
+
+class StringsExtractor:
+    """
+    mmap 된 ELF 파일을 고정 크기 청크 단위로 스캔하여 문자열을 추출하는 클래스입니다.
+    바이너리 크기와 관계없이 메모리 사용량이 일정하며,
+    각 문자열의 파일 오프셋, 가상 주소, 섹션 이름을 함께 제공합니다.
+
+    사용 예제:
+      with ELFParser("./chall") as elf:
+          for s in StringsExtractor(elf).find("/bin/sh"):
+              print(hex(s.vaddr))
+    """
+    def __init__(self, elf: ELFParser, min_length: int = 4,
+                 encodings: Tuple[str, ...] = ENCODINGS, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        생성자
+
+        arguments:
+          elf (ELFParser): 이미 열려 있는 ELFParser 인스턴스
+          min_length (int): 추출할 문자열의 최소 길이 (문자 수)
+          encodings (Tuple[str, ...]): 추출할 인코딩 ("ascii", "utf-16le")
+          chunk_size (int): 한 번에 스캔할 바이트 수
+        """
+        for encoding in encodings:
+            if encoding not in ENCODINGS:
+                raise ValueError(f"Unsupported encoding: {encoding}")
+        self.elf = elf
+        self.min_length = max(1, min_length)
+        self.chunk_size = max(1, chunk_size)
+        self.patterns = []
+        if "ascii" in encodings:
+            # 뒤쪽 탐색(lookbehind)으로 문자열 중간에서 시작하는 매치를 막습니다.
+            self.patterns.append(("ascii", re.compile(
+                rb"(?<!" + _PRINTABLE + rb")" + _PRINTABLE + rb"{%d,}" % self.min_length)))
+        if "utf-16le" in encodings:
+            self.patterns.append(("utf-16le", re.compile(
+                rb"(?<!" + _PRINTABLE + rb"\x00)(?:" + _PRINTABLE + rb"\x00){%d,}" % self.min_length)))
+
+        sections = sorted(
+            (section.sh_offset, section.sh_offset + section.sh_size, section.name, section.sh_addr)
+            for section in elf.section_headers
+            if section.sh_type != SHT_NOBITS and section.sh_size and section.name
+        )
+        self._section_starts = [section[0] for section in sections]
+        self._sections = sections
+
+    def _locate(self, offset: int) -> Tuple[Optional[int], Optional[str]]:
+        """
+        파일 오프셋에 해당하는 (가상 주소, 섹션 이름)을 반환합니다.
+        """
+        index = bisect.bisect_right(self._section_starts, offset) - 1
+        if index >= 0:
+            start, end, name, addr = self._sections[index]
+            if offset < end:
+                vaddr = addr + (offset - start) if addr else self.elf.offset_to_vaddr(offset)
+                return vaddr, name
+        return self.elf.offset_to_vaddr(offset), None
+
+    def _make(self, encoding: str, offset: int, raw: bytes) -> ExtractedString:
+        value = raw.decode("ascii") if encoding == "ascii" else raw.decode("utf-16le")
+        vaddr, section = self._locate(offset)
+        return ExtractedString(offset=offset, vaddr=vaddr, section=section, encoding=encoding, value=value)
+
+    def _scan(self, encoding: str, pattern) -> Iterator[Tuple[int, str, bytes]]:
+        """
+        하나의 인코딩에 대해 청크 단위로 스캔하며 (offset, encoding, raw) 를 오프셋 순서대로 생성합니다.
+        청크 경계에 걸친 문자열은 보류했다가 다음 청크에서 온전한 형태로 다시 매칭합니다.
+        """
+        data = self.elf.data
+        size = len(data)
+        unit = 1 if encoding == "ascii" else 2
+        # 청크 끝에서 이만큼 되돌아가 다음 청크를 시작하면 경계에 걸친 짧은 문자열도 놓치지 않습니다.
+        overlap = self.min_length * unit
+        chunk_size = max(self.chunk_size, overlap * 4)
+        last_start = -1
+        pos = 0
+        end = min(chunk_size, size)
+        while pos < size:
+            deferred = None
+            for match in pattern.finditer(data, pos, end):
+                if end < size and match.end() > end - unit:
+                    deferred = match.start()
+                    break
+                if match.start() > last_start:
+                    last_start = match.start()
+                    yield match.start(), encoding, match.group()
+            if deferred is None:
+                if end >= size:
+                    break
+                pos = max(pos + 1, end - overlap)
+            elif deferred == pos:
+                # 청크 전체가 하나의 문자열이면 끝을 찾을 때까지 창을 넓힙니다.
+                end = min(end + chunk_size, size)
+                continue
+            else:
+                pos = deferred
+            end = min(pos + chunk_size, size)
+
+    def iter_strings(self) -> Iterator[ExtractedString]:
+        """
+        파일 전체의 문자열을 오프셋 순서대로 순회합니다.
+        """
+        scans = [self._scan(encoding, pattern) for encoding, pattern in self.patterns]
+        for offset, encoding, raw in heapq.merge(*scans, key=lambda item: item[0]):
+            yield self._make(encoding, offset, raw)
+
+    def find(self, value: str) -> List[ExtractedString]:
+        """
+        value 를 포함하는 문자열 목록을 반환합니다. (예: "/bin/sh")
+        """
+        return [s for s in self.iter_strings() if value in s.value]
+
+
+def format_string(s: ExtractedString) -> str:
+    """
+    추출된 문자열 하나를 로그 파일의 한 줄(탭 구분) 형식으로 변환합니다.
+    형식: <offset>\t<vaddr>\t<section>\t<encoding>\t<value>
+    """
+    vaddr = f"{s.vaddr:#x}" if s.vaddr is not None else "-"
+    value = s.value.replace("\\", "\\\\").replace("\t", "\\t")
+    return f"{s.offset:#x}\t{vaddr}\t{s.section or '-'}\t{s.encoding}\t{value}"
@@ -0,0 +1,185 @@
+# elf_analyzer/symbols.py
+import json
+import struct
+from typing import Dict, Iterable, List, Optional
+from .elf_parser import (
+    ELFParser, EM_386, EM_AARCH64, EM_ARM, EM_X86_64, DT_PLTGOT,
+    SHN_UNDEF, SHT_DYNSYM, SHT_REL, SHT_RELA, SHT_SYMTAB,
+)
+from .models import ImportedFunction
+
+# config.ini 의 elf_analyzer.dangerous_functions 가 없을 때 사용하는 기본 목록
+DEFAULT_DANGEROUS_FUNCTIONS = (
+    "gets", "strcpy", "strcat", "sprintf", "vsprintf", "scanf", "sscanf", "fscanf",
+    "system", "popen", "execve", "execl", "printf", "fprintf", "memcpy", "read",
+)
+
+# e_machine 별 (JUMP_SLOT, GLOB_DAT) 재배치 타입
+_GOT_RELOCATION_TYPES = {
+    EM_X86_64: (7, 6),
+    EM_386: (7, 6),
+    EM_ARM: (22, 21),
+    EM_AARCH64: (1026, 1025),
+}
+
+# GOT 슬롯을 통해 점프하는 PLT 스텁이 들어 있는 섹션
+_PLT_SECTIONS = (".plt", ".plt.sec", ".plt.got")
+
+STT_SECTION = 3
+STT_FILE = 4
+
+
+def _scan_plt_stubs(elf: ELFParser) -> Dict[int, int]:
+    """
+    x86 / x86-64 PLT 섹션의 각 엔트리에서 간접 점프(jmp [rip + disp], jmp [abs], jmp [ebx + disp])를 찾아
+    {GOT 슬롯 주소: PLT 스텁 주소} 를 반환합니다.
+    .plt.sec 이 있는 IBT 바이너리는 .plt 엔트리가 간접 점프를 하지 않으므로 .plt.sec 스텁이 선택됩니다.
+    """
+    if elf.e_machine not in (EM_386, EM_X86_64):
+        return {}
+    got_base = elf.dynamic_value(DT_PLTGOT)
+    stubs: Dict[int, int] = {}
+    for name in _PLT_SECTIONS:
+        section = elf.get_section(name)
+        if section is None or not section.sh_size:
+            continue
+        # i386 의 .plt 는 sh_entsize 가 4로 기록되므로 8 / 16 이 아니면 16바이트 엔트리로 봅니다.
+        entsize = section.sh_entsize if section.sh_entsize in (8, 16) else 16
+        data = elf.read(section.sh_offset, section.sh_size)
+        for start in range(0, len(data), entsize):
+            entry = data[start:start + entsize]
+            position = entry.find(b"\xff\x25")
+            if position == -1 and not elf.is_64:
+                position = entry.find(b"\xff\xa3")
+            if position == -1 or position + 6 > len(entry):
+                continue
+            stub = section.sh_addr + start
+            if elf.is_64:
+                disp = struct.unpack_from("<i", entry, position + 2)[0]
+                target = section.sh_addr + start + position + 6 + disp
+            elif entry[position + 1] == 0x25:
+                target = struct.unpack_from("<I", entry, position + 2)[0]
+            elif got_base is not None:
+                target = (got_base + struct.unpack_from("<i", entry, position + 2)[0]) & 0xFFFFFFFF
+            else:
+                continue
+            stubs.setdefault(target, stub)
+    return stubs
+
+
+class SymbolIndex:
+    """
+    .dynsym / .symtab / .rel(a).plt / .got 을 파싱하여 만든 심볼, PLT, GOT 해시 색인입니다.
+    pwntools 의 ELF 를 따로 적재하지 않고 익스플로잇 스크립트에서 주소를 바로 조회할 수 있습니다.
+
+    사용 예제:
+      with ELFParser("./chall") as elf:
+          index = SymbolIndex.from_elf(elf)
+      print(hex(index.plt["puts"]), hex(index.got["puts"]), hex(index.symbols["main"]))
+      for function in index.find_imports(["gets", "system"]):
+          print(function.name, function.plt, function.got)
+    """
+    def __init__(self, symbols: Optional[Dict[str, int]] = None, got: Optional[Dict[str, int]] = None,
+                 plt: Optional[Dict[str, int]] = None, imports: Optional[List[str]] = None):
+        """
+        생성자
+
+        arguments:
+          symbols (Optional[Dict[str, int]]): 정의된 심볼 이름 -> 주소
+          got (Optional[Dict[str, int]]): import 심볼 이름 -> GOT 슬롯 주소
+          plt (Optional[Dict[str, int]]): import 심볼 이름 -> PLT 스텁 주소
+          imports (Optional[List[str]]): import 하는(정의되지 않은) 동적 심볼 이름 목록
+        """
+        self.symbols = symbols or {}
+        self.got = got or {}
+        self.plt = plt or {}
+        self.imports = imports or []
+        self.plt_to_got = {stub: self.got[name] for name, stub in self.plt.items() if name in self.got}
+        self.got_to_plt = {slot: stub for stub, slot in self.plt_to_got.items()}
+
+    @classmethod
+    def from_elf(cls, elf: ELFParser) -> "SymbolIndex":
+        """
+        열려 있는 ELFParser 로부터 색인을 만듭니다.
+        """
+        symbols: Dict[str, int] = {}
+        imports: List[str] = []
+        for sh_type in (SHT_SYMTAB, SHT_DYNSYM):
+            for symbol in elf.symbols(sh_type):
+                if not symbol.name or symbol.type in (STT_SECTION, STT_FILE):
+                    continue
+                if symbol.shndx == SHN_UNDEF:
+                    if sh_type == SHT_DYNSYM and symbol.name not in imports:
+                        imports.append(symbol.name)
+                    continue
+                symbols.setdefault(symbol.name, symbol.value)
+
+        got: Dict[str, int] = {}
+        relocation_types = _GOT_RELOCATION_TYPES.get(elf.e_machine, ())
+        sections = elf.section_headers
+        for section in sections:
+            if section.sh_type not in (SHT_REL, SHT_RELA) or not 0 <= section.sh_link < len(sections):
+                continue
+            table = list(elf.section_symbols(sections[section.sh_link]))
+            for relocation in elf.relocations(section):
+                if relocation.type not in relocation_types or not 0 < relocation.symbol_index < len(table):
+                    continue
+                name = table[relocation.symbol_index].name
+                if name:
+                    got.setdefault(name, relocation.offset)
+
+        stubs = _scan_plt_stubs(elf)
+        plt = {name: stubs[slot] for name, slot in got.items() if slot in stubs}
+        return cls(symbols, got, plt, imports)
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "SymbolIndex":
+        """
+        ELF 파일 경로로부터 색인을 만듭니다.
+        """
+        with ELFParser(file_path) as elf:
+            return cls.from_elf(elf)
+
+    def save(self, path: str) -> None:
+        """
+        색인을 JSON 파일로 저장합니다.
+        """
+        with open(path, "w") as f:
+            json.dump({"symbols": self.symbols, "got": self.got, "plt": self.plt, "imports": self.imports}, f)
+
+    @classmethod
+    def load(cls, path: str) -> "SymbolIndex":
+        """
+        save() 로 저장한 JSON 파일에서 색인을 읽습니다.
+        """
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["symbols"], data["got"], data["plt"], data["imports"])
+
+    def address(self, name: str) -> Optional[int]:
+        """
+        이름으로 주소를 찾습니다. 정의된 심볼이 없으면 PLT 스텁 주소를 반환합니다. (없으면 None)
+        """
+        if name in self.symbols:
+            return self.symbols[name]
+        return self.plt.get(name)
+
+    def imported(self, name: str) -> Optional[ImportedFunction]:
+        """
+        import 하는 함수의 PLT / GOT 주소를 반환합니다. (import 하지 않으면 None)
+        """
+        if name not in self.imports and name not in self.got:
+            return None
+        return ImportedFunction(name=name, plt=self.plt.get(name), got=self.got.get(name))
+
+    def find_imports(self, names: Iterable[str]) -> List[ImportedFunction]:
+        """
+        names 중 바이너리가 import 하는 함수 목록을 names 순서대로 반환합니다.
+        (예: 위험 함수 목록을 넘겨 gets, strcpy 등이 사용되는지 확인)
+        """
+        found = []
+        for name in names:
+            function = self.imported(name)
+            if function is not None:
+                found.append(function)
+        return found
@@ -1,21 +1,96 @@
 #!/usr/bin/env python3
 # main.py
 import argparse
-from elf_analyzer.analyzer import ELFAnalyzer
-from elf_analyzer.printer import print_analysis_result
+import glob
+import os
+import sys
+from elf_analyzer.analyzer import ELFAnalyzer, STAGES
+from elf_analyzer.cache import AnalysisCache, DEFAULT_CACHE_DIR, file_sha256
+from elf_analyzer.printer import print_analysis_result, print_decompile_diff, print_sink_paths
+from elf_analyzer.profiling import write_metrics
+
+def _stage_list(value):
+    """
+    --only / --skip 인자("checksec,fileinfo")를 단계 이름 목록으로 변환합니다.
+    """
+    stages = [stage.strip() for stage in value.split(",") if stage.strip()]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown stage(s) {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+    return stages
 
 def main():
-    parser = argparse.ArgumentParser(description="Analyze ELF binaries and extract strings.")
-    parser.add_argument("elf_file", help="Path to the ELF binary")
-    parser.add_argument("--functions", nargs="*", help="List of function names to check vulnerability", default=None)
+    if len(sys.argv) > 1 and sys.argv[1] == "query":
+        # python main.py query [조건...]: 저장된 분석 결과를 조회합니다. (elf_analyzer/store.py)
+        from elf_analyzer.store import main as query_main
+        return query_main(sys.argv[2:])
+
+    parser = argparse.ArgumentParser(description="Analyze ELF binaries and extract strings.",
+                                     epilog="Run 'main.py query --help' to search results saved with --store.")
+    parser.add_argument("elf_files", nargs="*", help="Path to the ELF binary (or directories / globs in batch mode)")
+    parser.add_argument("--functions", nargs="*", help="List of function names (or 0x addresses) to decompile (default: all functions)", default=None)
+    parser.add_argument("--depth", type=int, default=0, help="Also decompile callers and callees of --functions up to this depth")
+    parser.add_argument("--decompile-previous", help="decompile.index.json of a previous version; only functions whose hash changed are decompiled again")
+    parser.add_argument("--strings-min-length", type=int, default=4, help="Minimum length of extracted strings")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the analysis result cache")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory of the analysis result cache")
+    parser.add_argument("--sequential", action="store_true", help="Run analysis stages one after another instead of concurrently")
+    parser.add_argument("--batch", action="store_true", help="Analyze every ELF file found in the given paths and print one JSON line per binary")
+    parser.add_argument("--file-list", help="File containing one path per line to analyze in batch mode ('-' for stdin)")
+    parser.add_argument("--jobs", type=int, default=None, help="Number of worker processes in batch mode (default: CPU count)")
+    parser.add_argument("--decompile", action="store_true", help="In batch mode, also decompile every analyzed binary in a single Ghidra session")
+    parser.add_argument("--only", type=_stage_list, default=None, help=f"Comma-separated analysis stages to run (choose from {', '.join(STAGES)})")
+    parser.add_argument("--skip", type=_stage_list, default=[], help="Comma-separated analysis stages to skip (e.g. ropgadget,decompile)")
+    parser.add_argument("--metrics-json", help="Write per-stage wall/CPU time and peak RSS to this JSON file")
+    parser.add_argument("--metrics-prom", help="Write per-stage metrics to this Prometheus textfile (.prom)")
+    parser.add_argument("--store", metavar="DB", help="Also save results to this SQLite result store (e.g. results.db) for 'main.py query'")
     args = parser.parse_args()
 
-    analyzer = ELFAnalyzer(args.elf_file)
-    analysis_result = analyzer.analyze()
+    stages = [stage for stage in (args.only or STAGES) if stage not in args.skip]
+    analysis_stages = tuple(stage for stage in stages if stage != "decompile")
+
+    # 경로 하나가 주어지면 디렉토리나 glob 패턴일 때만 배치 모드로 분석합니다. (오타난 경로는 오류)
+    batch_mode = (args.batch or args.file_list or len(args.elf_files) != 1
+                  or os.path.isdir(args.elf_files[0]) or glob.has_magic(args.elf_files[0]))
+    if not batch_mode and not os.path.isfile(args.elf_files[0]):
+        parser.error(f"{args.elf_files[0]}: no such file")
+    if batch_mode:
+        if not args.elf_files and not args.file_list:
+            parser.error("at least one ELF file, directory, glob or --file-list is required")
+        # 배치 모드와 Ghidra 실행에만 필요한 모듈은 단일 파일 분석의 시작 시간을 늘리지 않도록 여기서 불러옵니다.
+        from elf_analyzer.batch import print_batch
+        from decompile.run import run_decompile_batch
+        from elf_analyzer.store import ResultStore
+        store = ResultStore(args.store) if args.store else None
+        summary = print_batch(args.elf_files, args.file_list, args.jobs, args.strings_min_length,
+                              None if args.no_cache else args.cache_dir, analysis_stages, store)
+        if store is not None:
+            store.close()
+        if args.decompile and "decompile" in stages and summary.analyzed:
+            run_decompile_batch(summary.analyzed, args.functions, args.depth)
+        write_metrics(summary.metrics, args.metrics_json, args.metrics_prom)
+        return 1 if summary.failed or not summary.total else 0
+
+    cache = None if args.no_cache else AnalysisCache(args.cache_dir)
+    analyzer = ELFAnalyzer(args.elf_files[0], strings_min_length=args.strings_min_length, cache=cache,
+                           decompile_functions=args.functions, decompile_depth=args.depth,
+                           decompile_previous=args.decompile_previous)
+    analysis_result = analyzer.analyze(concurrent=not args.sequential, stages=analysis_stages)
+
+    print_analysis_result(analysis_result, analysis_stages)
+
+    if "decompile" in stages:
+        # decompile_file 에 처음 접근할 때 decompile 단계가 실행됩니다.
+        print(f"Decompile index saved to: {analysis_result.decompile_file}")
+        print_decompile_diff(analysis_result.decompile_file)
+        print_sink_paths(analysis_result.decompile_file)
 
-    print_analysis_result(analysis_result)
+    if args.store:
+        from elf_analyzer.store import ResultStore
+        with ResultStore(args.store) as store:
+            store.add(args.elf_files[0], analyzer.cache_key or file_sha256(args.elf_files[0]), analysis_result)
 
-    analyzer.run_decompile()
+    write_metrics([(args.elf_files[0], analysis_result.metrics)], args.metrics_json, args.metrics_prom)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())